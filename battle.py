@@ -0,0 +1,207 @@
+"""
+규칙 기반 전투 엔진
+
+전투 중 메뉴 조작과 기술 선택을 LLM 없이 로컬에서 처리합니다.
+- wBattleMon*/wEnemyMon*에서 기술, 남은 PP, 타입을 읽고, ROM의 Moves 테이블과 consts의 타입 상성표로
+  기대 위력(위력 x 상성 x 자속 보정 x 명중률)이 가장 높은 기술을 고릅니다.
+- 메뉴는 wTileMap에서 커서(▶)와 메뉴 글자 위치를 찾아 버튼 입력으로 직접 조작합니다.
+- 교체, 도망, 포획, 기술 배우기처럼 전략적인 선택은 LLM에게 넘깁니다.
+"""
+import asyncio
+
+from consts import type_effectiveness
+from metrics import REGISTRY
+import text_codec
+
+SCREEN_WIDTH = 20
+SCREEN_HEIGHT = 18
+
+CURSOR_TILE = 0xED     # ▶
+CONTINUE_TILE = 0xEE   # ▼
+LABEL_FIGHT = text_codec.encode("FIGHT", terminate=False)
+LABEL_RUN = text_codec.encode("RUN", terminate=False)
+LABEL_TYPE = text_codec.encode("TYPE/", terminate=False)
+LABEL_YES = text_codec.encode("YES", terminate=False)
+LABEL_NO = text_codec.encode("NO", terminate=False)
+PARTY_PROMPTS = [text_codec.encode(text, terminate=False) for text in ("Bring out which", "Use item on which", "Choose a")]
+
+# 화면 단계
+PHASE_MAIN_MENU = "main_menu"    # FIGHT / PKMN / ITEM / RUN
+PHASE_MOVE_MENU = "move_menu"
+PHASE_TEXT = "text"              # ▼ 표시: A로 진행
+PHASE_YES_NO = "yes_no"          # 교체 여부, 기술 배우기 등 -> LLM
+PHASE_PARTY = "party"            # 포켓몬 선택 -> LLM
+PHASE_BUSY = "busy"              # 애니메이션/자동 진행 중
+
+LOW_HP_RATIO = 0.25         # 이 비율 아래면 교체/도망을 LLM에게 물음
+FIXED_DAMAGE_POWER = 40     # 위력 1로 기록된 고정 데미지 기술(지구던지기 등)의 추정 위력
+STAB = 1.5                  # 자속 보정
+AVOID_EFFECTS = {0x07, 0x08}  # 자폭/대폭발, 꿈먹기 (상대가 잠들어 있어야 함)
+BALL_ITEMS = {0x01, 0x02, 0x03, 0x04, 0x08}  # 마스터/하이퍼/수퍼/몬스터/사파리볼
+
+BUTTON_SETTLE_SECONDS = 0.1   # 버튼 입력 후 화면이 갱신될 때까지의 여유
+POLL_SECONDS = 1 / 30         # 애니메이션 중 화면 재확인 주기
+MAX_IDLE_POLLS = 300          # 이 횟수(약 10초) 동안 알 수 있는 화면이 없으면 LLM에게 넘김
+MAX_BATTLE_BUTTONS = 400
+MOVE_MENU_FIRST_ITEM = 1      # 기술 메뉴의 wCurrentMenuItem은 테두리 행부터 세므로 첫 기술이 1
+
+BATTLE_BUTTONS = REGISTRY.counter("battle_engine_buttons_total", "Buttons pressed by the local battle engine")
+BATTLE_DEFERRALS = REGISTRY.counter("battle_engine_deferrals_total", "Battle decisions handed to the LLM")
+BATTLE_MOVES = REGISTRY.counter("battle_engine_moves_total", "Moves chosen by the local battle engine")
+
+
+def move_menu_button(slot, current):
+    """
+    기술 메뉴에서 slot(0부터)번 기술을 고르기 위한 다음 버튼.
+    current는 wCurrentMenuItem 값으로, MoveSelectionMenu에서는 wPlayerMoveListIndex + 1입니다.
+    """
+    target = slot + MOVE_MENU_FIRST_ITEM
+    if target == current:
+        return "a"
+    return "down" if target > current else "up"
+
+
+def _find(screen, label):
+    """ 화면 바이트에서 label의 첫 위치 (행, 열), 없으면 None """
+    index = screen.find(label)
+    return None if index < 0 else divmod(index, SCREEN_WIDTH)
+
+
+class BattleEngine:
+    def __init__(self, memory_reader):
+        self.memory_reader = memory_reader
+        self.deferred = set()  # 이번 전투에서 이미 LLM에게 물어본 (상황, 이유)
+
+    def in_battle(self):
+        return self.memory_reader.read_memory("wIsInBattle") > 0
+
+    def reset(self):
+        """ 전투가 끝나면 호출 """
+        self.deferred.clear()
+
+    def read_screen(self):
+        return bytes(self.memory_reader.read_memory_bytes("wTileMap", SCREEN_WIDTH * SCREEN_HEIGHT))
+
+    def phase(self, screen):
+        if _find(screen, LABEL_TYPE) is not None:
+            return PHASE_MOVE_MENU
+        if CURSOR_TILE in screen and _find(screen, LABEL_FIGHT) is not None and _find(screen, LABEL_RUN) is not None:
+            return PHASE_MAIN_MENU
+        if any(_find(screen, prompt) is not None for prompt in PARTY_PROMPTS):
+            return PHASE_PARTY
+        if CURSOR_TILE in screen and _find(screen, LABEL_YES) is not None and _find(screen, LABEL_NO) is not None:
+            return PHASE_YES_NO
+        if CONTINUE_TILE in screen:
+            return PHASE_TEXT
+        return PHASE_BUSY
+
+    def score_move(self, move, state):
+        """ 기대 위력. 상태 변화 기술이나 피해야 할 기술은 0 """
+        if move["effect"] in AVOID_EFFECTS or move["power"] == 0:
+            return 0.0
+        power = FIXED_DAMAGE_POWER if move["power"] == 1 else move["power"]
+        stab = STAB if move["type"] in state["player"]["types"] else 1.0
+        return power * stab * type_effectiveness(move["type"], state["enemy"]["types"]) * move["accuracy"] / 255
+
+    def choose_move(self, state):
+        """ PP가 남은 기술 중 기대 위력이 가장 높은 기술의 슬롯 (공격 기술이 없으면 PP가 남은 첫 기술, 아예 없으면 None) """
+        usable = [move for move in state["player"]["moves"] if move["pp"] > 0]
+        if not usable:
+            return None
+        best = max(usable, key=lambda move: self.score_move(move, state))
+        return best["slot"]
+
+    def strategic_reason(self, state):
+        """ LLM에게 넘길 전략적 상황이면 그 이유를, 아니면 None """
+        player = state["player"]
+        enemy = state["enemy"]
+        reasons = []
+        usable = [move for move in player["moves"] if move["pp"] > 0]
+        if usable and max(self.score_move(move, state) for move in usable) == 0:
+            reasons.append(f"none of {player['species']}'s moves can damage {enemy['species']}")
+        if player["max_hp"] and player["hp"] / player["max_hp"] < LOW_HP_RATIO:
+            healthy = [mon["species"] for mon in state["party"] if mon["hp"] > 0 and mon["species"] != player["species"]]
+            if healthy or not state["trainer_battle"]:
+                reasons.append(f"{player['species']} HP is low ({player['hp']}/{player['max_hp']})")
+        if not state["trainer_battle"] and self._has_ball():
+            reasons.append(f"wild {enemy['species']} Lv{enemy['level']} can be caught")
+
+        key = (player["species"], enemy["species"], enemy["level"], tuple(reasons))
+        if not reasons or key in self.deferred:
+            return None
+        self.deferred.add(key)
+        return "; ".join(reasons)
+
+    def _has_ball(self):
+        count = self.memory_reader.read_memory("wNumBagItems")
+        items = self.memory_reader.read_memory_bytes("wBagItems", count * 2)
+        return any(item in BALL_ITEMS for item in items[0::2])
+
+    def navigate(self, screen, target):
+        """ 커서(▶)를 target 위치(행, 열)로 옮기는 다음 버튼. 이미 도착했으면 'a' """
+        cursor = _find(screen, bytes([CURSOR_TILE]))
+        if cursor is None:
+            return None
+        (row, col), (target_row, target_col) = cursor, target
+        if row > target_row:
+            return "up"
+        if row < target_row:
+            return "down"
+        if col > target_col:
+            return "left"
+        if col < target_col:
+            return "right"
+        return "a"
+
+
+async def run_battle(engine, command_queue, max_buttons=MAX_BATTLE_BUTTONS):
+    """
+    전투가 끝나거나 LLM의 판단이 필요할 때까지 로컬에서 전투를 진행합니다.
+
+    Returns:
+        (bool, str): (LLM에게 넘겼는지, 실행 결과 요약)
+    """
+    presses = 0
+    idle = 0
+    while presses < max_buttons:
+        if not engine.in_battle():
+            engine.reset()
+            return False, f"battle ended after {presses} buttons"
+        screen = engine.read_screen()
+        phase = engine.phase(screen)
+        button = None
+        if phase == PHASE_TEXT:
+            button = "a"
+        elif phase == PHASE_MAIN_MENU:
+            state = engine.memory_reader.get_battle_state()
+            reason = engine.strategic_reason(state)
+            if reason:
+                BATTLE_DEFERRALS.inc()
+                return True, f"{reason}. Decide whether to switch (PKMN), use an ITEM or RUN; choose FIGHT to let the engine continue"
+            row, col = _find(screen, LABEL_FIGHT)
+            button = engine.navigate(screen, (row, col - 1))
+        elif phase == PHASE_MOVE_MENU:
+            state = engine.memory_reader.get_battle_state()
+            slot = engine.choose_move(state)
+            current = engine.memory_reader.read_memory("wCurrentMenuItem")
+            # PP가 모두 없으면(slot None) 발버둥이 자동으로 나감
+            button = "a" if slot is None else move_menu_button(slot, current)
+            if button == "a":
+                BATTLE_MOVES.inc()
+        elif phase in (PHASE_PARTY, PHASE_YES_NO):
+            BATTLE_DEFERRALS.inc()
+            return True, f"the game is asking for a choice ({phase})"
+
+        if button is None:
+            idle += 1
+            if idle >= MAX_IDLE_POLLS:
+                return True, "unrecognized battle screen"
+            await asyncio.sleep(POLL_SECONDS)
+            continue
+        idle = 0
+        await command_queue.put(button)
+        await command_queue.join()
+        await asyncio.sleep(BUTTON_SETTLE_SECONDS)
+        presses += 1
+        BATTLE_BUTTONS.inc()
+    return True, f"battle engine gave up after {max_buttons} buttons"
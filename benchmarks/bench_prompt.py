@@ -0,0 +1,43 @@
+"""
+프롬프트 상태 인코딩 비교
+
+기록된 메모리 덤프(benchmarks/fake_pyboy.py)의 게임 상태를 state_codec의 각 인코딩으로 직렬화하여
+글자 수와 추정 토큰 수를 출력합니다.
+
+사용법 (저장소 루트에서 실행):
+    python -m benchmarks.bench_prompt dumps/overworld.dump
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+from benchmarks.fake_pyboy import load_dump
+
+
+def main():
+    from memory_reader import MemoryReader
+    from state_codec import compare_encodings
+
+    parser = argparse.ArgumentParser(description="Compare prompt state encodings")
+    parser.add_argument("dumps", nargs="+", help="메모리 덤프 파일")
+    args = parser.parse_args()
+
+    print(f"{'dump/encoding':<40} {'chars':>8} {'tokens':>8} {'vs json':>9}")
+    for path in args.dumps:
+        pyboy, symbol_map = load_dump(path)
+        reader = MemoryReader(pyboy, symbol_map=symbol_map)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_state = reader.get_game_state()
+            screen = reader.generate_overworld_markdown_from_memory()
+        results = compare_encodings(game_state, screen)
+        dump_name = os.path.splitext(os.path.basename(path))[0]
+        for name, (chars, tokens) in results.items():
+            base = results["screen/markdown" if name.startswith("screen/") else "json"][1]
+            print(f"{dump_name + '/' + name:<40} {chars:>8} {tokens:>8} {tokens / base - 1:>+9.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
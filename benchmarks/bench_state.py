@@ -0,0 +1,187 @@
+"""
+상태 추출 핫패스 마이크로 벤치마크
+
+ROM 없이 기록된 메모리 덤프(benchmarks/fake_pyboy.py)로 MemoryReader, PlaceString 훅,
+화면 캡처를 구동하여 ns/op, 연산당 최대 메모리, 연산당 할당 수와 크기를 측정하고
+저장된 기준값(baseline)과 비교합니다.
+
+사용법 (저장소 루트에서 실행):
+    # ROM이 있는 환경에서 덤프 기록
+    python -m benchmarks.bench_state --record dumps/overworld.dump --rom data/pokered.gb --state overworld.state
+    # 벤치마크 실행 및 기준값 저장/비교
+    python -m benchmarks.bench_state dumps/overworld.dump --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_state dumps/overworld.dump --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_pyboy import FakeRegisterFile, load_dump, save_dump
+
+
+def find_rom_string(memory, start=0x0000, end=0x4000, min_length=8):
+    """ 훅 벤치마크에 사용할, 0x50으로 끝나는 문자열 포인터를 ROM 뱅크 0에서 찾음 """
+    run = 0
+    for addr in range(start, end):
+        byte = memory[addr]
+        if 0x80 <= byte <= 0xBF or byte == 0x7F:
+            run += 1
+        elif byte == 0x50 and run >= min_length:
+            return addr - run
+        else:
+            run = 0
+    return None
+
+
+def build_cases(pyboy, symbol_map):
+    """ (이름, 호출 가능 객체) 목록을 반환 """
+    from gb_hooker import TEXT_BOX_WINPOS, GBHooker
+    from llm_client import capture_screen
+    from memory_reader import MemoryReader
+
+    reader = MemoryReader(pyboy, symbol_map=symbol_map)
+    hooker = GBHooker(pyboy, symbol_map)
+    hooker.initHooks(asyncio.Queue())
+
+    cases = [
+        ("get_game_state", reader.get_game_state),
+        ("generate_overworld_markdown_from_memory", reader.generate_overworld_markdown_from_memory),
+        ("read_window_text", reader.read_window_text),
+        ("get_oam_positions", reader.get_oam_positions),
+        ("capture_screen", lambda: capture_screen(pyboy)),
+    ]
+    strptr = find_rom_string(pyboy.memory)
+    if strptr is not None:
+        registers = FakeRegisterFile(D=strptr >> 8, E=strptr & 0xFF, HL=TEXT_BOX_WINPOS)  # GBHooker가 처리하는 대화창 위치
+        # 캡처(에뮬레이터 경로)와 디코딩(디스패치 경로)을 나누어 측정
+        cases.append(("PlaceStringHook", lambda: (hooker.PlaceStringHook(registers), hooker.ring.pop_all())))
+        cases.append(("PlaceStringHook+decode", lambda: (hooker.PlaceStringHook(registers), hooker.drain())))
+    return cases
+
+
+def measure(func, number, repeat):
+    """
+    ns/op는 repeat번 반복 중 가장 빠른 값을 사용합니다.
+    peak_bytes는 한 번 호출하는 동안의 최대 추가 메모리입니다.
+    allocs_per_call / alloc_bytes_per_call은 호출 전후 tracemalloc 스냅샷의 차이로,
+    호출이 끝난 시점에 살아 있는 할당(반환값과 캐시 등)의 블록 수와 크기입니다.
+    sys.getallocatedblocks()와 달리 다른 스레드나 인터프리터 내부 캐시의 할당은 섞이지 않습니다.
+    """
+    func()  # 워밍업
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter_ns() - started) / number)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base_current, _ = tracemalloc.get_traced_memory()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    # 필터링은 추적을 멈춘 뒤에 하고, 스냅샷 객체와 이 함수 자체의 할당은 빼고 셈
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "filename")
+
+    return {
+        "ns_per_op": best,
+        "peak_bytes": peak - base_current,
+        "allocs_per_call": sum(stat.count_diff for stat in diff),
+        "alloc_bytes_per_call": sum(stat.size_diff for stat in diff),
+    }
+
+
+async def run_benchmarks(dump_paths, number, repeat):
+    results = {}
+    for path in dump_paths:
+        pyboy, symbol_map = load_dump(path)
+        dump_name = os.path.splitext(os.path.basename(path))[0]
+        for name, func in build_cases(pyboy, symbol_map):
+            # 핫패스의 print 출력은 측정 대상에 포함하되 터미널로 내보내지 않음
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[f"{dump_name}/{name}"] = measure(func, number, repeat)
+            await asyncio.sleep(0)
+    return results
+
+
+def print_report(results, baseline=None, threshold=0.1):
+    """ 결과 표를 출력하고, 기준값 대비 threshold 이상 느려진 항목 목록을 반환 """
+    regressions = []
+    print(f"{'benchmark':<60} {'ns/op':>12} {'peak KiB':>10} {'allocs':>8} {'alloc KiB':>10} {'vs base':>9}")
+    for name, r in results.items():
+        delta = ""
+        if baseline and name in baseline:
+            change = r["ns_per_op"] / baseline[name]["ns_per_op"] - 1
+            delta = f"{change:+.1%}"
+            if change > threshold:
+                regressions.append(name)
+        print(f"{name:<60} {r['ns_per_op']:>12.0f} {r['peak_bytes'] / 1024:>10.1f} {r['allocs_per_call']:>8} "
+              f"{r['alloc_bytes_per_call'] / 1024:>10.1f} {delta:>9}")
+    return regressions
+
+
+def record(out_path, rom_path, state_path, sym_path):
+    """ ROM을 헤드리스로 실행하여 현재 상태의 메모리 덤프를 기록 """
+    from pyboy import PyBoy
+    from symbol_parser import parse_sym_file
+
+    pyboy = PyBoy(rom_path, window="null")
+    if state_path:
+        with open(state_path, "rb") as f:
+            pyboy.load_state(f)
+    pyboy.tick(1, True)
+    save_dump(pyboy, parse_sym_file(sym_path), out_path)
+    pyboy.stop(save=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State-extraction hot path benchmarks")
+    parser.add_argument("dumps", nargs="*", help="메모리 덤프 파일")
+    parser.add_argument("--number", type=int, default=200, help="반복당 호출 횟수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="비교할 기준값 JSON")
+    parser.add_argument("--save-baseline", help="결과를 기준값 JSON으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 판단할 ns/op 증가 비율")
+    parser.add_argument("--record", metavar="DUMP", help="ROM을 실행해 덤프를 기록")
+    parser.add_argument("--rom", default="data/pokered.gb")
+    parser.add_argument("--state", help="덤프 기록 전에 불러올 세이브스테이트")
+    parser.add_argument("--sym", default="data/pokered.sym")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.rom, args.state, args.sym)
+        return 0
+    if not args.dumps:
+        parser.error("at least one dump is required")
+
+    results = asyncio.run(run_benchmarks(args.dumps, args.number, args.repeat))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = print_report(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if regressions:
+        print(f"[REGRESSION] {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
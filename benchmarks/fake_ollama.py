@@ -0,0 +1,115 @@
+"""
+가짜 Ollama 서버 (soak 하네스용)
+
+/api/chat에 Ollama와 같은 형식(NDJSON 스트리밍)으로 응답하는 로컬 aiohttp 서버입니다.
+첫 토큰 지연과 토큰당 지연을 설정할 수 있고, 응답은 정해진 시드로 만든 명령(/take_note, /joypad 등)입니다.
+별도 스레드의 이벤트 루프에서 동작하므로 에이전트의 이벤트 루프와 CPU 시간을 다투지 않습니다 (실제 Ollama처럼).
+
+    server = FakeOllama(first_token_latency=0.2, token_latency=0.01)
+    os.environ["OLLAMA_HOST"] = server.start()
+"""
+import asyncio
+import json
+import random
+import socket
+import threading
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+class FakeOllama:
+    def __init__(self, first_token_latency=0.05, token_latency=0.002, seed=0, map_note_every=10):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.map_note_every = map_note_every
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.prompt_chars = 0        # 지금까지 받은 프롬프트 글자 수 합 (구간 평균은 호출 측에서 차분으로 계산)
+        self.max_prompt_chars = 0
+        self.loop = None
+        self.thread = None
+        self._ready = threading.Event()
+        self._stopping = None
+
+    def response_text(self):
+        """ 실제 모델처럼 메모 한 줄과 이동 명령, 짧은 설명을 섞은 응답 """
+        self.requests += 1
+        direction = self.random.choice(DIRECTIONS)
+        lines = [f"/take_note Step {self.requests}: heading {direction} to look for unexplored ground."]
+        if self.map_note_every and self.requests % self.map_note_every == 0:
+            lines.append(f"/take_map_note Visited this area around request {self.requests}.")
+        lines.append(f"/joypad {direction}")
+        lines.append(f"Moving {direction} because that side of the map has not been explored yet.")
+        return "\n".join(lines)
+
+    async def chat(self, request):
+        from aiohttp import web
+
+        body = await request.json()
+        prompt = "".join(message.get("content", "") for message in body.get("messages", []))
+        self.prompt_chars += len(prompt)
+        self.max_prompt_chars = max(self.max_prompt_chars, len(prompt))
+        text = self.response_text()
+        model = body.get("model", "fake")
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        await asyncio.sleep(self.first_token_latency)
+        tokens = text.split(" ")
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            chunk = {"model": model, "created_at": "", "done": False,
+                     "message": {"role": "assistant", "content": token if i == len(tokens) - 1 else token + " "}}
+            await response.write(json.dumps(chunk).encode() + b"\n")
+        done = {"model": model, "created_at": "", "done": True, "done_reason": "stop",
+                "message": {"role": "assistant", "content": ""},
+                "prompt_eval_count": len(prompt) // 4, "eval_count": len(tokens)}
+        await response.write(json.dumps(done).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    async def generate(self, request):
+        """ preload_model()의 빈 프롬프트 요청 """
+        from aiohttp import web
+
+        return web.json_response({"model": "fake", "created_at": "", "response": "", "done": True})
+
+    async def _serve(self, sock):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/api/chat", self.chat)
+        app.router.add_post("/api/generate", self.generate)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.SockSite(runner, sock).start()
+        self._stopping = asyncio.Event()
+        self._ready.set()
+        await self._stopping.wait()
+        await runner.cleanup()
+
+    def start(self, host="127.0.0.1", port=0):
+        """ 서버 스레드를 시작하고 OLLAMA_HOST로 쓸 주소를 반환 (port=0이면 빈 포트) """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        port = sock.getsockname()[1]
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.loop.run_until_complete(self._serve(sock))
+            self.loop.close()
+
+        self.thread = threading.Thread(target=run, name="fake-ollama", daemon=True)
+        self.thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("fake Ollama server did not start")
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self._stopping.set)
+        self.thread.join()
+        self.thread = None
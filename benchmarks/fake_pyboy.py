@@ -0,0 +1,218 @@
+import base64
+import json
+import zlib
+
+from PIL import Image
+
+SCREEN_WIDTH = 160
+SCREEN_HEIGHT = 144
+
+
+class FakeMemory:
+    """ pyboy.memory와 같은 방식(정수, 슬라이스, (뱅크, 주소))으로 읽을 수 있는 64KB 메모리 """
+    def __init__(self, data):
+        self.data = bytearray(data)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            # 덤프는 현재 매핑된 뱅크만 담고 있으므로 뱅크는 무시
+            key = key[1]
+        if isinstance(key, slice):
+            return list(self.data[key])
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+
+class FakeScreen:
+    def __init__(self, image):
+        self.image = image
+
+
+class FakeRegisterFile:
+    """ 훅 콜백에 전달되는 레지스터 파일 (PlaceString 벤치마크용) """
+    def __init__(self, D=0, E=0, HL=0):
+        self.D = D
+        self.E = E
+        self.HL = HL
+
+
+class FakePyBoy:
+    """ ROM 없이 기록된 메모리 덤프로 MemoryReader, GBHooker, capture_screen을 구동하기 위한 PyBoy 대역 """
+    def __init__(self, memory, screen_image):
+        self.memory = FakeMemory(memory)
+        self.screen = FakeScreen(screen_image)
+        self.register_file = FakeRegisterFile()
+        self.frame_count = 0
+
+    def hook_register(self, bank, address, callback, context):
+        pass
+
+    def tick(self, count=1, render=True):
+        return True
+
+    def button(self, button, delay=1):
+        pass
+
+
+def save_dump(pyboy, symbol_map, path):
+    """
+    실행 중인 PyBoy의 메모리(0x0000-0xFFFF), 화면, 심볼 맵을 덤프 파일로 저장합니다.
+    ROM과 .sym 파일이 있는 환경에서 한 번 기록해 두면 이후에는 ROM 없이 벤치마크할 수 있습니다.
+    """
+    dump = {
+        "symbols": {name: list(value) for name, value in symbol_map.items()},
+        "memory": base64.b64encode(bytes(pyboy.memory[i] for i in range(0x10000))).decode(),
+        "screen": base64.b64encode(pyboy.screen.image.convert("RGBA").tobytes()).decode(),
+    }
+    with open(path, "wb") as f:
+        f.write(zlib.compress(json.dumps(dump).encode("utf-8"), 9))
+
+
+def load_dump(path):
+    """
+    덤프 파일을 읽어 (FakePyBoy, symbol_map)을 반환합니다.
+    """
+    with open(path, "rb") as f:
+        dump = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+    symbol_map = {name: tuple(value) for name, value in dump["symbols"].items()}
+    screen = Image.frombytes("RGBA", (SCREEN_WIDTH, SCREEN_HEIGHT), base64.b64decode(dump["screen"]))
+    return FakePyBoy(base64.b64decode(dump["memory"]), screen), symbol_map
+
+
+# 합성 메모리 배치 (soak 하네스용): 심볼 -> 크기. 주소는 WRAM에 차례로 배정
+SYNTHETIC_WRAM = (
+    ("wTileMap", 360), ("wCurrentTileBlockMapViewPointer", 360), ("wOAMBuffer", 160), ("wMapSpriteData", 40),
+    ("wSignCoords", 32), ("wHiddenObjectX", 10), ("wHiddenObjectY", 10), ("wWarpEntries", 128), ("wBagItems", 42),
+    ("wNumberOfWarps", 1), ("wNumBagItems", 1), ("wTilesetCollisionPtr", 2), ("wCurMap", 1), ("wXCoord", 1),
+    ("wYCoord", 1), ("wTrainerFacingDirection", 1), ("wIsInBattle", 1), ("wPlayerMoney", 3), ("wPlayTimeHours", 1),
+    ("wPlayTimeMinutes", 1), ("wPlayTimeSeconds", 1), ("wObtainedBadges", 1), ("wCurrentMenuItem", 1),
+    ("wCurOpponent", 1), ("wCurEnemyLevel", 1), ("wBattleResult", 1), ("wEnemyMon", 44), ("wEnemyMonSpecies", 1),
+    ("wEnemyMonLevel", 1), ("wEnemyMonHP", 2), ("wEnemyMonMaxHP", 2), ("wEnemyMonStatus", 1), ("wBattleMon", 44),
+    ("wBattleMonMoves", 4), ("wBattleMonPP", 4), ("wPartyCount", 7),
+) + tuple((f"wPartyMon{i}{field}", size) for i in range(1, 7)
+          for field, size in (("", 1), ("HP", 2), ("MaxHP", 2), ("Level", 1), ("Status", 1)))
+SYNTHETIC_HOOKS = {"PlaceString": 0x1955, "EnterMap": 0x03A6, "InitBattle": 0x0525, "EndOfBattle": 0x4696, "GiveItem": 0x3E2E}
+HWY_ADDRESS = 0xFFB0
+COLLISION_LIST_ADDRESS = 0x4000   # 통과 가능한 타일 목록 (ROM 영역)
+TEXT_ADDRESS = 0x5000             # PlaceString 훅에 넘길 문자열 (ROM 영역)
+WINDOW_CLOSED = 0x90
+FLOOR_TILE = 0x00
+WALL_TILE = 0x01
+SCREEN_TILE_WIDTH = 20
+SCREEN_TILE_HEIGHT = 18
+
+
+def synthetic_dump():
+    """
+    ROM 없이 만든 필드 화면 하나의 (메모리, 화면, 심볼 맵).
+    바닥 타일에 가장자리만 벽인 화면, 포켓몬 한 마리, 창이 닫힌 상태입니다.
+    """
+    symbol_map = {name: (0, address) for name, address in SYNTHETIC_HOOKS.items()}
+    symbol_map["hWY"] = (0, HWY_ADDRESS)
+    memory = bytearray(0x10000)
+    address = 0xC000
+    for name, size in SYNTHETIC_WRAM:
+        symbol_map[name] = (0, address)
+        address += size
+
+    def write(name, *values):
+        start = symbol_map[name][1]
+        memory[start:start + len(values)] = bytes(values)
+
+    memory[HWY_ADDRESS] = WINDOW_CLOSED
+    memory[COLLISION_LIST_ADDRESS:COLLISION_LIST_ADDRESS + 2] = bytes((FLOOR_TILE, 0xFF))
+    write("wTilesetCollisionPtr", COLLISION_LIST_ADDRESS & 0xFF, COLLISION_LIST_ADDRESS >> 8)
+    tile_map = symbol_map["wTileMap"][1]
+    for y in range(SCREEN_TILE_HEIGHT):
+        for x in range(SCREEN_TILE_WIDTH):
+            edge = x in (0, SCREEN_TILE_WIDTH - 1) or y in (0, SCREEN_TILE_HEIGHT - 1)
+            memory[tile_map + y * SCREEN_TILE_WIDTH + x] = WALL_TILE if edge else FLOOR_TILE
+    write("wXCoord", 5)
+    write("wYCoord", 5)
+    write("wPartyCount", 1, 0xB0, 0xFF)
+    write("wPartyMon1", 0xB0)
+    write("wPartyMon1Level", 5)
+    write("wPartyMon1HP", 0, 20)
+    write("wPartyMon1MaxHP", 0, 20)
+    return bytes(memory), Image.new("RGBA", (SCREEN_WIDTH, SCREEN_HEIGHT), (255, 255, 255, 255)), symbol_map
+
+
+class ScriptedPyBoy(FakePyBoy):
+    """
+    버튼에 반응하는 FakePyBoy (soak 하네스용).
+
+    - 방향 버튼은 wXCoord/wYCoord를 옮깁니다 (map_size 안에서).
+    - map_every번째 이동마다 다음 화면(frames)으로 넘어가며 wCurMap을 바꾸고 EnterMap 훅을 호출합니다.
+    - text_every번째 버튼마다 매번 다른 문장으로 PlaceString 훅을 호출합니다 (대화 기록이 쌓이는 경로).
+    frames: [(메모리, 화면 이미지)] - 기록된 덤프들이나 synthetic_dump()
+    """
+    MOVES = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
+    def __init__(self, frames, symbol_map, map_every=200, text_every=25, map_size=32):
+        super().__init__(frames[0][0], frames[0][1])
+        self.frames = frames
+        self.symbol_map = symbol_map
+        self.map_every = map_every
+        self.text_every = text_every
+        self.map_size = map_size
+        self.hooks = {}  # 주소 -> 콜백
+        self.frame_index = 0
+        self.moves = 0
+        self.buttons = 0
+
+    def hook_register(self, bank, address, callback, context):
+        self.hooks[address] = callback
+
+    def tick(self, count=1, render=True):
+        self.frame_count += count
+        return True
+
+    def _address(self, symbol):
+        return self.symbol_map[symbol][1]
+
+    def _call_hook(self, symbol, registers=None):
+        callback = self.hooks.get(self.symbol_map.get(symbol, (0, None))[1])
+        if callback is not None:
+            callback(registers or self.register_file)
+
+    def button(self, button, delay=1):
+        self.buttons += 1
+        if button in self.MOVES:
+            dx, dy = self.MOVES[button]
+            x_address, y_address = self._address("wXCoord"), self._address("wYCoord")
+            self.memory[x_address] = min(self.map_size - 1, max(0, self.memory[x_address] + dx))
+            self.memory[y_address] = min(self.map_size - 1, max(0, self.memory[y_address] + dy))
+            self.moves += 1
+            if self.moves % self.map_every == 0:
+                self.next_map()
+        if self.text_every and self.buttons % self.text_every == 0:
+            self.print_text(f"Hello! This is message {self.buttons}.")
+
+    def next_map(self):
+        """ 다음 화면으로 넘어가고 맵 번호를 올림 (좌표는 유지) """
+        x, y = self.memory[self._address("wXCoord")], self.memory[self._address("wYCoord")]
+        map_id = (self.memory[self._address("wCurMap")] + 1) % 0xF8
+        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        data, image = self.frames[self.frame_index]
+        self.memory.data[:] = data
+        self.screen.image = image
+        self.memory[self._address("wXCoord")], self.memory[self._address("wYCoord")] = x, y
+        self.memory[self._address("wCurMap")] = map_id
+        self._call_hook("EnterMap")
+
+    def print_text(self, text):
+        """ 대화창에 text를 출력하는 PlaceString 호출을 흉내냄 """
+        from gb_hooker import TEXT_BOX_WINPOS
+        import text_codec
+
+        encoded = text_codec.encode(text)
+        self.memory.data[TEXT_ADDRESS:TEXT_ADDRESS + len(encoded)] = encoded
+        self._call_hook("PlaceString", FakeRegisterFile(D=TEXT_ADDRESS >> 8, E=TEXT_ADDRESS & 0xFF, HL=TEXT_BOX_WINPOS))
+
+    def save_state(self, file):
+        file.write(bytes(self.memory.data))
+
+    def load_state(self, file):
+        self.memory.data[:] = file.read()
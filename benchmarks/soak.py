@@ -0,0 +1,259 @@
+"""
+장시간 soak / 처리량 하네스
+
+ROM과 모델 없이 실제 game_loop과 llm_worker를 오래 돌려 처리량, 지연, 메모리 증가를 봅니다.
+- 에뮬레이터: ScriptedPyBoy (기록된 덤프들 또는 합성 메모리. 버튼에 따라 좌표/맵이 바뀌고 대화 훅이 호출됨)
+- LLM: FakeOllama (로컬 스트리밍 서버, 지연 설정 가능). OLLAMA_HOST로 연결하므로 llm_client는 그대로 사용
+interval초마다 steps/s, 스텝/LLM 지연 백분위수(구간), RSS, 평균 프롬프트 길이를 한 줄씩 기록하고,
+끝난 뒤 기준을 넘는 항목이 있으면 종료 코드 1을 반환합니다.
+
+메모, 대화, 맵 메모처럼 스텝마다 쌓이는 상태가 제한 없이 커지면 RSS 증가와 프롬프트 길이 증가로 드러납니다.
+
+사용법 (저장소 루트에서 실행):
+    python -m benchmarks.soak --steps 100000 --output soak.jsonl
+    python -m benchmarks.soak --steps 5000 --first-token-ms 200 --token-ms 10 --max-rss-growth-mb 64 --max-prompt-growth 1.5
+    python -m benchmarks.soak --steps 20000 --save-baseline benchmarks/soak_baseline.json
+    python -m benchmarks.soak --steps 20000 --baseline benchmarks/soak_baseline.json
+    # 기록된 덤프로 (bench_state --record로 생성)
+    python -m benchmarks.soak dumps/overworld.dump dumps/town.dump --steps 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.fake_pyboy import ScriptedPyBoy, load_dump, synthetic_dump
+from prompt_budget import DEFAULT_BUDGET, PromptBudget
+from state_codec import DEFAULT_ENCODING, ENCODINGS, StateEncoder
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def window_histogram(histogram, previous_counts):
+    """ 누적 히스토그램에서 직전 샘플 이후 구간만 담은 히스토그램 """
+    from metrics import Histogram
+
+    window = Histogram(histogram.name, histogram.help, histogram.buckets)
+    window.counts = [now - before for now, before in zip(histogram.counts, previous_counts)]
+    window.count = sum(window.counts)
+    return window
+
+
+def load_frames(dump_paths):
+    """ 덤프가 있으면 (화면 목록, 심볼 맵), 없으면 합성 화면 하나 """
+    if not dump_paths:
+        memory, image, symbol_map = synthetic_dump()
+        return [(memory, image)], symbol_map
+    frames = []
+    symbol_map = None
+    for path in dump_paths:
+        pyboy, symbols = load_dump(path)
+        frames.append((bytes(pyboy.memory.data), pyboy.screen.image))
+        symbol_map = symbol_map or symbols
+    return frames, symbol_map
+
+
+class Sampler:
+    """ 주기적으로 처리량, 구간 지연 백분위수, RSS, 프롬프트 길이를 기록 """
+    def __init__(self, llm, output=None):
+        from llm_client import LLM_LATENCY
+        from main import STEPS, STEP_SECONDS
+
+        self.llm = llm
+        self.output = output
+        self.steps = STEPS
+        self.histograms = {"step": STEP_SECONDS, "llm": LLM_LATENCY}
+        self.samples = []
+        self.started = time.perf_counter()
+        self.last = (self.started, 0, 0, 0)  # (시각, 스텝, 요청 수, 프롬프트 글자 수)
+        self.last_counts = {name: list(h.counts) for name, h in self.histograms.items()}
+
+    def sample(self):
+        from metrics import get_rss_bytes
+
+        now = time.perf_counter()
+        last_time, last_steps, last_requests, last_chars = self.last
+        steps = self.steps.value
+        requests = self.llm.requests
+        sample = {
+            "elapsed": round(now - self.started, 3),
+            "steps": steps,
+            "steps_per_second": (steps - last_steps) / (now - last_time) if now > last_time else 0.0,
+            "rss_mb": get_rss_bytes() / (1 << 20),
+            "prompt_chars": (self.llm.prompt_chars - last_chars) / (requests - last_requests)
+                            if requests > last_requests else None,
+        }
+        for name, histogram in self.histograms.items():
+            window = window_histogram(histogram, self.last_counts[name])
+            for q in PERCENTILES:
+                sample[f"{name}_p{int(q * 100)}_ms"] = window.percentile(q) * 1000
+            self.last_counts[name] = list(histogram.counts)
+        self.last = (now, steps, requests, self.llm.prompt_chars)
+        self.samples.append(sample)
+        if self.output is not None:
+            self.output.write(json.dumps(sample) + "\n")
+            self.output.flush()
+        print(f"{sample['elapsed']:>8.0f}s {steps:>8} steps {sample['steps_per_second']:>8.1f}/s "
+              f"step p99 {sample['step_p99_ms']:>7.1f}ms  llm p99 {sample['llm_p99_ms']:>7.1f}ms  "
+              f"rss {sample['rss_mb']:>7.1f}MB  prompt {sample['prompt_chars'] or 0:>7.0f} chars")
+        return sample
+
+
+def summarize(samples, warmup_steps):
+    """ 워밍업 이후 구간의 처리량, 최대 지연, RSS/프롬프트 증가 """
+    steady = [s for s in samples if s["steps"] >= warmup_steps] or samples
+    first, last = steady[0], steady[-1]
+    elapsed = last["elapsed"] - first["elapsed"]
+    prompts = [s["prompt_chars"] for s in steady if s["prompt_chars"]]
+    steps = last["steps"] - first["steps"]
+    return {
+        "steps": last["steps"],
+        "steps_per_second": steps / elapsed if elapsed > 0 else last["steps_per_second"],
+        "step_p99_ms": max(s["step_p99_ms"] for s in steady),
+        "llm_p99_ms": max(s["llm_p99_ms"] for s in steady),
+        "rss_start_mb": first["rss_mb"],
+        "rss_end_mb": last["rss_mb"],
+        "rss_growth_mb": last["rss_mb"] - first["rss_mb"],
+        "rss_mb_per_10k_steps": (last["rss_mb"] - first["rss_mb"]) * 10000 / steps if steps else 0.0,
+        "prompt_growth": prompts[-1] / prompts[0] if len(prompts) > 1 else 1.0,
+    }
+
+
+def check(summary, args, baseline=None):
+    """ 기준을 넘은 항목 설명 목록 """
+    failures = []
+    limits = (
+        ("steps_per_second", args.min_steps_per_second, lambda value, limit: value < limit),
+        ("step_p99_ms", args.max_step_p99_ms, lambda value, limit: value > limit),
+        ("rss_growth_mb", args.max_rss_growth_mb, lambda value, limit: value > limit),
+        ("prompt_growth", args.max_prompt_growth, lambda value, limit: value > limit),
+    )
+    for name, limit, exceeded in limits:
+        if limit is not None and exceeded(summary[name], limit):
+            failures.append(f"{name} {summary[name]:.2f} (limit {limit})")
+    if baseline:
+        if summary["steps_per_second"] < baseline["steps_per_second"] * (1 - args.threshold):
+            failures.append(f"steps_per_second {summary['steps_per_second']:.1f} "
+                            f"(baseline {baseline['steps_per_second']:.1f})")
+        if summary["step_p99_ms"] > baseline["step_p99_ms"] * (1 + args.threshold):
+            failures.append(f"step_p99_ms {summary['step_p99_ms']:.1f} (baseline {baseline['step_p99_ms']:.1f})")
+    return failures
+
+
+async def run_soak(args):
+    from channels import CommandChannel, DropOldestChannel
+    from exploration_store import ExplorationStore
+    from gb_hooker import GBHooker
+    from logs import setup_logging
+    from main import STALE_EVENTS, STEPS, game_loop, llm_worker
+    from memory_reader import MemoryReader
+    from pipeline import StepPipeline
+
+    log_writer = setup_logging(args.log_level)
+    llm = FakeOllama(args.first_token_ms / 1000, args.token_ms / 1000, args.seed)
+    os.environ["OLLAMA_HOST"] = llm.start()
+
+    frames, symbol_map = load_frames(args.dumps)
+    pyboy = ScriptedPyBoy(frames, symbol_map, args.map_every, args.text_every)
+    memory_reader = MemoryReader(pyboy, symbol_map=symbol_map)
+    hooker = GBHooker(pyboy, symbol_map)
+    dialogues_queue = DropOldestChannel()
+    events_queue = DropOldestChannel()
+    pipeline = StepPipeline(pyboy, memory_reader)
+    command_queue = CommandChannel()
+    hooker.initHooks(dialogues_queue, events_queue)
+
+    def on_event(event):
+        if event.type in STALE_EVENTS:
+            pipeline.invalidate()
+            command_queue.cancel_stale()
+    hooker.add_listener(on_event)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    with tempfile.TemporaryDirectory() as directory:
+        store = ExplorationStore(os.path.join(directory, "soak.db"))
+        tasks = [
+            asyncio.create_task(hooker.dispatch_loop()),
+            asyncio.create_task(llm_worker(pipeline, command_queue, dialogues_queue, memory_reader, events_queue, store,
+                                           None, StateEncoder(args.state_encoding), PromptBudget(args.prompt_budget),
+                                           args.num_ctx)),
+            asyncio.create_task(game_loop(pyboy, pipeline, command_queue, frame_interval=args.frame_interval)),
+        ]
+        sampler = Sampler(llm, output)
+        deadline = time.perf_counter() + args.timeout if args.timeout else None
+        try:
+            while STEPS.value < args.steps:
+                done, _ = await asyncio.wait(tasks, timeout=args.interval, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # 에이전트 작업이 예외로 끝났으면 그대로 실패
+                sampler.sample()
+                if deadline is not None and time.perf_counter() > deadline:
+                    print(f"[TIMEOUT] stopped after {args.timeout:.0f}s at {STEPS.value} steps")
+                    break
+            sampler.sample()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            store.close()
+            llm.stop()
+            if output is not None:
+                output.close()
+            log_writer.stop()
+    return sampler.samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end soak and throughput harness (no ROM or model needed)")
+    parser.add_argument("dumps", nargs="*", help="메모리 덤프 파일 (없으면 합성 화면 사용)")
+    parser.add_argument("--steps", type=int, default=10000, help="실행할 에이전트 스텝 수")
+    parser.add_argument("--warmup-steps", type=int, help="요약에서 제외할 초기 스텝 수 (기본: 전체의 10%%)")
+    parser.add_argument("--interval", type=float, default=5.0, help="샘플 주기(초)")
+    parser.add_argument("--timeout", type=float, help="이 시간(초)이 지나면 스텝 수와 관계없이 종료")
+    parser.add_argument("--output", help="샘플을 JSON 줄로 기록할 파일")
+    parser.add_argument("--first-token-ms", type=float, default=50.0, help="가짜 LLM의 첫 토큰 지연")
+    parser.add_argument("--token-ms", type=float, default=2.0, help="가짜 LLM의 토큰당 지연")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frame-interval", type=float, default=0.0, help="game_loop 프레임 간 대기 (0이면 최대 속도)")
+    parser.add_argument("--map-every", type=int, default=200, help="이동 몇 번마다 다음 맵으로 넘어갈지")
+    parser.add_argument("--text-every", type=int, default=25, help="버튼 몇 번마다 대화 텍스트를 출력할지")
+    parser.add_argument("--state-encoding", choices=ENCODINGS, default=DEFAULT_ENCODING)
+    parser.add_argument("--prompt-budget", type=int, default=DEFAULT_BUDGET)
+    parser.add_argument("--num-ctx", type=int, default=8192)
+    parser.add_argument("--log-level", default="error", help="agent.* 로거 레벨")
+    parser.add_argument("--min-steps-per-second", type=float, help="워밍업 이후 평균 처리량 하한")
+    parser.add_argument("--max-step-p99-ms", type=float, help="구간별 스텝 지연 p99 상한")
+    parser.add_argument("--max-rss-growth-mb", type=float, help="워밍업 이후 RSS 증가 상한")
+    parser.add_argument("--max-prompt-growth", type=float, help="워밍업 이후 평균 프롬프트 길이 증가 비율 상한")
+    parser.add_argument("--baseline", help="비교할 기준 요약 JSON")
+    parser.add_argument("--save-baseline", help="요약을 기준 JSON으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.1, help="기준 대비 회귀로 판단할 비율")
+    args = parser.parse_args()
+
+    samples = asyncio.run(run_soak(args))
+    warmup = args.warmup_steps if args.warmup_steps is not None else args.steps // 10
+    summary = summarize(samples, warmup)
+    print(json.dumps(summary, indent=2))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = check(summary, args, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if failures:
+        print(f"[REGRESSION] {'; '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+에뮬레이터 루프와 에이전트 사이의 유한 채널
+
+- CommandChannel: 버튼 명령 채널. 크기가 정해져 있어 생산자는 가득 차면 기다립니다(배압).
+  명령에는 그 명령을 결정할 때 본 상태의 세대(epoch)가 붙고, 게임 상태가 예상 밖으로 바뀌면
+  (맵 이동, 전투 시작 등) cancel_stale()로 세대를 올려 이전 세대의 명령을 버립니다.
+- DropOldestChannel: 훅 이벤트/대화 텍스트처럼 에뮬레이터 경로에서 기다릴 수 없는 생산자를 위한 채널.
+  가득 차면 가장 오래된 항목을 버리고, 소비자는 drain()으로 한 번에 가져갑니다.
+"""
+import asyncio
+from collections import deque
+
+from metrics import REGISTRY
+
+STALE_COMMANDS = REGISTRY.counter("stale_commands_dropped_total", "Commands dropped because the game state moved on")
+CHANNEL_OVERFLOW = REGISTRY.counter("channel_overflow_dropped_total", "Oldest items dropped from full event/text channels")
+
+
+class CommandChannel:
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.items = deque()   # (epoch, button)
+        self.epoch = 0
+        self.unfinished = 0
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+
+    async def put(self, button, epoch=None):
+        """
+        명령을 넣습니다. 채널이 가득 차면 빈 자리가 날 때까지 기다립니다.
+        epoch가 현재 세대보다 오래되었으면 넣지 않고 False를 반환합니다.
+        """
+        while len(self.items) >= self.maxsize:
+            self._not_full.clear()
+            await self._not_full.wait()
+        if epoch is None:
+            epoch = self.epoch
+        elif epoch < self.epoch:
+            STALE_COMMANDS.inc()
+            return False
+        self.items.append((epoch, button))
+        self.unfinished += 1
+        self._all_done.clear()
+        return True
+
+    def get_nowait(self):
+        """ 다음 명령 (없으면 None). 에뮬레이터 루프에서 매 프레임 호출되므로 기다리지 않습니다. """
+        if not self.items:
+            return None
+        _, button = self.items.popleft()
+        self._not_full.set()
+        return button
+
+    def task_done(self):
+        self.unfinished -= 1
+        if self.unfinished <= 0:
+            self.unfinished = 0
+            self._all_done.set()
+
+    async def join(self):
+        """ 지금까지 넣은 명령이 모두 실행(또는 취소)될 때까지 기다림 """
+        await self._all_done.wait()
+
+    def cancel_stale(self):
+        """ 세대를 올리고 대기 중인 명령을 모두 버림. 버린 개수를 반환 """
+        self.epoch += 1
+        dropped = len(self.items)
+        self.items.clear()
+        if dropped:
+            STALE_COMMANDS.inc(dropped)
+            for _ in range(dropped):
+                self.task_done()
+            self._not_full.set()
+        return dropped
+
+    def qsize(self):
+        return len(self.items)
+
+    def empty(self):
+        return not self.items
+
+
+class DropOldestChannel:
+    def __init__(self, maxsize=64):
+        self.items = deque(maxlen=maxsize)
+
+    def put_nowait(self, item):
+        if len(self.items) == self.items.maxlen:
+            CHANNEL_OVERFLOW.inc()
+        self.items.append(item)
+
+    def drain(self):
+        """ 쌓인 항목을 모두 꺼내 리스트로 반환 """
+        items = list(self.items)
+        self.items.clear()
+        return items
+
+    def qsize(self):
+        return len(self.items)
+
+    def empty(self):
+        return not self.items
@@ -1,480 +1,950 @@
+"""
+상수 테이블
+
+ID -> 이름 테이블은 처음 사용할 때 256칸 튜플로 만들어집니다 (LookupTable).
+    MAPS.names[map_id]         # 알 수 없는 ID는 "UNKNOWN_MAP_<id>"
+    MAPS.id("PALLET_TOWN")     # 이름 -> ID
+    MAPS.take(ids)             # NumPy 배열에 대한 벡터 조회
+기존 dict 이름(MAP_ID_TO_NAME 등)과 CHARMAP도 접근 시점에 로드됩니다.
+"""
+
+
+class LookupTable:
+    """
+    바이트 ID(0~255)로 인덱싱하는 지연 로딩 이름 테이블.
+    names는 256칸 튜플이므로 조회는 튜플 인덱싱 한 번입니다.
+    """
+    def __init__(self, loader, unknown_prefix):
+        self._loader = loader
+        self.unknown_prefix = unknown_prefix
+        self._known = None
+        self._names = None
+        self._ids = None
+        self._array = None
+
+    def _load(self):
+        self._known = self._loader()
+        self._names = tuple(self._known.get(i, f"{self.unknown_prefix}_{i}") for i in range(256))
+
+    @property
+    def known(self):
+        """ 정의된 항목만 담은 {ID: 이름} dict """
+        if self._known is None:
+            self._load()
+        return self._known
+
+    @property
+    def names(self):
+        """ 256칸 이름 튜플 (정의되지 않은 ID는 UNKNOWN_<종류>_<id>) """
+        if self._names is None:
+            self._load()
+        return self._names
+
+    def name(self, id):
+        return self.names[id]
+
+    def id(self, name):
+        """ 이름 -> ID (UNKNOWN_<종류>_<id> 형식도 인식, 없으면 None) """
+        if self._ids is None:
+            self._ids = {name: id for id, name in enumerate(self.names)}
+        return self._ids.get(name)
+
+    def get(self, id, default=None):
+        return self.known.get(id, default)
+
+    def __getitem__(self, id):
+        return self.known[id]
+
+    def __contains__(self, id):
+        return id in self.known
+
+    def __iter__(self):
+        return iter(self.known)
+
+    def __len__(self):
+        return len(self.known)
+
+    def items(self):
+        return self.known.items()
+
+    def array(self):
+        """ names를 NumPy object 배열로 반환 (numpy.take 등 벡터 연산용) """
+        if self._array is None:
+            import numpy as np
+            self._array = np.array(self.names, dtype=object)
+        return self._array
+
+    def take(self, ids):
+        """ ID 배열을 이름 배열로 변환 """
+        import numpy as np
+        return np.take(self.array(), np.asarray(ids, dtype=np.uint8))
+
+
 # 맵 ID와 맵 이름 매핑
-MAP_ID_TO_NAME = {
-    0x00: "PALLET_TOWN",
-    0x01: "VIRIDIAN_CITY",
-    0x02: "PEWTER_CITY",
-    0x03: "CERULEAN_CITY",
-    0x04: "LAVENDER_TOWN",
-    0x05: "VERMILION_CITY",
-    0x06: "CELADON_CITY",
-    0x07: "FUCHSIA_CITY",
-    0x08: "CINNABAR_ISLAND",
-    0x09: "INDIGO_PLATEAU",
-    0x0A: "SAFFRON_CITY",
-    0x0C: "ROUTE_1",
-    0x0D: "ROUTE_2",
-    0x0E: "ROUTE_3",
-    0x0F: "ROUTE_4",
-    0x10: "ROUTE_5",
-    0x11: "ROUTE_6",
-    0x12: "ROUTE_7",
-    0x13: "ROUTE_8",
-    0x14: "ROUTE_9",
-    0x15: "ROUTE_10",
-    0x16: "ROUTE_11",
-    0x17: "ROUTE_12",
-    0x18: "ROUTE_13",
-    0x19: "ROUTE_14",
-    0x1A: "ROUTE_15",
-    0x1B: "ROUTE_16",
-    0x1C: "ROUTE_17",
-    0x1D: "ROUTE_18",
-    0x1E: "ROUTE_19",
-    0x1F: "ROUTE_20",
-    0x20: "ROUTE_21",
-    0x21: "ROUTE_22",
-    0x22: "ROUTE_23",
-    0x23: "ROUTE_24",
-    0x24: "ROUTE_25",
-    0x25: "REDS_HOUSE_1F",
-    0x26: "REDS_HOUSE_2F",
-    0x27: "BLUES_HOUSE",
-    0x28: "OAKS_LAB",
-    0x29: "VIRIDIAN_POKECENTER",
-    0x2A: "VIRIDIAN_MART",
-    0x2B: "VIRIDIAN_SCHOOL_HOUSE",
-    0x2C: "VIRIDIAN_NICKNAME_HOUSE",
-    0x2D: "VIRIDIAN_GYM",
-    0x2E: "DIGLETTS_CAVE_ROUTE_2",
-    0x2F: "VIRIDIAN_FOREST_NORTH_GATE",
-    0x30: "ROUTE_2_TRADE_HOUSE",
-    0x31: "ROUTE_2_GATE",
-    0x32: "VIRIDIAN_FOREST_SOUTH_GATE",
-    0x33: "VIRIDIAN_FOREST",
-    0x34: "MUSEUM_1F",
-    0x35: "MUSEUM_2F",
-    0x36: "PEWTER_GYM",
-    0x37: "PEWTER_NIDORAN_HOUSE",
-    0x38: "PEWTER_MART",
-    0x39: "PEWTER_SPEECH_HOUSE",
-    0x3A: "PEWTER_POKECENTER",
-    0x3B: "MT_MOON_1F",
-    0x3C: "MT_MOON_B1F",
-    0x3D: "MT_MOON_B2F",
-    0x3E: "CERULEAN_TRASHED_HOUSE",
-    0x3F: "CERULEAN_TRADE_HOUSE",
-    0x40: "CERULEAN_POKECENTER",
-    0x41: "CERULEAN_GYM",
-    0x42: "BIKE_SHOP",
-    0x43: "CERULEAN_MART",
-    0x44: "MT_MOON_POKECENTER",
-    0x45: "CERULEAN_TRASHED_HOUSE_COPY",
-    0x46: "ROUTE_5_GATE",
-    0x47: "UNDERGROUND_PATH_ROUTE_5",
-    0x48: "DAYCARE",
-    0x49: "ROUTE_6_GATE",
-    0x4A: "UNDERGROUND_PATH_ROUTE_6",
-    0x4B: "UNDERGROUND_PATH_ROUTE_6_COPY",
-    0x4C: "ROUTE_7_GATE",
-    0x4D: "UNDERGROUND_PATH_ROUTE_7",
-    0x4E: "UNDERGROUND_PATH_ROUTE_7_COPY",
-    0x4F: "ROUTE_8_GATE",
-    0x50: "UNDERGROUND_PATH_ROUTE_8",
-    0x51: "ROCK_TUNNEL_POKECENTER",
-    0x52: "ROCK_TUNNEL_1F",
-    0x53: "POWER_PLANT",
-    0x54: "ROUTE_11_GATE_1F",
-    0x55: "DIGLETTS_CAVE_ROUTE_11",
-    0x56: "ROUTE_11_GATE_2F",
-    0x57: "ROUTE_12_GATE_1F",
-    0x58: "BILLS_HOUSE",
-    0x59: "VERMILION_POKECENTER",
-    0x5A: "POKEMON_FAN_CLUB",
-    0x5B: "VERMILION_MART",
-    0x5C: "VERMILION_GYM",
-    0x5D: "VERMILION_PIDGEY_HOUSE",
-    0x5E: "VERMILION_DOCK",
-    0x5F: "SS_ANNE_1F",
-    0x60: "SS_ANNE_2F",
-    0x61: "SS_ANNE_3F",
-    0x62: "SS_ANNE_B1F",
-    0x63: "SS_ANNE_BOW",
-    0x64: "SS_ANNE_KITCHEN",
-    0x65: "SS_ANNE_CAPTAINS_ROOM",
-    0x66: "SS_ANNE_1F_ROOMS",
-    0x67: "SS_ANNE_2F_ROOMS",
-    0x68: "SS_ANNE_B1F_ROOMS",
-    0x76: "HALL_OF_FAME",
-    0xA5: "POKEMON_MANSION_1F",
-    0xA6: "CINNABAR_GYM",
-    0xA7: "CINNABAR_LAB",
-    0xAB: "CINNABAR_POKECENTER",
-    0xAC: "CINNABAR_MART",
-    0xB5: "SILPH_CO_1F",
-    0xB6: "SAFFRON_POKECENTER",
-    0xB8: "ROUTE_15_GATE_1F",
-    0xBE: "ROUTE_18_GATE_1F",
-    0xBF: "ROUTE_18_GATE_2F",
-    0xC0: "SEAFOAM_ISLANDS_1F",
-    0xC5: "DIGLETTS_CAVE",
-    0xC6: "VICTORY_ROAD_3F",
-    0xD6: "POKEMON_MANSION_2F",
-    0xD7: "POKEMON_MANSION_3F",
-    0xD8: "POKEMON_MANSION_B1F",
-    0xE2: "CERULEAN_CAVE_2F",
-    0xE3: "CERULEAN_CAVE_B1F",
-    0xE4: "CERULEAN_CAVE_1F",
-    0xF5: "LORELEIS_ROOM",
-    0xF6: "BRUNOS_ROOM",
-    0xF7: "AGATHAS_ROOM",
-}
+def _load_map_names():
+    return {
+        0x00: "PALLET_TOWN",
+        0x01: "VIRIDIAN_CITY",
+        0x02: "PEWTER_CITY",
+        0x03: "CERULEAN_CITY",
+        0x04: "LAVENDER_TOWN",
+        0x05: "VERMILION_CITY",
+        0x06: "CELADON_CITY",
+        0x07: "FUCHSIA_CITY",
+        0x08: "CINNABAR_ISLAND",
+        0x09: "INDIGO_PLATEAU",
+        0x0A: "SAFFRON_CITY",
+        0x0C: "ROUTE_1",
+        0x0D: "ROUTE_2",
+        0x0E: "ROUTE_3",
+        0x0F: "ROUTE_4",
+        0x10: "ROUTE_5",
+        0x11: "ROUTE_6",
+        0x12: "ROUTE_7",
+        0x13: "ROUTE_8",
+        0x14: "ROUTE_9",
+        0x15: "ROUTE_10",
+        0x16: "ROUTE_11",
+        0x17: "ROUTE_12",
+        0x18: "ROUTE_13",
+        0x19: "ROUTE_14",
+        0x1A: "ROUTE_15",
+        0x1B: "ROUTE_16",
+        0x1C: "ROUTE_17",
+        0x1D: "ROUTE_18",
+        0x1E: "ROUTE_19",
+        0x1F: "ROUTE_20",
+        0x20: "ROUTE_21",
+        0x21: "ROUTE_22",
+        0x22: "ROUTE_23",
+        0x23: "ROUTE_24",
+        0x24: "ROUTE_25",
+        0x25: "REDS_HOUSE_1F",
+        0x26: "REDS_HOUSE_2F",
+        0x27: "BLUES_HOUSE",
+        0x28: "OAKS_LAB",
+        0x29: "VIRIDIAN_POKECENTER",
+        0x2A: "VIRIDIAN_MART",
+        0x2B: "VIRIDIAN_SCHOOL_HOUSE",
+        0x2C: "VIRIDIAN_NICKNAME_HOUSE",
+        0x2D: "VIRIDIAN_GYM",
+        0x2E: "DIGLETTS_CAVE_ROUTE_2",
+        0x2F: "VIRIDIAN_FOREST_NORTH_GATE",
+        0x30: "ROUTE_2_TRADE_HOUSE",
+        0x31: "ROUTE_2_GATE",
+        0x32: "VIRIDIAN_FOREST_SOUTH_GATE",
+        0x33: "VIRIDIAN_FOREST",
+        0x34: "MUSEUM_1F",
+        0x35: "MUSEUM_2F",
+        0x36: "PEWTER_GYM",
+        0x37: "PEWTER_NIDORAN_HOUSE",
+        0x38: "PEWTER_MART",
+        0x39: "PEWTER_SPEECH_HOUSE",
+        0x3A: "PEWTER_POKECENTER",
+        0x3B: "MT_MOON_1F",
+        0x3C: "MT_MOON_B1F",
+        0x3D: "MT_MOON_B2F",
+        0x3E: "CERULEAN_TRASHED_HOUSE",
+        0x3F: "CERULEAN_TRADE_HOUSE",
+        0x40: "CERULEAN_POKECENTER",
+        0x41: "CERULEAN_GYM",
+        0x42: "BIKE_SHOP",
+        0x43: "CERULEAN_MART",
+        0x44: "MT_MOON_POKECENTER",
+        0x45: "CERULEAN_TRASHED_HOUSE_COPY",
+        0x46: "ROUTE_5_GATE",
+        0x47: "UNDERGROUND_PATH_ROUTE_5",
+        0x48: "DAYCARE",
+        0x49: "ROUTE_6_GATE",
+        0x4A: "UNDERGROUND_PATH_ROUTE_6",
+        0x4B: "UNDERGROUND_PATH_ROUTE_6_COPY",
+        0x4C: "ROUTE_7_GATE",
+        0x4D: "UNDERGROUND_PATH_ROUTE_7",
+        0x4E: "UNDERGROUND_PATH_ROUTE_7_COPY",
+        0x4F: "ROUTE_8_GATE",
+        0x50: "UNDERGROUND_PATH_ROUTE_8",
+        0x51: "ROCK_TUNNEL_POKECENTER",
+        0x52: "ROCK_TUNNEL_1F",
+        0x53: "POWER_PLANT",
+        0x54: "ROUTE_11_GATE_1F",
+        0x55: "DIGLETTS_CAVE_ROUTE_11",
+        0x56: "ROUTE_11_GATE_2F",
+        0x57: "ROUTE_12_GATE_1F",
+        0x58: "BILLS_HOUSE",
+        0x59: "VERMILION_POKECENTER",
+        0x5A: "POKEMON_FAN_CLUB",
+        0x5B: "VERMILION_MART",
+        0x5C: "VERMILION_GYM",
+        0x5D: "VERMILION_PIDGEY_HOUSE",
+        0x5E: "VERMILION_DOCK",
+        0x5F: "SS_ANNE_1F",
+        0x60: "SS_ANNE_2F",
+        0x61: "SS_ANNE_3F",
+        0x62: "SS_ANNE_B1F",
+        0x63: "SS_ANNE_BOW",
+        0x64: "SS_ANNE_KITCHEN",
+        0x65: "SS_ANNE_CAPTAINS_ROOM",
+        0x66: "SS_ANNE_1F_ROOMS",
+        0x67: "SS_ANNE_2F_ROOMS",
+        0x68: "SS_ANNE_B1F_ROOMS",
+        0x76: "HALL_OF_FAME",
+        0xA5: "POKEMON_MANSION_1F",
+        0xA6: "CINNABAR_GYM",
+        0xA7: "CINNABAR_LAB",
+        0xAB: "CINNABAR_POKECENTER",
+        0xAC: "CINNABAR_MART",
+        0xB5: "SILPH_CO_1F",
+        0xB6: "SAFFRON_POKECENTER",
+        0xB8: "ROUTE_15_GATE_1F",
+        0xBE: "ROUTE_18_GATE_1F",
+        0xBF: "ROUTE_18_GATE_2F",
+        0xC0: "SEAFOAM_ISLANDS_1F",
+        0xC5: "DIGLETTS_CAVE",
+        0xC6: "VICTORY_ROAD_3F",
+        0xD6: "POKEMON_MANSION_2F",
+        0xD7: "POKEMON_MANSION_3F",
+        0xD8: "POKEMON_MANSION_B1F",
+        0xE2: "CERULEAN_CAVE_2F",
+        0xE3: "CERULEAN_CAVE_B1F",
+        0xE4: "CERULEAN_CAVE_1F",
+        0xF5: "LORELEIS_ROOM",
+        0xF6: "BRUNOS_ROOM",
+        0xF7: "AGATHAS_ROOM",
+    }
 
 def get_map_name(map_id):
     """맵 ID를 받아 해당하는 맵 이름을 반환"""
-    return MAP_ID_TO_NAME.get(map_id, "UNKNOWN_MAP")
+    return MAPS.get(map_id, "UNKNOWN_MAP")
 
 # 아이템 ID와 이름 매핑
-ITEM_ID_TO_NAME = {
-    0x00: "NO_ITEM",
-    0x01: "MASTER_BALL",
-    0x02: "ULTRA_BALL",
-    0x03: "GREAT_BALL",
-    0x04: "POKE_BALL",
-    0x05: "TOWN_MAP",
-    0x06: "BICYCLE",
-    0x07: "SURFBOARD",
-    0x08: "SAFARI_BALL",
-    0x09: "POKEDEX",
-    0x0A: "MOON_STONE",
-    0x0B: "ANTIDOTE",
-    0x0C: "BURN_HEAL",
-    0x0D: "ICE_HEAL",
-    0x0E: "AWAKENING",
-    0x0F: "PARLYZ_HEAL",
-    0x10: "FULL_RESTORE",
-    0x11: "MAX_POTION",
-    0x12: "HYPER_POTION",
-    0x13: "SUPER_POTION",
-    0x14: "POTION",
-    0x15: "BOULDERBADGE",
-    0x16: "CASCADEBADGE",
-    0x17: "THUNDERBADGE",
-    0x18: "RAINBOWBADGE",
-    0x19: "SOULBADGE",
-    0x1A: "MARSHBADGE",
-    0x1B: "VOLCANOBADGE",
-    0x1C: "EARTHBADGE",
-    0x1D: "ESCAPE_ROPE",
-    0x1E: "REPEL",
-    0x1F: "OLD_AMBER",
-    0x20: "FIRE_STONE",
-    0x21: "THUNDER_STONE",
-    0x22: "WATER_STONE",
-    0x23: "HP_UP",
-    0x24: "PROTEIN",
-    0x25: "IRON",
-    0x26: "CARBOS",
-    0x27: "CALCIUM",
-    0x28: "RARE_CANDY",
-    0x29: "DOME_FOSSIL",
-    0x2A: "HELIX_FOSSIL",
-    0x2B: "SECRET_KEY",
-    0x2D: "BIKE_VOUCHER",
-    0x2E: "X_ACCURACY",
-    0x2F: "LEAF_STONE",
-    0x30: "CARD_KEY",
-    0x31: "NUGGET",
-    0x33: "POKE_DOLL",
-    0x34: "FULL_HEAL",
-    0x35: "REVIVE",
-    0x36: "MAX_REVIVE",
-    0x37: "GUARD_SPEC",
-    0x38: "SUPER_REPEL",
-    0x39: "MAX_REPEL",
-    0x3A: "DIRE_HIT",
-    0x3B: "COIN",
-    0x3C: "FRESH_WATER",
-    0x3D: "SODA_POP",
-    0x3E: "LEMONADE",
-    0x3F: "S_S_TICKET",
-    0x40: "GOLD_TEETH",
-    0x41: "X_ATTACK",
-    0x42: "X_DEFEND",
-    0x43: "X_SPEED",
-    0x44: "X_SPECIAL",
-    0x45: "COIN_CASE",
-    0x46: "OAKS_PARCEL",
-    0x47: "ITEMFINDER",
-    0x48: "SILPH_SCOPE",
-    0x49: "POKE_FLUTE",
-    0x4A: "LIFT_KEY",
-    0x4B: "EXP_ALL",
-    0x4C: "OLD_ROD",
-    0x4D: "GOOD_ROD",
-    0x4E: "SUPER_ROD",
-    0x4F: "PP_UP",
-    0x50: "ETHER",
-    0x51: "MAX_ETHER",
-    0x52: "ELIXIR",
-    0x53: "MAX_ELIXIR",
-    0xC4: "HM01_CUT",
-    0xC5: "HM02_FLY",
-    0xC6: "HM03_SURF",
-    0xC7: "HM04_STRENGTH",
-    0xC8: "HM05_FLASH",
-    0xC9: "TM01_MEGA_PUNCH",
-    0xCA: "TM02_RAZOR_WIND",
-    0xCB: "TM03_SWORDS_DANCE",
-    0xCC: "TM04_WHIRLWIND",
-    0xCD: "TM05_MEGA_KICK",
-    0xCE: "TM06_TOXIC",
-    0xCF: "TM07_HORN_DRILL",
-    0xD0: "TM08_BODY_SLAM",
-    0xD1: "TM09_TAKE_DOWN",
-    0xD2: "TM10_DOUBLE_EDGE",
-    0xD3: "TM11_BUBBLEBEAM",
-    0xD4: "TM12_WATER_GUN",
-    0xD5: "TM13_ICE_BEAM",
-    0xD6: "TM14_BLIZZARD",
-    0xD7: "TM15_HYPER_BEAM",
-    0xD8: "TM16_PAY_DAY",
-    0xD9: "TM17_SUBMISSION",
-    0xDA: "TM18_COUNTER",
-    0xDB: "TM19_SEISMIC_TOSS",
-    0xDC: "TM20_RAGE",
-    0xDD: "TM21_MEGA_DRAIN",
-    0xDE: "TM22_SOLARBEAM",
-    0xDF: "TM23_DRAGON_RAGE",
-    0xE0: "TM24_THUNDERBOLT",
-    0xE1: "TM25_THUNDER",
-    0xE2: "TM26_EARTHQUAKE",
-    0xE3: "TM27_FISSURE",
-    0xE4: "TM28_DIG",
-    0xE5: "TM29_PSYCHIC",
-    0xE6: "TM30_TELEPORT",
-    0xE7: "TM31_MIMIC",
-    0xE8: "TM32_DOUBLE_TEAM",
-    0xE9: "TM33_REFLECT",
-    0xEA: "TM34_BIDE",
-    0xEB: "TM35_METRONOME",
-    0xEC: "TM36_SELFDESTRUCT",
-    0xED: "TM37_EGG_BOMB",
-    0xEE: "TM38_FIRE_BLAST",
-    0xEF: "TM39_SWIFT",
-    0xF0: "TM40_SKULL_BASH",
-    0xF1: "TM41_SOFTBOILED",
-    0xF2: "TM42_DREAM_EATER",
-    0xF3: "TM43_SKY_ATTACK",
-    0xF4: "TM44_REST",
-    0xF5: "TM45_THUNDER_WAVE",
-    0xF6: "TM46_PSYWAVE",
-    0xF7: "TM47_EXPLOSION",
-    0xF8: "TM48_ROCK_SLIDE",
-    0xF9: "TM49_TRI_ATTACK",
-    0xFA: "TM50_SUBSTITUTE",
-}
+def _load_item_names():
+    return {
+        0x00: "NO_ITEM",
+        0x01: "MASTER_BALL",
+        0x02: "ULTRA_BALL",
+        0x03: "GREAT_BALL",
+        0x04: "POKE_BALL",
+        0x05: "TOWN_MAP",
+        0x06: "BICYCLE",
+        0x07: "SURFBOARD",
+        0x08: "SAFARI_BALL",
+        0x09: "POKEDEX",
+        0x0A: "MOON_STONE",
+        0x0B: "ANTIDOTE",
+        0x0C: "BURN_HEAL",
+        0x0D: "ICE_HEAL",
+        0x0E: "AWAKENING",
+        0x0F: "PARLYZ_HEAL",
+        0x10: "FULL_RESTORE",
+        0x11: "MAX_POTION",
+        0x12: "HYPER_POTION",
+        0x13: "SUPER_POTION",
+        0x14: "POTION",
+        0x15: "BOULDERBADGE",
+        0x16: "CASCADEBADGE",
+        0x17: "THUNDERBADGE",
+        0x18: "RAINBOWBADGE",
+        0x19: "SOULBADGE",
+        0x1A: "MARSHBADGE",
+        0x1B: "VOLCANOBADGE",
+        0x1C: "EARTHBADGE",
+        0x1D: "ESCAPE_ROPE",
+        0x1E: "REPEL",
+        0x1F: "OLD_AMBER",
+        0x20: "FIRE_STONE",
+        0x21: "THUNDER_STONE",
+        0x22: "WATER_STONE",
+        0x23: "HP_UP",
+        0x24: "PROTEIN",
+        0x25: "IRON",
+        0x26: "CARBOS",
+        0x27: "CALCIUM",
+        0x28: "RARE_CANDY",
+        0x29: "DOME_FOSSIL",
+        0x2A: "HELIX_FOSSIL",
+        0x2B: "SECRET_KEY",
+        0x2D: "BIKE_VOUCHER",
+        0x2E: "X_ACCURACY",
+        0x2F: "LEAF_STONE",
+        0x30: "CARD_KEY",
+        0x31: "NUGGET",
+        0x33: "POKE_DOLL",
+        0x34: "FULL_HEAL",
+        0x35: "REVIVE",
+        0x36: "MAX_REVIVE",
+        0x37: "GUARD_SPEC",
+        0x38: "SUPER_REPEL",
+        0x39: "MAX_REPEL",
+        0x3A: "DIRE_HIT",
+        0x3B: "COIN",
+        0x3C: "FRESH_WATER",
+        0x3D: "SODA_POP",
+        0x3E: "LEMONADE",
+        0x3F: "S_S_TICKET",
+        0x40: "GOLD_TEETH",
+        0x41: "X_ATTACK",
+        0x42: "X_DEFEND",
+        0x43: "X_SPEED",
+        0x44: "X_SPECIAL",
+        0x45: "COIN_CASE",
+        0x46: "OAKS_PARCEL",
+        0x47: "ITEMFINDER",
+        0x48: "SILPH_SCOPE",
+        0x49: "POKE_FLUTE",
+        0x4A: "LIFT_KEY",
+        0x4B: "EXP_ALL",
+        0x4C: "OLD_ROD",
+        0x4D: "GOOD_ROD",
+        0x4E: "SUPER_ROD",
+        0x4F: "PP_UP",
+        0x50: "ETHER",
+        0x51: "MAX_ETHER",
+        0x52: "ELIXIR",
+        0x53: "MAX_ELIXIR",
+        0xC4: "HM01_CUT",
+        0xC5: "HM02_FLY",
+        0xC6: "HM03_SURF",
+        0xC7: "HM04_STRENGTH",
+        0xC8: "HM05_FLASH",
+        0xC9: "TM01_MEGA_PUNCH",
+        0xCA: "TM02_RAZOR_WIND",
+        0xCB: "TM03_SWORDS_DANCE",
+        0xCC: "TM04_WHIRLWIND",
+        0xCD: "TM05_MEGA_KICK",
+        0xCE: "TM06_TOXIC",
+        0xCF: "TM07_HORN_DRILL",
+        0xD0: "TM08_BODY_SLAM",
+        0xD1: "TM09_TAKE_DOWN",
+        0xD2: "TM10_DOUBLE_EDGE",
+        0xD3: "TM11_BUBBLEBEAM",
+        0xD4: "TM12_WATER_GUN",
+        0xD5: "TM13_ICE_BEAM",
+        0xD6: "TM14_BLIZZARD",
+        0xD7: "TM15_HYPER_BEAM",
+        0xD8: "TM16_PAY_DAY",
+        0xD9: "TM17_SUBMISSION",
+        0xDA: "TM18_COUNTER",
+        0xDB: "TM19_SEISMIC_TOSS",
+        0xDC: "TM20_RAGE",
+        0xDD: "TM21_MEGA_DRAIN",
+        0xDE: "TM22_SOLARBEAM",
+        0xDF: "TM23_DRAGON_RAGE",
+        0xE0: "TM24_THUNDERBOLT",
+        0xE1: "TM25_THUNDER",
+        0xE2: "TM26_EARTHQUAKE",
+        0xE3: "TM27_FISSURE",
+        0xE4: "TM28_DIG",
+        0xE5: "TM29_PSYCHIC",
+        0xE6: "TM30_TELEPORT",
+        0xE7: "TM31_MIMIC",
+        0xE8: "TM32_DOUBLE_TEAM",
+        0xE9: "TM33_REFLECT",
+        0xEA: "TM34_BIDE",
+        0xEB: "TM35_METRONOME",
+        0xEC: "TM36_SELFDESTRUCT",
+        0xED: "TM37_EGG_BOMB",
+        0xEE: "TM38_FIRE_BLAST",
+        0xEF: "TM39_SWIFT",
+        0xF0: "TM40_SKULL_BASH",
+        0xF1: "TM41_SOFTBOILED",
+        0xF2: "TM42_DREAM_EATER",
+        0xF3: "TM43_SKY_ATTACK",
+        0xF4: "TM44_REST",
+        0xF5: "TM45_THUNDER_WAVE",
+        0xF6: "TM46_PSYWAVE",
+        0xF7: "TM47_EXPLOSION",
+        0xF8: "TM48_ROCK_SLIDE",
+        0xF9: "TM49_TRI_ATTACK",
+        0xFA: "TM50_SUBSTITUTE",
+    }
 
 def get_item_name(item_id):
     """아이템 ID를 받아 해당하는 아이템 이름을 반환"""
-    return ITEM_ID_TO_NAME.get(item_id, "UNKNOWN_ITEM")
+    return ITEMS.get(item_id, "UNKNOWN_ITEM")
 
 
 # 포켓몬 ID와 이름 매핑
-POKEMON_ID_TO_NAME = {
-    0x01: "RHYDON",
-    0x02: "KANGASKHAN",
-    0x03: "NIDORAN_M",
-    0x04: "CLEFAIRY",
-    0x05: "SPEAROW",
-    0x06: "VOLTORB",
-    0x07: "NIDOKING",
-    0x08: "SLOWBRO",
-    0x09: "IVYSAUR",
-    0x0A: "EXEGGUTOR",
-    0x0B: "LICKITUNG",
-    0x0C: "EXEGGCUTE",
-    0x0D: "GRIMER",
-    0x0E: "GENGAR",
-    0x0F: "NIDORAN_F",
-    0x10: "NIDOQUEEN",
-    0x11: "CUBONE",
-    0x12: "RHYHORN",
-    0x13: "LAPRAS",
-    0x14: "ARCANINE",
-    0x15: "MEW",
-    0x16: "GYARADOS",
-    0x17: "SHELLDER",
-    0x18: "TENTACOOL",
-    0x19: "GASTLY",
-    0x1A: "SCYTHER",
-    0x1B: "STARYU",
-    0x1C: "BLASTOISE",
-    0x1D: "PINSIR",
-    0x1E: "TANGELA",
-    0x21: "GROWLITHE",
-    0x22: "ONIX",
-    0x23: "FEAROW",
-    0x24: "PIDGEY",
-    0x25: "SLOWPOKE",
-    0x26: "KADABRA",
-    0x27: "GRAVELER",
-    0x28: "CHANSEY",
-    0x29: "MACHOKE",
-    0x2A: "MR_MIME",
-    0x2B: "HITMONLEE",
-    0x2C: "HITMONCHAN",
-    0x2D: "ARBOK",
-    0x2E: "PARASECT",
-    0x2F: "PSYDUCK",
-    0x30: "DROWZEE",
-    0x31: "GOLEM",
-    0x33: "MAGMAR",
-    0x35: "ELECTABUZZ",
-    0x36: "MAGNETON",
-    0x37: "KOFFING",
-    0x39: "MANKEY",
-    0x3A: "SEEL",
-    0x3B: "DIGLETT",
-    0x3C: "TAUROS",
-    0x40: "FARFETCHD",
-    0x41: "VENONAT",
-    0x42: "DRAGONITE",
-    0x46: "DODUO",
-    0x47: "POLIWAG",
-    0x48: "JYNX",
-    0x49: "MOLTRES",
-    0x4A: "ARTICUNO",
-    0x4B: "ZAPDOS",
-    0x4C: "DITTO",
-    0x4D: "MEOWTH",
-    0x4E: "KRABBY",
-    0x52: "VULPIX",
-    0x53: "NINETALES",
-    0x54: "PIKACHU",
-    0x55: "RAICHU",
-    0x58: "DRATINI",
-    0x59: "DRAGONAIR",
-    0x5A: "KABUTO",
-    0x5B: "KABUTOPS",
-    0x5C: "HORSEA",
-    0x5D: "SEADRA",
-    0x60: "SANDSHREW",
-    0x61: "SANDSLASH",
-    0x62: "OMANYTE",
-    0x63: "OMASTAR",
-    0x64: "JIGGLYPUFF",
-    0x65: "WIGGLYTUFF",
-    0x66: "EEVEE",
-    0x67: "FLAREON",
-    0x68: "JOLTEON",
-    0x69: "VAPOREON",
-    0x6A: "MACHOP",
-    0x6B: "ZUBAT",
-    0x6C: "EKANS",
-    0x6D: "PARAS",
-    0x6E: "POLIWHIRL",
-    0x6F: "POLIWRATH",
-    0x70: "WEEDLE",
-    0x71: "KAKUNA",
-    0x72: "BEEDRILL",
-    0x74: "DODRIO",
-    0x75: "PRIMEAPE",
-    0x76: "DUGTRIO",
-    0x77: "VENOMOTH",
-    0x78: "DEWGONG",
-    0x7B: "CATERPIE",
-    0x7C: "METAPOD",
-    0x7D: "BUTTERFREE",
-    0x7E: "MACHAMP",
-    0x80: "GOLDUCK",
-    0x81: "HYPNO",
-    0x82: "GOLBAT",
-    0x83: "MEWTWO",
-    0x84: "SNORLAX",
-    0x85: "MAGIKARP",
-    0x88: "MUK",
-    0x8A: "KINGLER",
-    0x8B: "CLOYSTER",
-    0x8D: "ELECTRODE",
-    0x8E: "CLEFABLE",
-    0x8F: "WEEZING",
-    0x90: "PERSIAN",
-    0x91: "MAROWAK",
-    0x93: "HAUNTER",
-    0x94: "ABRA",
-    0x95: "ALAKAZAM",
-    0x96: "PIDGEOTTO",
-    0x97: "PIDGEOT",
-    0x98: "STARMIE",
-    0x99: "BULBASAUR",
-    0x9A: "VENUSAUR",
-    0x9B: "TENTACRUEL",
-    0x9D: "GOLDEEN",
-    0x9E: "SEAKING",
-    0xA3: "PONYTA",
-    0xA4: "RAPIDASH",
-    0xA5: "RATTATA",
-    0xA6: "RATICATE",
-    0xA7: "NIDORINO",
-    0xA8: "NIDORINA",
-    0xA9: "GEODUDE",
-    0xAA: "PORYGON",
-    0xAB: "AERODACTYL",
-    0xAD: "MAGNEMITE",
-    0xB0: "CHARMANDER",
-    0xB1: "SQUIRTLE",
-    0xB2: "CHARMELEON",
-    0xB3: "WARTORTLE",
-    0xB4: "CHARIZARD",
-    0xB6: "FOSSIL_KABUTOPS",
-    0xB7: "FOSSIL_AERODACTYL",
-    0xB8: "MON_GHOST",
-    0xB9: "ODDISH",
-    0xBA: "GLOOM",
-    0xBB: "VILEPLUME",
-    0xBC: "BELLSPROUT",
-    0xBD: "WEEPINBELL",
-    0xBE: "VICTREEBEL",
+def _load_pokemon_names():
+    return {
+        0x01: "RHYDON",
+        0x02: "KANGASKHAN",
+        0x03: "NIDORAN_M",
+        0x04: "CLEFAIRY",
+        0x05: "SPEAROW",
+        0x06: "VOLTORB",
+        0x07: "NIDOKING",
+        0x08: "SLOWBRO",
+        0x09: "IVYSAUR",
+        0x0A: "EXEGGUTOR",
+        0x0B: "LICKITUNG",
+        0x0C: "EXEGGCUTE",
+        0x0D: "GRIMER",
+        0x0E: "GENGAR",
+        0x0F: "NIDORAN_F",
+        0x10: "NIDOQUEEN",
+        0x11: "CUBONE",
+        0x12: "RHYHORN",
+        0x13: "LAPRAS",
+        0x14: "ARCANINE",
+        0x15: "MEW",
+        0x16: "GYARADOS",
+        0x17: "SHELLDER",
+        0x18: "TENTACOOL",
+        0x19: "GASTLY",
+        0x1A: "SCYTHER",
+        0x1B: "STARYU",
+        0x1C: "BLASTOISE",
+        0x1D: "PINSIR",
+        0x1E: "TANGELA",
+        0x21: "GROWLITHE",
+        0x22: "ONIX",
+        0x23: "FEAROW",
+        0x24: "PIDGEY",
+        0x25: "SLOWPOKE",
+        0x26: "KADABRA",
+        0x27: "GRAVELER",
+        0x28: "CHANSEY",
+        0x29: "MACHOKE",
+        0x2A: "MR_MIME",
+        0x2B: "HITMONLEE",
+        0x2C: "HITMONCHAN",
+        0x2D: "ARBOK",
+        0x2E: "PARASECT",
+        0x2F: "PSYDUCK",
+        0x30: "DROWZEE",
+        0x31: "GOLEM",
+        0x33: "MAGMAR",
+        0x35: "ELECTABUZZ",
+        0x36: "MAGNETON",
+        0x37: "KOFFING",
+        0x39: "MANKEY",
+        0x3A: "SEEL",
+        0x3B: "DIGLETT",
+        0x3C: "TAUROS",
+        0x40: "FARFETCHD",
+        0x41: "VENONAT",
+        0x42: "DRAGONITE",
+        0x46: "DODUO",
+        0x47: "POLIWAG",
+        0x48: "JYNX",
+        0x49: "MOLTRES",
+        0x4A: "ARTICUNO",
+        0x4B: "ZAPDOS",
+        0x4C: "DITTO",
+        0x4D: "MEOWTH",
+        0x4E: "KRABBY",
+        0x52: "VULPIX",
+        0x53: "NINETALES",
+        0x54: "PIKACHU",
+        0x55: "RAICHU",
+        0x58: "DRATINI",
+        0x59: "DRAGONAIR",
+        0x5A: "KABUTO",
+        0x5B: "KABUTOPS",
+        0x5C: "HORSEA",
+        0x5D: "SEADRA",
+        0x60: "SANDSHREW",
+        0x61: "SANDSLASH",
+        0x62: "OMANYTE",
+        0x63: "OMASTAR",
+        0x64: "JIGGLYPUFF",
+        0x65: "WIGGLYTUFF",
+        0x66: "EEVEE",
+        0x67: "FLAREON",
+        0x68: "JOLTEON",
+        0x69: "VAPOREON",
+        0x6A: "MACHOP",
+        0x6B: "ZUBAT",
+        0x6C: "EKANS",
+        0x6D: "PARAS",
+        0x6E: "POLIWHIRL",
+        0x6F: "POLIWRATH",
+        0x70: "WEEDLE",
+        0x71: "KAKUNA",
+        0x72: "BEEDRILL",
+        0x74: "DODRIO",
+        0x75: "PRIMEAPE",
+        0x76: "DUGTRIO",
+        0x77: "VENOMOTH",
+        0x78: "DEWGONG",
+        0x7B: "CATERPIE",
+        0x7C: "METAPOD",
+        0x7D: "BUTTERFREE",
+        0x7E: "MACHAMP",
+        0x80: "GOLDUCK",
+        0x81: "HYPNO",
+        0x82: "GOLBAT",
+        0x83: "MEWTWO",
+        0x84: "SNORLAX",
+        0x85: "MAGIKARP",
+        0x88: "MUK",
+        0x8A: "KINGLER",
+        0x8B: "CLOYSTER",
+        0x8D: "ELECTRODE",
+        0x8E: "CLEFABLE",
+        0x8F: "WEEZING",
+        0x90: "PERSIAN",
+        0x91: "MAROWAK",
+        0x93: "HAUNTER",
+        0x94: "ABRA",
+        0x95: "ALAKAZAM",
+        0x96: "PIDGEOTTO",
+        0x97: "PIDGEOT",
+        0x98: "STARMIE",
+        0x99: "BULBASAUR",
+        0x9A: "VENUSAUR",
+        0x9B: "TENTACRUEL",
+        0x9D: "GOLDEEN",
+        0x9E: "SEAKING",
+        0xA3: "PONYTA",
+        0xA4: "RAPIDASH",
+        0xA5: "RATTATA",
+        0xA6: "RATICATE",
+        0xA7: "NIDORINO",
+        0xA8: "NIDORINA",
+        0xA9: "GEODUDE",
+        0xAA: "PORYGON",
+        0xAB: "AERODACTYL",
+        0xAD: "MAGNEMITE",
+        0xB0: "CHARMANDER",
+        0xB1: "SQUIRTLE",
+        0xB2: "CHARMELEON",
+        0xB3: "WARTORTLE",
+        0xB4: "CHARIZARD",
+        0xB6: "FOSSIL_KABUTOPS",
+        0xB7: "FOSSIL_AERODACTYL",
+        0xB8: "MON_GHOST",
+        0xB9: "ODDISH",
+        0xBA: "GLOOM",
+        0xBB: "VILEPLUME",
+        0xBC: "BELLSPROUT",
+        0xBD: "WEEPINBELL",
+        0xBE: "VICTREEBEL",
+    }
+
+
+# 기술 ID와 이름 매핑 (pokered constants/move_constants.asm 순서)
+def _load_move_names():
+    return {
+        0x01: "POUND",
+        0x02: "KARATE_CHOP",
+        0x03: "DOUBLESLAP",
+        0x04: "COMET_PUNCH",
+        0x05: "MEGA_PUNCH",
+        0x06: "PAY_DAY",
+        0x07: "FIRE_PUNCH",
+        0x08: "ICE_PUNCH",
+        0x09: "THUNDERPUNCH",
+        0x0A: "SCRATCH",
+        0x0B: "VICEGRIP",
+        0x0C: "GUILLOTINE",
+        0x0D: "RAZOR_WIND",
+        0x0E: "SWORDS_DANCE",
+        0x0F: "CUT",
+        0x10: "GUST",
+        0x11: "WING_ATTACK",
+        0x12: "WHIRLWIND",
+        0x13: "FLY",
+        0x14: "BIND",
+        0x15: "SLAM",
+        0x16: "VINE_WHIP",
+        0x17: "STOMP",
+        0x18: "DOUBLE_KICK",
+        0x19: "MEGA_KICK",
+        0x1A: "JUMP_KICK",
+        0x1B: "ROLLING_KICK",
+        0x1C: "SAND_ATTACK",
+        0x1D: "HEADBUTT",
+        0x1E: "HORN_ATTACK",
+        0x1F: "FURY_ATTACK",
+        0x20: "HORN_DRILL",
+        0x21: "TACKLE",
+        0x22: "BODY_SLAM",
+        0x23: "WRAP",
+        0x24: "TAKE_DOWN",
+        0x25: "THRASH",
+        0x26: "DOUBLE_EDGE",
+        0x27: "TAIL_WHIP",
+        0x28: "POISON_STING",
+        0x29: "TWINEEDLE",
+        0x2A: "PIN_MISSILE",
+        0x2B: "LEER",
+        0x2C: "BITE",
+        0x2D: "GROWL",
+        0x2E: "ROAR",
+        0x2F: "SING",
+        0x30: "SUPERSONIC",
+        0x31: "SONICBOOM",
+        0x32: "DISABLE",
+        0x33: "ACID",
+        0x34: "EMBER",
+        0x35: "FLAMETHROWER",
+        0x36: "MIST",
+        0x37: "WATER_GUN",
+        0x38: "HYDRO_PUMP",
+        0x39: "SURF",
+        0x3A: "ICE_BEAM",
+        0x3B: "BLIZZARD",
+        0x3C: "PSYBEAM",
+        0x3D: "BUBBLEBEAM",
+        0x3E: "AURORA_BEAM",
+        0x3F: "HYPER_BEAM",
+        0x40: "PECK",
+        0x41: "DRILL_PECK",
+        0x42: "SUBMISSION",
+        0x43: "LOW_KICK",
+        0x44: "COUNTER",
+        0x45: "SEISMIC_TOSS",
+        0x46: "STRENGTH",
+        0x47: "ABSORB",
+        0x48: "MEGA_DRAIN",
+        0x49: "LEECH_SEED",
+        0x4A: "GROWTH",
+        0x4B: "RAZOR_LEAF",
+        0x4C: "SOLARBEAM",
+        0x4D: "POISONPOWDER",
+        0x4E: "STUN_SPORE",
+        0x4F: "SLEEP_POWDER",
+        0x50: "PETAL_DANCE",
+        0x51: "STRING_SHOT",
+        0x52: "DRAGON_RAGE",
+        0x53: "FIRE_SPIN",
+        0x54: "THUNDERSHOCK",
+        0x55: "THUNDERBOLT",
+        0x56: "THUNDER_WAVE",
+        0x57: "THUNDER",
+        0x58: "ROCK_THROW",
+        0x59: "EARTHQUAKE",
+        0x5A: "FISSURE",
+        0x5B: "DIG",
+        0x5C: "TOXIC",
+        0x5D: "CONFUSION",
+        0x5E: "PSYCHIC_M",
+        0x5F: "HYPNOSIS",
+        0x60: "MEDITATE",
+        0x61: "AGILITY",
+        0x62: "QUICK_ATTACK",
+        0x63: "RAGE",
+        0x64: "TELEPORT",
+        0x65: "NIGHT_SHADE",
+        0x66: "MIMIC",
+        0x67: "SCREECH",
+        0x68: "DOUBLE_TEAM",
+        0x69: "RECOVER",
+        0x6A: "HARDEN",
+        0x6B: "MINIMIZE",
+        0x6C: "SMOKESCREEN",
+        0x6D: "CONFUSE_RAY",
+        0x6E: "WITHDRAW",
+        0x6F: "DEFENSE_CURL",
+        0x70: "BARRIER",
+        0x71: "LIGHT_SCREEN",
+        0x72: "HAZE",
+        0x73: "REFLECT",
+        0x74: "FOCUS_ENERGY",
+        0x75: "BIDE",
+        0x76: "METRONOME",
+        0x77: "MIRROR_MOVE",
+        0x78: "SELFDESTRUCT",
+        0x79: "EGG_BOMB",
+        0x7A: "LICK",
+        0x7B: "SMOG",
+        0x7C: "SLUDGE",
+        0x7D: "BONE_CLUB",
+        0x7E: "FIRE_BLAST",
+        0x7F: "WATERFALL",
+        0x80: "CLAMP",
+        0x81: "SWIFT",
+        0x82: "SKULL_BASH",
+        0x83: "SPIKE_CANNON",
+        0x84: "CONSTRICT",
+        0x85: "AMNESIA",
+        0x86: "KINESIS",
+        0x87: "SOFTBOILED",
+        0x88: "HI_JUMP_KICK",
+        0x89: "GLARE",
+        0x8A: "DREAM_EATER",
+        0x8B: "POISON_GAS",
+        0x8C: "BARRAGE",
+        0x8D: "LEECH_LIFE",
+        0x8E: "LOVELY_KISS",
+        0x8F: "SKY_ATTACK",
+        0x90: "TRANSFORM",
+        0x91: "BUBBLE",
+        0x92: "DIZZY_PUNCH",
+        0x93: "SPORE",
+        0x94: "FLASH",
+        0x95: "PSYWAVE",
+        0x96: "SPLASH",
+        0x97: "ACID_ARMOR",
+        0x98: "CRABHAMMER",
+        0x99: "EXPLOSION",
+        0x9A: "FURY_SWIPES",
+        0x9B: "BONEMERANG",
+        0x9C: "REST",
+        0x9D: "ROCK_SLIDE",
+        0x9E: "HYPER_FANG",
+        0x9F: "SHARPEN",
+        0xA0: "CONVERSION",
+        0xA1: "TRI_ATTACK",
+        0xA2: "SUPER_FANG",
+        0xA3: "SLASH",
+        0xA4: "SUBSTITUTE",
+        0xA5: "STRUGGLE",
+    }
+
+
+# 타입 ID와 이름 매핑 (pokered constants/type_constants.asm)
+def _load_type_names():
+    return {
+        0x00: "NORMAL",
+        0x01: "FIGHTING",
+        0x02: "FLYING",
+        0x03: "POISON",
+        0x04: "GROUND",
+        0x05: "ROCK",
+        0x07: "BUG",
+        0x08: "GHOST",
+        0x14: "FIRE",
+        0x15: "WATER",
+        0x16: "GRASS",
+        0x17: "ELECTRIC",
+        0x18: "PSYCHIC",
+        0x19: "ICE",
+        0x1A: "DRAGON",
+    }
+
+
+# 스프라이트(그림) ID와 이름 매핑 (pokered constants/sprite_constants.asm)
+def _load_sprite_names():
+    return {
+        0x01: "RED",
+        0x02: "BLUE",
+        0x03: "OAK",
+        0x04: "YOUNGSTER",
+        0x05: "MONSTER",
+        0x06: "COOLTRAINER_F",
+        0x07: "COOLTRAINER_M",
+        0x08: "LITTLE_GIRL",
+        0x09: "BIRD",
+        0x0A: "MIDDLE_AGED_MAN",
+        0x0B: "GAMBLER",
+        0x0C: "SUPER_NERD",
+        0x0D: "GIRL",
+        0x0E: "HIKER",
+        0x0F: "BEAUTY",
+        0x10: "GENTLEMAN",
+        0x11: "DAISY",
+        0x12: "BIKER",
+        0x13: "SAILOR",
+        0x14: "COOK",
+        0x15: "BIKE_SHOP_CLERK",
+        0x16: "MR_FUJI",
+        0x17: "GIOVANNI",
+        0x18: "ROCKET",
+        0x19: "CHANNELER",
+        0x1A: "WAITER",
+        0x1B: "SILPH_WORKER_F",
+        0x1C: "MIDDLE_AGED_WOMAN",
+        0x1D: "BRUNETTE_GIRL",
+        0x1E: "LANCE",
+        0x1F: "UNUSED_RED_1",
+        0x20: "SCIENTIST",
+        0x21: "ROCKER",
+        0x22: "SWIMMER",
+        0x23: "SAFARI_ZONE_WORKER",
+        0x24: "GYM_GUIDE",
+        0x25: "GRAMPS",
+        0x26: "CLERK",
+        0x27: "FISHING_GURU",
+        0x28: "GRANNY",
+        0x29: "NURSE",
+        0x2A: "LINK_RECEPTIONIST",
+        0x2B: "SILPH_PRESIDENT",
+        0x2C: "SILPH_WORKER_M",
+        0x2D: "WARDEN",
+        0x2E: "CAPTAIN",
+        0x2F: "FISHER",
+        0x30: "KOGA",
+        0x31: "GUARD",
+        0x32: "UNUSED_GUARD",
+        0x33: "MOM",
+        0x34: "BALDING_GUY",
+        0x35: "LITTLE_BOY",
+        0x36: "UNUSED_GAMEBOY_KID",
+        0x37: "GAMEBOY_KID",
+        0x38: "FAIRY",
+        0x39: "AGATHA",
+        0x3A: "BRUNO",
+        0x3B: "LORELEI",
+        0x3C: "SEEL",
+        0x3D: "POKE_BALL",
+        0x3E: "FOSSIL",
+        0x3F: "BOULDER",
+        0x40: "PAPER",
+        0x41: "POKEDEX",
+        0x42: "CLIPBOARD",
+        0x43: "SNORLAX",
+        0x44: "UNUSED_OLD_AMBER",
+        0x45: "OLD_AMBER",
+        0x46: "UNUSED_GAMBLER_ASLEEP_1",
+        0x47: "UNUSED_GAMBLER_ASLEEP_2",
+        0x48: "GAMBLER_ASLEEP",
+    }
+
+
+# 타일셋 ID와 이름 매핑 (pokered constants/tileset_constants.asm)
+def _load_tileset_names():
+    return {
+        0x00: "OVERWORLD",
+        0x01: "REDS_HOUSE_1",
+        0x02: "MART",
+        0x03: "FOREST",
+        0x04: "REDS_HOUSE_2",
+        0x05: "DOJO",
+        0x06: "POKECENTER",
+        0x07: "GYM",
+        0x08: "HOUSE",
+        0x09: "FOREST_GATE",
+        0x0A: "MUSEUM",
+        0x0B: "UNDERGROUND",
+        0x0C: "GATE",
+        0x0D: "SHIP",
+        0x0E: "SHIP_PORT",
+        0x0F: "CEMETERY",
+        0x10: "INTERIOR",
+        0x11: "CAVERN",
+        0x12: "LOBBY",
+        0x13: "MANSION",
+        0x14: "LAB",
+        0x15: "CLUB",
+        0x16: "FACILITY",
+        0x17: "PLATEAU",
+    }
+
+
+SUPER_EFFECTIVE = 2.0
+NOT_VERY_EFFECTIVE = 0.5
+NO_EFFECT = 0.0
+
+# 1세대 타입 상성표 (pokered data/types/type_matchups.asm). 표에 없는 조합은 1배
+# (공격 타입, 방어 타입) -> 배율
+TYPE_CHART = {
+    ("WATER", "FIRE"): SUPER_EFFECTIVE,
+    ("FIRE", "GRASS"): SUPER_EFFECTIVE,
+    ("FIRE", "ICE"): SUPER_EFFECTIVE,
+    ("GRASS", "WATER"): SUPER_EFFECTIVE,
+    ("ELECTRIC", "WATER"): SUPER_EFFECTIVE,
+    ("WATER", "ROCK"): SUPER_EFFECTIVE,
+    ("GROUND", "FLYING"): NO_EFFECT,
+    ("WATER", "WATER"): NOT_VERY_EFFECTIVE,
+    ("FIRE", "FIRE"): NOT_VERY_EFFECTIVE,
+    ("ELECTRIC", "ELECTRIC"): NOT_VERY_EFFECTIVE,
+    ("ICE", "ICE"): NOT_VERY_EFFECTIVE,
+    ("GRASS", "GRASS"): NOT_VERY_EFFECTIVE,
+    ("PSYCHIC", "PSYCHIC"): NOT_VERY_EFFECTIVE,
+    ("FIRE", "WATER"): NOT_VERY_EFFECTIVE,
+    ("GRASS", "FIRE"): NOT_VERY_EFFECTIVE,
+    ("WATER", "GRASS"): NOT_VERY_EFFECTIVE,
+    ("ELECTRIC", "GRASS"): NOT_VERY_EFFECTIVE,
+    ("NORMAL", "ROCK"): NOT_VERY_EFFECTIVE,
+    ("NORMAL", "GHOST"): NO_EFFECT,
+    ("GHOST", "GHOST"): SUPER_EFFECTIVE,
+    ("FIRE", "BUG"): SUPER_EFFECTIVE,
+    ("FIRE", "ROCK"): NOT_VERY_EFFECTIVE,
+    ("WATER", "GROUND"): SUPER_EFFECTIVE,
+    ("ELECTRIC", "GROUND"): NO_EFFECT,
+    ("ELECTRIC", "FLYING"): SUPER_EFFECTIVE,
+    ("GRASS", "GROUND"): SUPER_EFFECTIVE,
+    ("GRASS", "BUG"): NOT_VERY_EFFECTIVE,
+    ("GRASS", "POISON"): NOT_VERY_EFFECTIVE,
+    ("GRASS", "ROCK"): SUPER_EFFECTIVE,
+    ("GRASS", "FLYING"): NOT_VERY_EFFECTIVE,
+    ("ICE", "WATER"): NOT_VERY_EFFECTIVE,
+    ("ICE", "GRASS"): SUPER_EFFECTIVE,
+    ("ICE", "GROUND"): SUPER_EFFECTIVE,
+    ("ICE", "FLYING"): SUPER_EFFECTIVE,
+    ("FIGHTING", "NORMAL"): SUPER_EFFECTIVE,
+    ("FIGHTING", "POISON"): NOT_VERY_EFFECTIVE,
+    ("FIGHTING", "FLYING"): NOT_VERY_EFFECTIVE,
+    ("FIGHTING", "PSYCHIC"): NOT_VERY_EFFECTIVE,
+    ("FIGHTING", "BUG"): NOT_VERY_EFFECTIVE,
+    ("FIGHTING", "ROCK"): SUPER_EFFECTIVE,
+    ("FIGHTING", "ICE"): SUPER_EFFECTIVE,
+    ("FIGHTING", "GHOST"): NO_EFFECT,
+    ("POISON", "GRASS"): SUPER_EFFECTIVE,
+    ("POISON", "POISON"): NOT_VERY_EFFECTIVE,
+    ("POISON", "GROUND"): NOT_VERY_EFFECTIVE,
+    ("POISON", "BUG"): SUPER_EFFECTIVE,
+    ("POISON", "ROCK"): NOT_VERY_EFFECTIVE,
+    ("POISON", "GHOST"): NOT_VERY_EFFECTIVE,
+    ("GROUND", "FIRE"): SUPER_EFFECTIVE,
+    ("GROUND", "ELECTRIC"): SUPER_EFFECTIVE,
+    ("GROUND", "GRASS"): NOT_VERY_EFFECTIVE,
+    ("GROUND", "BUG"): NOT_VERY_EFFECTIVE,
+    ("GROUND", "ROCK"): SUPER_EFFECTIVE,
+    ("GROUND", "POISON"): SUPER_EFFECTIVE,
+    ("FLYING", "ELECTRIC"): NOT_VERY_EFFECTIVE,
+    ("FLYING", "FIGHTING"): SUPER_EFFECTIVE,
+    ("FLYING", "BUG"): SUPER_EFFECTIVE,
+    ("FLYING", "GRASS"): SUPER_EFFECTIVE,
+    ("FLYING", "ROCK"): NOT_VERY_EFFECTIVE,
+    ("PSYCHIC", "FIGHTING"): SUPER_EFFECTIVE,
+    ("PSYCHIC", "POISON"): SUPER_EFFECTIVE,
+    ("BUG", "FIRE"): NOT_VERY_EFFECTIVE,
+    ("BUG", "GRASS"): SUPER_EFFECTIVE,
+    ("BUG", "FIGHTING"): NOT_VERY_EFFECTIVE,
+    ("BUG", "FLYING"): NOT_VERY_EFFECTIVE,
+    ("BUG", "PSYCHIC"): SUPER_EFFECTIVE,
+    ("BUG", "GHOST"): NOT_VERY_EFFECTIVE,
+    ("BUG", "POISON"): SUPER_EFFECTIVE,
+    ("ROCK", "FIRE"): SUPER_EFFECTIVE,
+    ("ROCK", "FIGHTING"): NOT_VERY_EFFECTIVE,
+    ("ROCK", "GROUND"): NOT_VERY_EFFECTIVE,
+    ("ROCK", "FLYING"): SUPER_EFFECTIVE,
+    ("ROCK", "BUG"): SUPER_EFFECTIVE,
+    ("ROCK", "ICE"): SUPER_EFFECTIVE,
+    ("GHOST", "NORMAL"): NO_EFFECT,
+    ("GHOST", "PSYCHIC"): NO_EFFECT,
+    ("FIRE", "DRAGON"): NOT_VERY_EFFECTIVE,
+    ("WATER", "DRAGON"): NOT_VERY_EFFECTIVE,
+    ("ELECTRIC", "DRAGON"): NOT_VERY_EFFECTIVE,
+    ("GRASS", "DRAGON"): NOT_VERY_EFFECTIVE,
+    ("ICE", "DRAGON"): SUPER_EFFECTIVE,
+    ("DRAGON", "DRAGON"): SUPER_EFFECTIVE,
+}
+
+
+def type_effectiveness(move_type, defender_types):
+    """ 공격 타입이 방어 타입들(단일 타입이면 같은 값이 두 번 들어옴)에 주는 배율 """
+    multiplier = 1.0
+    for defender in set(defender_types):
+        multiplier *= TYPE_CHART.get((move_type, defender), 1.0)
+    return multiplier
+
+
+MAPS = LookupTable(_load_map_names, "UNKNOWN_MAP")
+ITEMS = LookupTable(_load_item_names, "UNKNOWN_ITEM")
+POKEMON = LookupTable(_load_pokemon_names, "UNKNOWN_POKEMON")
+MOVES = LookupTable(_load_move_names, "UNKNOWN_MOVE")
+TYPES = LookupTable(_load_type_names, "UNKNOWN_TYPE")
+SPRITES = LookupTable(_load_sprite_names, "UNKNOWN_SPRITE")
+TILESETS = LookupTable(_load_tileset_names, "UNKNOWN_TILESET")
+
+_LEGACY_TABLES = {
+    "MAP_ID_TO_NAME": MAPS,
+    "ITEM_ID_TO_NAME": ITEMS,
+    "POKEMON_ID_TO_NAME": POKEMON,
 }
 
 
-CHARMAP = {
-    0x4F: "\n", 
-    0x49: "<PAGE>", 
-    0x4A: "PKMN", 
-    0x00: "<NULL>", 
-    0x4C: "<SCROLL>", 
-    0x4E: "<NEXT>", 
-    0x51: "<PARA>", 
-    0x4B: "<_CONT>", 
-    0x52: "<PLAYER>", 
-    0x55: " ", # CONT, 
-    0x58: "<PROMPT>", 
-    0x57: "<DONE>", 
-    0x77: "-", 0x76: "_", 
-    # 0x79: "┌", 0x7A: "─",0x7B: "┐", 0x7C: "│",    0x7D: "└",   0x7E: "┘",  0x7F: " ",
-        0x79: "", 0x7A: "",0x7B: "", 0x7C: "",    0x7D: "",   0x7E: "",  0x7F: " ",
-    0x80: "A", 0x81: "B", 0x82: "C", 0x83: "D", 0x84: "E", 0x85: "F", 0x86: "G",
-    0x87: "H", 0x88: "I", 0x89: "J", 0x8A: "K", 0x8B: "L", 0x8C: "M", 0x8D: "N",
-    0x8E: "O", 0x8F: "P", 0x90: "Q", 0x91: "R", 0x92: "S", 0x93: "T", 0x94: "U",
-    0x95: "V", 0x96: "W", 0x97: "X", 0x98: "Y", 0x99: "Z",
-
-    0x9A: "(", 0x9B: ")", 0x9C: ":", 0x9D: ";", 0x9E: "[", 0x9F: "]",
-
-    0xA0: "a", 0xA1: "b", 0xA2: "c", 0xA3: "d", 0xA4: "e", 0xA5: "f", 0xA6: "g",
-    0xA7: "h", 0xA8: "i", 0xA9: "j", 0xAA: "k", 0xAB: "l", 0xAC: "m", 0xAD: "n",
-    0xAE: "o", 0xAF: "p", 0xB0: "q", 0xB1: "r", 0xB2: "s", 0xB3: "t", 0xB4: "u",
-    0xB5: "v", 0xB6: "w", 0xB7: "x", 0xB8: "y", 0xB9: "z",
-
-    0xBA: "é", 0xBB: "'d", 0xBC: "'l", 0xBD: "'s", 0xBE: "'t", 0xBF: "'v",
-
-    0xE0: "'", 0xE1: "<PK>", 0xE2: "<MN>", 0xE3: "-",
-    0xE4: "'r", 0xE5: "'m", 0xE6: "?", 0xE7: "!", 0xE8: ".",
-
-    0xE9: "ァ", 0xEA: "ゥ", 0xEB: "ェ",
-    0xEC: "▷", 0xED: "▶", 0xEE: "▼", 0xEF: "♂", 0xF0: "ED", 0xF1: "×",
-    0xF2: "<DOT>", 0xF3: "/", 0xF4: ",", 0xF5: "♀",
-
-    0xF6: "0", 0xF7: "1", 0xF8: "2", 0xF9: "3", 0xFA: "4",
-    0xFB: "5", 0xFC: "6", 0xFD: "7", 0xFE: "8", 0xFF: "9"
-}
\ No newline at end of file
+def __getattr__(name):
+    """ 기존 dict 이름과 CHARMAP은 처음 접근할 때 로드 """
+    if name in _LEGACY_TABLES:
+        value = _LEGACY_TABLES[name].known
+    elif name == "CHARMAP":
+        from text_codec import CHARMAP as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
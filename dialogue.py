@@ -0,0 +1,97 @@
+"""
+대화 자동 진행
+
+대화창이 ▼(계속)로 끝나면 할 수 있는 일은 A를 누르는 것뿐이므로 LLM을 호출하지 않고 로컬에서 넘깁니다.
+선택지(▶)가 나오거나 대화창이 닫히면 멈추고, 그동안 읽은 대화를 한 덩어리로 다음 프롬프트에 넘깁니다.
+"""
+import asyncio
+
+from metrics import REGISTRY
+from text_codec import decode_tiles
+
+SCREEN_WIDTH = 20
+TEXT_BOX_TOP = 12          # wTileMap에서 대화창이 시작하는 행
+TEXT_LINE_ROWS = (14, 16)  # 대화창의 두 텍스트 줄
+CURSOR_TILE = 0xED         # ▶ 선택지 커서
+CONTINUE_TILE = 0xEE       # ▼ 계속
+BOX_CORNER_TILE = 0x79     # ┌ 대화창 왼쪽 위 테두리
+WINDOW_CLOSED = 0x90       # hWY가 이 값이면 윈도우(대화창)가 화면 밖
+
+# 대화 상태
+DIALOGUE_NONE = "none"
+DIALOGUE_CONTINUE = "continue"
+DIALOGUE_CHOICE = "choice"
+
+BUTTON_SETTLE_SECONDS = 0.1
+POLL_SECONDS = 1 / 30
+MAX_IDLE_POLLS = 60        # 약 2초 동안 ▼가 다시 나오지 않으면 대화가 끝난 것으로 봄 (▼는 깜빡임)
+MAX_PRESSES = 40
+
+DIALOGUE_PRESSES = REGISTRY.counter("dialogue_auto_presses_total", "A presses sent by the dialogue auto-advance")
+DIALOGUE_RUNS = REGISTRY.counter("dialogue_auto_runs_total", "Dialogues fast-forwarded without an LLM call")
+
+
+def read_text_box(memory_reader):
+    """ wTileMap의 대화창 영역 바이트 """
+    screen = memory_reader.read_memory_bytes("wTileMap", SCREEN_WIDTH * 18)
+    return bytes(screen[TEXT_BOX_TOP * SCREEN_WIDTH:])
+
+
+def dialogue_state(memory_reader, box=None):
+    """ 대화창 영역과 윈도우 텍스트에서 ▶(선택지) / ▼(계속)를 찾음 """
+    box = read_text_box(memory_reader) if box is None else box
+    window_text = memory_reader.read_window_text() if memory_reader.read_memory("hWY") != WINDOW_CLOSED else ""
+    if CURSOR_TILE in box or "▶" in window_text:
+        return DIALOGUE_CHOICE
+    if CONTINUE_TILE in box or "▼" in window_text:
+        return DIALOGUE_CONTINUE
+    return DIALOGUE_NONE
+
+
+def read_text_lines(box):
+    lines = []
+    for row in TEXT_LINE_ROWS:
+        start = (row - TEXT_BOX_TOP) * SCREEN_WIDTH
+        line = decode_tiles(box[start:start + SCREEN_WIDTH]).replace("▼", "").strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+async def advance_dialogue(memory_reader, command_queue, max_presses=MAX_PRESSES):
+    """
+    ▼가 보이는 동안 A를 누르며 대화를 넘깁니다. 화면이 스크롤되며 같은 줄이 다시 보이므로
+    최근 두 줄과 같은 줄은 건너뜁니다.
+
+    Returns:
+        (list, str): (읽은 대화 줄, 멈춘 이유: "choice", "closed", "max_presses")
+    """
+    transcript = []
+    presses = 0
+    idle = 0
+    while presses < max_presses:
+        box = read_text_box(memory_reader)
+        state = dialogue_state(memory_reader, box)
+        if state != DIALOGUE_NONE:
+            # 한 페이지가 다 출력된 뒤(▼ 또는 ▶)에만 읽어 출력 중인 글자가 섞이지 않게 함
+            for line in read_text_lines(box):
+                if line not in transcript[-2:]:
+                    transcript.append(line)
+        if state == DIALOGUE_CHOICE:
+            return transcript, "choice"
+        if state == DIALOGUE_NONE:
+            if box[0] != BOX_CORNER_TILE:
+                return transcript, "closed"
+            # 대화창은 남아 있음: 글자가 출력 중이거나 ▼가 깜빡여 꺼진 순간일 수 있으므로 잠시 기다림
+            idle += 1
+            if idle >= MAX_IDLE_POLLS:
+                return transcript, "closed"
+            await asyncio.sleep(POLL_SECONDS)
+            continue
+        idle = 0
+        await command_queue.put("a")
+        await command_queue.join()
+        await asyncio.sleep(BUTTON_SETTLE_SECONDS)
+        presses += 1
+        DIALOGUE_PRESSES.inc()
+    return transcript, "max_presses"
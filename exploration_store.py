@@ -0,0 +1,226 @@
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from consts import MAPS
+from logs import get_logger
+
+log = get_logger("store")
+
+BATCH_SIZE = 256        # 한 트랜잭션에 모아 쓸 최대 쓰기 수
+FLUSH_INTERVAL = 1.0    # 쓰기가 적어도 이 주기(초)로는 커밋
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS maps (
+    map_id INTEGER PRIMARY KEY,
+    name TEXT,
+    first_visit REAL,
+    last_visit REAL,
+    visits INTEGER DEFAULT 0  -- 다른 맵에서 이 맵으로 들어온 횟수 (스텝 수가 아님)
+);
+CREATE TABLE IF NOT EXISTS visited (
+    map_id INTEGER,
+    x INTEGER,
+    y INTEGER,
+    first_step INTEGER,
+    count INTEGER DEFAULT 1,
+    PRIMARY KEY (map_id, x, y)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS warps (
+    map_id INTEGER,
+    x INTEGER,
+    y INTEGER,
+    dest_map TEXT,
+    first_step INTEGER,
+    PRIMARY KEY (map_id, x, y)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS npcs (
+    map_id INTEGER,
+    x INTEGER,
+    y INTEGER,
+    step INTEGER,
+    timestamp REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS npcs_by_map ON npcs (map_id, x, y);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    map_id INTEGER,
+    step INTEGER,
+    timestamp REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS notes_by_map ON notes (map_id, step);
+"""
+
+
+class ExplorationStore:
+    """
+    방문한 맵/좌표, 발견한 워프, 대화한 NPC, 메모를 SQLite에 저장합니다.
+
+    - 쓰기는 큐에 넣기만 하고 백그라운드 스레드가 모아서 커밋합니다 (write-behind).
+    - 프롬프트에 쓰는 메모는 메모리에도 유지하므로 읽기는 DB를 거치지 않습니다.
+    - 시작 시 기존 메모와 마지막 스텝 번호를 불러와 재시작 후 바로 이어서 진행합니다.
+    """
+    def __init__(self, path):
+        self.path = path
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        # 재시작 시 복원할 메모리 상태
+        self.notes = []                       # 전체 메모 ("Step N: ..." 형식)
+        self.map_notes = defaultdict(list)    # 맵 이름 -> 메모 리스트
+        for map_id, step, text in conn.execute("SELECT map_id, step, text FROM notes ORDER BY id"):
+            if map_id is None:
+                self.notes.append(f"Step {step}: {text}")
+            else:
+                self.map_notes[MAPS.names[map_id]].append(f"Step {step}: {text}")
+        self.visited = {(m, x, y) for m, x, y in conn.execute("SELECT map_id, x, y FROM visited")}
+        self.known_warps = {(m, x, y) for m, x, y in conn.execute("SELECT map_id, x, y FROM warps")}
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_step'").fetchone()
+        self.last_step = int(row[0]) if row else -1
+        conn.close()
+        self.current_map_id = None  # 직전 visit()의 맵 (맵이 바뀔 때만 maps.visits 증가)
+
+        self.queue = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self._write_loop, name="exploration-store", daemon=True)
+        self.writer.start()
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path)
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            writes = []
+            waiters = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    writes.append(item)
+            try:
+                self._commit(conn, writes)
+            except Exception:
+                log.exception("Failed to write %d exploration records", len(writes))
+            finally:
+                # 쓰기가 실패해도 flush()가 영원히 기다리지 않도록 항상 깨움
+                for waiter in waiters:
+                    waiter.set()
+        conn.close()
+
+    def _commit(self, conn, writes):
+        """ 한 트랜잭션으로 커밋. 실패하면 하나씩 다시 써서 잘못된 쓰기 하나 때문에 배치 전체를 잃지 않게 함 """
+        try:
+            with conn:
+                for write in writes:
+                    conn.execute(*write)
+        except sqlite3.Error:
+            if len(writes) == 1:
+                raise
+            for write in writes:
+                try:
+                    with conn:
+                        conn.execute(*write)
+                except sqlite3.Error as e:
+                    log.error("Dropped exploration write %r: %s", write[0], e)
+
+    def _write(self, sql, params):
+        self.queue.put((sql, params))
+
+    def set_step(self, step):
+        self.last_step = step
+        self._write("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_step', ?)", (str(step),))
+
+    def visit(self, map_name, x, y, step):
+        """ 플레이어 좌표 방문 기록 (새 좌표면 True) """
+        map_id = MAPS.id(map_name)
+        now = time.time()
+        key = (map_id, x, y)
+        is_new = key not in self.visited
+        if is_new:
+            self.visited.add(key)
+            self._write("INSERT OR IGNORE INTO visited (map_id, x, y, first_step) VALUES (?, ?, ?, ?)", (map_id, x, y, step))
+        else:
+            self._write("UPDATE visited SET count = count + 1 WHERE map_id = ? AND x = ? AND y = ?", key)
+        if map_id != self.current_map_id:
+            self.current_map_id = map_id
+            self._write("INSERT INTO maps (map_id, name, first_visit, last_visit, visits) VALUES (?, ?, ?, ?, 1) "
+                        "ON CONFLICT(map_id) DO UPDATE SET last_visit = excluded.last_visit, visits = visits + 1",
+                        (map_id, map_name, now, now))
+        else:
+            self._write("UPDATE maps SET last_visit = ? WHERE map_id = ?", (now, map_id))
+        return is_new
+
+    def add_warps(self, map_name, warps, step):
+        """ 새로 발견한 워프만 기록 """
+        map_id = MAPS.id(map_name)
+        for warp in warps:
+            key = (map_id, warp["x"], warp["y"])
+            if key in self.known_warps:
+                continue
+            self.known_warps.add(key)
+            self._write("INSERT OR IGNORE INTO warps (map_id, x, y, dest_map, first_step) VALUES (?, ?, ?, ?, ?)",
+                        (map_id, warp["x"], warp["y"], warp["dest_map"], step))
+
+    def talk_to_npc(self, map_name, x, y, step, text):
+        self._write("INSERT INTO npcs (map_id, x, y, step, timestamp, text) VALUES (?, ?, ?, ?, ?, ?)",
+                    (MAPS.id(map_name), x, y, step, time.time(), text))
+
+    def add_note(self, note, step, map_name=None):
+        """ map_name이 없으면 전체 메모, 있으면 해당 맵의 메모로 저장 """
+        map_id = None if map_name is None else MAPS.id(map_name)
+        if map_name is None:
+            self.notes.append(f"Step {step}: {note}")
+        else:
+            self.map_notes[map_name].append(f"Step {step}: {note}")
+        self._write("INSERT INTO notes (map_id, step, timestamp, text) VALUES (?, ?, ?, ?)",
+                    (map_id, step, time.time(), note))
+
+    def flush(self, timeout=None):
+        """ 지금까지 큐에 넣은 쓰기가 커밋될 때까지 대기 """
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self.queue.put(None)
+        self.writer.join()
+
+    def _query(self, sql, params):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def visited_in_area(self, map_name, x0, y0, x1, y1):
+        """ (x0, y0)-(x1, y1) 사각형 안에서 방문한 좌표 목록 (기본 키 인덱스 사용) """
+        return self._query("SELECT x, y, count FROM visited WHERE map_id = ? AND x BETWEEN ? AND ? AND y BETWEEN ? AND ?",
+                           (MAPS.id(map_name), x0, x1, y0, y1))
+
+    def warps_on_map(self, map_name):
+        return self._query("SELECT x, y, dest_map FROM warps WHERE map_id = ?", (MAPS.id(map_name),))
+
+    def npcs_on_map(self, map_name):
+        return self._query("SELECT x, y, step, text FROM npcs WHERE map_id = ? ORDER BY step", (MAPS.id(map_name),))
+
+    def visited_maps(self):
+        return self._query("SELECT name, visits, first_visit, last_visit FROM maps ORDER BY first_visit", ())
@@ -1,39 +1,236 @@
 from pyboy import PyBoy, PyBoyRegisterFile
 from symbol_parser import parse_sym_file
 import asyncio
+import logging
+
+from consts import MAPS, ITEMS, POKEMON
+from logs import get_logger
+from metrics import REGISTRY
+import text_codec
+
+log = get_logger("hooks")
+
+MAX_STRING_LENGTH = 256      # PlaceString 한 번에 복사할 최대 바이트 수
+RING_CAPACITY = 256          # 디코딩을 기다리는 이벤트 슬롯 수
+DISPATCH_INTERVAL = 1 / 30   # 링 버퍼를 비우는 주기(초)
+TEXT_BOX_WINPOS = 50361      # 대화창 첫 줄의 wTileMap 주소
+OPP_ID_OFFSET = 200          # wCurOpponent가 이 값 이상이면 트레이너 전투
+
+# 이벤트 타입
+EVENT_TEXT_PRINTED = "text_printed"
+EVENT_MAP_LOADED = "map_loaded"
+EVENT_BATTLE_START = "battle_start"        # 트레이너 전투 시작
+EVENT_WILD_ENCOUNTER = "wild_encounter"    # 야생 포켓몬 전투 시작
+EVENT_BATTLE_END = "battle_end"
+EVENT_ITEM_RECEIVED = "item_received"
+
+HOOK_EVENTS = REGISTRY.counter("hook_events_total", "Hook events captured")
+HOOK_DROPPED = REGISTRY.counter("hook_events_dropped_total", "Hook events dropped because the ring buffer was full")
+
+
+class RingBuffer:
+    """
+    미리 할당된 슬롯을 쓰는 단일 생산자/단일 소비자 링 버퍼.
+    생산자는 head만, 소비자는 tail만 갱신하므로 락이 필요 없습니다.
+    """
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0  # 다음에 쓸 위치 (생산자)
+        self.tail = 0  # 다음에 읽을 위치 (소비자)
+
+    def push(self, item):
+        """ 가득 차 있으면 False를 반환하고 버림 """
+        head = self.head
+        if head - self.tail >= self.capacity:
+            return False
+        self.slots[head % self.capacity] = item
+        self.head = head + 1
+        return True
+
+    def pop_all(self):
+        items = []
+        tail = self.tail
+        head = self.head
+        while tail < head:
+            index = tail % self.capacity
+            items.append(self.slots[index])
+            self.slots[index] = None
+            tail += 1
+        self.tail = tail
+        return items
+
+    def __len__(self):
+        return self.head - self.tail
+
+
+def decode_string(raw):
+    """ PlaceString으로 출력된 원시 바이트를 디코딩 """
+    return text_codec.decode(raw, stop_at_terminator=False)
+
+
+class GameEvent:
+    """ 이벤트 스트림으로 전달되는 구조화된 이벤트 """
+    __slots__ = ("type", "frame", "data")
+
+    def __init__(self, type, frame, data):
+        self.type = type
+        self.frame = frame
+        self.data = data
+
+    def __repr__(self):
+        return f"GameEvent({self.type!r}, frame={self.frame}, data={self.data!r})"
+
+
+class HookSpec:
+    """
+    ROM 심볼 하나에 거는 훅의 선언.
+
+    capture(hooker, registers): 에뮬레이터 콜백 안에서 호출되며, 필요한 원시 값만 읽어 반환합니다.
+                                None을 반환하면 이벤트를 만들지 않습니다 (필터 역할).
+    decode(raw): 디스패치 경로에서 호출되어 (이벤트 타입, 데이터)를 반환합니다.
+    min_interval: 같은 훅의 이벤트 사이 최소 프레임 간격 (속도 제한)
+    """
+    def __init__(self, symbol, capture, decode, min_interval=0):
+        self.symbol = symbol
+        self.capture = capture
+        self.decode = decode
+        self.min_interval = min_interval
+
+
+def capture_place_string(hooker, registers):
+    strptr = (registers.D << 8) + registers.E
+    if registers.HL != TEXT_BOX_WINPOS or strptr > 0xC000:
+        return None
+    raw = bytes(hooker.pyboy.memory[strptr:strptr + MAX_STRING_LENGTH])
+    return raw[:text_codec.find_terminator(raw)]
+
+
+def capture_map(hooker, registers):
+    return hooker.read("wCurMap")
+
+
+def capture_battle_start(hooker, registers):
+    return hooker.read("wCurOpponent"), hooker.read("wCurEnemyLevel")
+
+
+def capture_battle_end(hooker, registers):
+    return (hooker.read("wBattleResult"),)
+
+
+def capture_item(hooker, registers):
+    return registers.B, registers.C
+
+
+def decode_battle_start(raw):
+    opponent, level = raw
+    if opponent is not None and opponent < OPP_ID_OFFSET:
+        return EVENT_WILD_ENCOUNTER, {
+            "species": POKEMON.names[opponent],
+            "level": level,
+        }
+    return EVENT_BATTLE_START, {"trainer_class": None if opponent is None else opponent - OPP_ID_OFFSET}
+
+
+HOOK_SPECS = (
+    HookSpec("PlaceString", capture_place_string,
+             lambda raw: (EVENT_TEXT_PRINTED, {"text": decode_string(raw)})),
+    HookSpec("EnterMap", capture_map,
+             lambda raw: (EVENT_MAP_LOADED, {"map": MAPS.names[raw]}),
+             min_interval=30),
+    HookSpec("InitBattle", capture_battle_start, decode_battle_start, min_interval=60),
+    HookSpec("EndOfBattle", capture_battle_end,
+             lambda raw: (EVENT_BATTLE_END, {"result": raw[0]}), min_interval=60),
+    HookSpec("GiveItem", capture_item,
+             lambda raw: (EVENT_ITEM_RECEIVED, {"item": ITEMS.names[raw[0]], "count": raw[1]})),
+)
 
-from consts import *
 
 class GBHooker:
     pyboy: PyBoy
     queue: asyncio.Queue
-    def __init__(self, _pyboy : PyBoy, symbol_dict: dict):
+    def __init__(self, _pyboy : PyBoy, symbol_dict: dict, specs=HOOK_SPECS):
         self.pyboy = _pyboy
         self.symbol_dict = symbol_dict
-    
-    def initHooks(self, queue: asyncio.Queue):
-        self.pyboy.hook_register(self.symbol_dict["PlaceString"][0], self.symbol_dict["PlaceString"][1], self.PlaceStringHook, self.pyboy.register_file)
+        self.specs = list(specs)
+        self.ring = RingBuffer()
+        self.last_frames = [-(1 << 30)] * len(self.specs)
+        self.events_queue = None
+        self.listeners = []  # 디스패치 경로에서 모든 GameEvent를 받는 콜백
+        self.place_string_index = next(i for i, spec in enumerate(self.specs) if spec.symbol == "PlaceString")
+
+    def read(self, symbol):
+        """ 캡처 함수용 1바이트 읽기 (심볼이 없으면 None) """
+        if symbol not in self.symbol_dict:
+            return None
+        return self.pyboy.memory[self.symbol_dict[symbol][1]]
+
+    def initHooks(self, queue: asyncio.Queue, events_queue: asyncio.Queue = None):
+        """
+        HOOK_SPECS에 선언된 훅을 등록합니다. ROM 심볼이 없는 훅은 건너뜁니다.
+
+        queue: 출력된 대화 텍스트를 받을 큐 (text_printed 이벤트)
+        events_queue: 모든 GameEvent를 받을 큐
+        둘 다 put_nowait()만 사용하므로 asyncio.Queue나 channels.DropOldestChannel을 쓸 수 있습니다.
+        """
         self.queue = queue
-    
+        self.events_queue = events_queue
+        for index, spec in enumerate(self.specs):
+            if spec.symbol not in self.symbol_dict:
+                log.warning("Hook symbol not found, skipped: %s", spec.symbol)
+                continue
+            bank, address = self.symbol_dict[spec.symbol]
+            self.pyboy.hook_register(bank, address, self._make_callback(index, spec), self.pyboy.register_file)
+
+    def _make_callback(self, index, spec):
+        """ 에뮬레이터 콜백: 속도 제한, 캡처, 링 버퍼 삽입만 수행 """
+        capture = spec.capture
+        min_interval = spec.min_interval
+        last_frames = self.last_frames
+        pyboy = self.pyboy
+        ring = self.ring
+
+        def callback(registers):
+            frame = pyboy.frame_count
+            if min_interval and frame - last_frames[index] < min_interval:
+                return
+            raw = capture(self, registers)
+            if raw is None:
+                return
+            last_frames[index] = frame
+            if ring.push((index, frame, raw)):
+                HOOK_EVENTS.inc()
+            else:
+                HOOK_DROPPED.inc()
+        return callback
+
     def PlaceStringHook(self, pyboyregisterfile: PyBoyRegisterFile):
-        loop = asyncio.get_event_loop()
-        strptr = (pyboyregisterfile.D << 8) + pyboyregisterfile.E
-        winpos = pyboyregisterfile.HL
-        if(winpos == 50361 and strptr <= 0xC000):
-            print(winpos)
-            i = 0
-            rawcodes = ''
-            while not (self.pyboy.memory[strptr+i] == 0x50 or self.pyboy.memory[strptr+i] == 0x57 
-                       or self.pyboy.memory[strptr+i] == 0x00): #terminate char
-                if self.pyboy.memory[strptr+i] in CHARMAP:
-                    rawcodes += CHARMAP[self.pyboy.memory[strptr+i]]
-                i = i + 1
-            print(rawcodes)
-            asyncio.ensure_future(self.queue.put(rawcodes), loop = loop)
-
-        
-        
-
-
-
-    
\ No newline at end of file
+        """ PlaceString 훅을 직접 호출 (벤치마크용) """
+        raw = capture_place_string(self, pyboyregisterfile)
+        if raw is not None:
+            self.ring.push((self.place_string_index, 0, raw))
+
+    def add_listener(self, listener):
+        """ listener(event)는 이벤트가 디코딩될 때마다 디스패치 경로에서 호출됩니다 """
+        self.listeners.append(listener)
+
+    def drain(self):
+        """ 링 버퍼에 쌓인 원시 이벤트를 디코딩하여 GameEvent 리스트로 반환 """
+        events = []
+        for index, frame, raw in self.ring.pop_all():
+            event_type, data = self.specs[index].decode(raw)
+            events.append(GameEvent(event_type, frame, data))
+        return events
+
+    async def dispatch_loop(self, interval=DISPATCH_INTERVAL):
+        """ 에뮬레이터 경로 밖에서 주기적으로 링 버퍼를 비우고 이벤트를 큐에 전달 """
+        while True:
+            await asyncio.sleep(interval)
+            for event in self.drain():
+                log.log(logging.DEBUG if event.type == EVENT_TEXT_PRINTED else logging.INFO, "%s: %s", event.type, event.data)
+                if event.type == EVENT_TEXT_PRINTED:
+                    self.queue.put_nowait(event.data["text"])
+                if self.events_queue is not None:
+                    self.events_queue.put_nowait(event)
+                for listener in self.listeners:
+                    listener(event)
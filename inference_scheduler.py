@@ -0,0 +1,133 @@
+"""
+공유 추론 스케줄러
+
+여러 세션(에이전트)이 하나의 Ollama 서버를 같이 쓸 때 요청을 한곳에서 조정합니다.
+- 우선순위 큐: 전투 > 대화 > 탐험. 같은 우선순위에서는 지금까지 처리된 요청이 적은 세션이 먼저 (공정성)
+- 백엔드별 동시 실행 수 제한: 서버의 OLLAMA_NUM_PARALLEL과 맞추면 서버가 그 안에서 배치 처리하고,
+  그 이상 보내서 컨텍스트를 번갈아 올리며 느려지는 일을 막습니다.
+- 병합: 대기 중이거나 실행 중인 요청과 같은 요청(프롬프트, 이미지, 옵션이 모두 같음)은 다시 보내지 않고 결과를 공유
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+from collections import defaultdict
+
+from metrics import REGISTRY
+
+PRIORITY_BATTLE = 0
+PRIORITY_DIALOGUE = 1
+PRIORITY_EXPLORE = 2
+PRIORITY_NAMES = {PRIORITY_BATTLE: "battle", PRIORITY_DIALOGUE: "dialogue", PRIORITY_EXPLORE: "explore"}
+
+QUEUE_WAIT = REGISTRY.histogram("inference_queue_wait_seconds", "Time a request waited in the scheduler queue")
+COALESCED = REGISTRY.counter("inference_coalesced_total", "Requests answered by an identical pending or running request")
+
+
+def step_priority(game_state):
+    """ 게임 상태로 요청 우선순위를 정함 """
+    mode = game_state["current_mode"]
+    if mode["battle"]:
+        return PRIORITY_BATTLE
+    if mode["isTextBoxVisible"]:
+        return PRIORITY_DIALOGUE
+    return PRIORITY_EXPLORE
+
+
+class InferenceRequest:
+    __slots__ = ("key", "session", "priority", "prompt", "image_data", "num_ctx", "future", "enqueued_at")
+
+    def __init__(self, key, session, priority, prompt, image_data, num_ctx, future):
+        self.key = key
+        self.session = session
+        self.priority = priority
+        self.prompt = prompt
+        self.image_data = image_data
+        self.num_ctx = num_ctx
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceScheduler:
+    """
+    backends: Ollama 호스트 목록 (None이면 OLLAMA_HOST 또는 기본값)
+    concurrency: 백엔드당 동시에 보낼 최대 요청 수
+    call: 실제 요청 함수 call(prompt, image_data, num_ctx, host) -> str (기본값 llm_client.send_to_llm)
+    """
+    def __init__(self, backends=(None,), concurrency=1, call=None):
+        if call is None:
+            from llm_client import send_to_llm as call
+        self.backends = list(backends)
+        self.concurrency = concurrency
+        self.call = call
+        self.heap = []
+        self.sequence = itertools.count()
+        self.available = asyncio.Condition()
+        self.pending = {}                  # 요청 키 -> Future (대기 중 + 실행 중)
+        self.served = defaultdict(int)     # 세션 -> 디스패치된 요청 수
+        self.busy = defaultdict(int)       # 백엔드 -> 실행 중인 요청 수
+        self.workers = []
+
+        for priority, name in PRIORITY_NAMES.items():
+            REGISTRY.gauge("inference_queue_depth", "Queued requests by priority", {"priority": name}).set_function(
+                lambda priority=priority: sum(1 for entry in self.heap if entry[0] == priority))
+        REGISTRY.gauge("inference_in_flight", "Requests running on backends").set_function(lambda: sum(self.busy.values()))
+        REGISTRY.gauge("inference_fairness", "Jain's fairness index of requests served per session (1 = equal)").set_function(
+            self.fairness)
+
+    def start(self):
+        """ 백엔드마다 concurrency개의 디스패치 작업을 시작 (이벤트 루프 안에서 호출) """
+        for host in self.backends:
+            for _ in range(self.concurrency):
+                self.workers.append(asyncio.create_task(self._worker(host)))
+
+    def fairness(self):
+        counts = list(self.served.values())
+        if not counts or not any(counts):
+            return 1.0
+        return sum(counts) ** 2 / (len(counts) * sum(c * c for c in counts))
+
+    @staticmethod
+    def request_key(prompt, image_data, num_ctx):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prompt.encode())
+        digest.update(b"\0")
+        digest.update((image_data or "").encode())
+        digest.update(str(num_ctx).encode())
+        return digest.digest()
+
+    async def submit(self, prompt, image_data, priority=PRIORITY_EXPLORE, session=0, num_ctx=None):
+        """ 요청을 큐에 넣고 응답 텍스트를 기다림 """
+        key = self.request_key(prompt, image_data, num_ctx)
+        if key in self.pending:
+            COALESCED.inc()
+            return await asyncio.shield(self.pending[key])
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        self.served.setdefault(session, 0)
+        request = InferenceRequest(key, session, priority, prompt, image_data, num_ctx, future)
+        async with self.available:
+            heapq.heappush(self.heap, (priority, self.served[session], next(self.sequence), request))
+            self.available.notify()
+        return await asyncio.shield(future)
+
+    async def _worker(self, host):
+        while True:
+            async with self.available:
+                await self.available.wait_for(lambda: self.heap)
+                _, _, _, request = heapq.heappop(self.heap)
+            QUEUE_WAIT.observe(time.perf_counter() - request.enqueued_at)
+            # 세션별 시리즈로 두어 Prometheus에서 세션 간 처리량을 비교할 수 있게 함
+            REGISTRY.counter("inference_requests_total", "Requests dispatched to a backend", {"session": request.session}).inc()
+            self.served[request.session] += 1
+            self.busy[host] += 1
+            try:
+                result = await self.call(request.prompt, request.image_data, request.num_ctx, host)
+            except Exception as e:
+                request.future.set_exception(e)
+            else:
+                request.future.set_result(result)
+            finally:
+                self.busy[host] -= 1
+                self.pending.pop(request.key, None)
@@ -2,26 +2,32 @@ import asyncio
 import json
 import base64
 from io import BytesIO
-from pyboy import PyBoy
-from ollama import AsyncClient
 import re
+import time
+
+from logs import get_logger
+from metrics import REGISTRY
+from state_codec import compact_screen
+from prompt_budget import Section, KEEP_TAIL, REQUIRED
 
 MODEL_NAME = "deepseek-r1:14b"
-async def send_to_llm(screen_ascii_data ,game_state, image_data, note, current_step, region_notes, diagloues):
-    """
-    이미지 전송을 지원하는 모델일 경우 화면 이미지를 추가하여 게임 상태를 LLM에 전송하고, 스트리밍으로 응답을 받아 실시간 출력하는 함수.
+KEEP_ALIVE = "30m"  # 요청이 없어도 모델을 메모리에 유지하는 시간 (재시작 시 다시 로드하지 않도록)
 
-    Args:
-        game_screen_ascii (str): game screen ascii data
-        game_state (dict): 현재 게임 상태를 포함한 JSON 데이터.
-        image_data (str): Base64 인코딩된 게임 화면 PNG.
-        note(array): 지금까지의 메모
-        current_step: 현재 스텝
-        region_notes (array): region note
-    Returns:
-        dict: 최종적으로 수신된 response text
-    """
-    prompt = f"""
+log = get_logger("llm")
+prompt_log = get_logger("llm.prompt")  # 매 스텝 전체 프롬프트 (DEBUG)
+
+LLM_REQUESTS = REGISTRY.counter("llm_requests_total", "LLM chat requests sent")
+LLM_PROMPT_CHARS = REGISTRY.counter("llm_prompt_chars_total", "Characters sent in prompts")
+LLM_RESPONSE_CHARS = REGISTRY.counter("llm_response_chars_total", "Characters received in responses")
+LLM_LATENCY = REGISTRY.histogram("llm_request_seconds", "Total LLM request latency")
+LLM_FIRST_TOKEN = REGISTRY.histogram("llm_first_token_seconds", "Latency until the first streamed token")
+LLM_PROMPT_TOKENS = REGISTRY.histogram("llm_prompt_tokens", "Prompt tokens evaluated by the model (prompt_eval_count)",
+                                       buckets=(256, 512, 1024, 1536, 2048, 3072, 4096, 6144, 8192, 16384))
+STATE_TOKENS = REGISTRY.histogram("prompt_state_tokens", "Estimated tokens of the serialized game state section",
+                                  buckets=(32, 64, 128, 256, 512, 1024, 2048))
+
+# 스텝마다 바뀌지 않는 프롬프트 구간은 모듈 로드 시 한 번만 만들어 둡니다.
+PROMPT_HEADER = """
 You are an AI controlling a Gameboy Pokémon Red game using a Game Boy controller.
 Your ultimate objective is to defeat the Elite Four and view the ending credits.
 
@@ -37,48 +43,50 @@ Additionally, you can keep specific notes for each map you visit:
 - Example: `/take_map_note Professor Oak's Lab is located here.`
 
 You can simulate button presses using the command `/joypad button`.
-{{button}} could be 'a', 'b', 'start', 'select', 'right', 'left', 'down' or 'up'.
+{button} could be 'a', 'b', 'start', 'select', 'right', 'left', 'down' or 'up'.
 - Example: `/joypad a`
 
+When `overworld` is `true`, you can walk to a destination in one command instead of pressing buttons step by step:
+- `/go_to x y` walks the player to map coordinates (x, y). Example: `/go_to 5 7`
+- `/go_to_warp index` walks the player onto a warp (door, stairs, exit) listed in `overworld_state.warps`. Example: `/go_to_warp 0`
+- `overworld_state.frontier` lists the nearest explored coordinates next to unexplored areas of the current map. `/go_to` one of them to explore new ground instead of revisiting known areas.
+The route is computed and executed automatically, and the result is added to your notes.
 
 
-Your task is to decide the next action based on the current game state.
-
-
-## Current Step
-{current_step}
-## Your Note
-{note}
 
-## Previous Conversation
-{diagloues}
-
-## Your Region Note
-{region_notes[game_state["overworld_state"]["current_map"]]}
+Your task is to decide the next action based on the current game state.
 
-## Game State:
-{json.dumps(game_state, indent=2)}
 
+"""
 
-## Exploration Objectives:
+PROMPT_OBJECTIVES = """## Exploration Objectives:
 - Explore unknown regions and reveal new areas.
 - Interact with NPCs to collect hints or obtain important items.
 - Catch new Pokémon species and expand your Pokédex.
 - Prioritize visiting Pokémon Centers when Pokémon health is low.
 
-## Your Game Screen
-When isTextBoxVisible is true, you can read the text information via the next table.
-{screen_ascii_data}
 """
-    if game_state["current_mode"]["isTextBoxVisible"]:
-        prompt += f"""
+
+# RolloutPool이 켜져 있을 때만 넣습니다.
+PROMPT_ROLLOUT = """## Trying Candidates
+When you are unsure which inputs are best, propose up to 8 short button sequences separated by `|`:
+```
+/try up,up,a | left,left,left | down,a
+```
+Each sequence is simulated from the current state, the one with the best outcome (new map, new text, items, no damage) is executed,
+and the ranking of all candidates is added to your notes.
+
+"""
+
+# {position} 자리에 플레이어 좌표가 들어갑니다.
+PROMPT_TEXT_RULES = """
 ## Text Display Rules
 
 - When `isTextBoxVisible` is `true`, you can read the text information using the next table.
 - **Note**: Any entry shown as `0x##` (e.g., `0xAA`) denotes a background tile code, not regular text. If no hexadecimal values are present, interpret the text as a continuous string.
 - If the displayed text ends with a `"▼"` symbol, it indicates that pressing `"A"` will progress the dialogue.
 - The symbols `○` represent NPCs or sprites. When encountering these, you should stand in front of the sprite and press `"A"` to obtain information.
-- The symbol `◉` represents the player. The coordinates of the player (`◉`) are `{game_state['overworld_state']['position']}`.
+- The symbol `◉` represents the player. The coordinates of the player (`◉`) are `{position}`.
 
 ## Example:
 
@@ -92,8 +100,9 @@ Hello there!
 Welcome to the ▼
 ```
     """
-    prompt += f"""
-## Decision Criteria (Priority Order):
+
+# {passable_tiles} 자리에 통과 가능한 타일 리스트가 들어갑니다.
+PROMPT_CONTROLS = """## Decision Criteria (Priority Order):
 1. Engage storyline-related NPCs or special events.
 2. Explore unexplored or promising map regions.
 3. Search for hidden items or Pokémon encounters.
@@ -113,48 +122,160 @@ Welcome to the ▼
 - The **"select"** button **must never be used** under any circumstances.
 - You can't move your player when isTextBoxVisible is True, but you CAN move menu cursor(▶).
 - When `overworld` is `true`, your movement should be based on the `passable_tiles` list:  
-  `{game_state['passable_tiles']}`  
+  `{passable_tiles}`  
   This list determines which tiles you can walk on.
 
 ## Output Format
 Always respond using one of the following formats:
 ```
-/joypad {{button1}}
+/joypad {button1}
 ```
 ```
-/take_note {{your note}}
+/go_to {x} {y}
+```
+```
+/take_note {your note}
 ```
 - You **must** summarize the current situation using /take_note everytime(a very short sentense).
 
 - Provide a short explanation (1-2 sentences) of the chosen buttons after the command.
 """
 
-    client = AsyncClient()
+
+def build_prompt(screen_ascii_data, game_state, note, current_step, region_notes, diagloues, events=None, state_encoder=None,
+                 budget=None, semantic_screen=None, rollouts=False):
+    """
+    게임 상태와 메모로부터 LLM에 보낼 프롬프트를 조립합니다.
+
+    Args:
+        screen_ascii_data (str): game screen ascii data
+        game_state (dict): 현재 게임 상태를 포함한 JSON 데이터.
+        note(array): 지금까지의 메모
+        current_step: 현재 스텝
+        region_notes (array): region note
+        diagloues (str): 지금까지의 대화 내용
+        events (list): 직전 스텝 이후 훅에서 들어온 이벤트 요약 문자열
+        state_encoder (StateEncoder): 상태 직렬화 방식. 없으면 기존 JSON(indent=2)과 마크다운 표를 그대로 사용
+        budget (PromptBudget): 토큰 예산. 있으면 우선순위가 낮은 구간부터 줄여 예산에 맞춤
+        semantic_screen (str): TileClassifier의 의미 격자. 있으면 화면 표보다 먼저 넣음
+        rollouts (bool): /try 명령(RolloutPool) 사용 가능 여부
+    Returns:
+        str: 완성된 프롬프트
+    """
+    if state_encoder is None or state_encoder.encoding == "json":
+        state_text = json.dumps(game_state, indent=2)
+    else:
+        state_text = state_encoder.encode(game_state)
+        STATE_TOKENS.observe(state_encoder.last_tokens)
+        screen_ascii_data = compact_screen(screen_ascii_data)
+    text_box = game_state["current_mode"]["isTextBoxVisible"]
+    # 우선순위: REQUIRED(0)는 항상 유지, 숫자가 클수록 예산 초과 시 먼저 줄이거나 뺌
+    sections = [
+        Section.text("header", PROMPT_HEADER),
+        Section("step", [str(current_step)], title="## Current Step"),
+        Section("notes", note, 3, KEEP_TAIL, title="## Your Note", trailer="\n\n"),
+        Section("dialogues", diagloues.splitlines(), 5, KEEP_TAIL, title="## Previous Conversation", trailer="\n\n"),
+        Section("region_notes", region_notes[game_state["overworld_state"]["current_map"]], 3, KEEP_TAIL,
+                title="## Your Region Note", trailer="\n\n"),
+        Section("state", state_text.split("\n"), title="## Game State:", trailer="\n\n\n"),
+    ]
+    if events:
+        sections.append(Section("events", events, 2, KEEP_TAIL, title="## Recent Events", trailer="\n\n"))
+    sections.append(Section.text("objectives", PROMPT_OBJECTIVES, 4))
+    if semantic_screen:
+        # 스크린샷 없이도 지형을 알 수 있는 유일한 구간이므로 유지
+        sections.append(Section("semantic_screen", semantic_screen.split("\n"),
+                                title="## Map Around You\nOne character per map coordinate (x grows right, y grows down)."))
+    # 대화창이 떠 있으면 화면 표가 텍스트를 읽는 유일한 수단이므로 유지
+    sections.append(Section("screen", screen_ascii_data.split("\n"), REQUIRED if text_box else 1,
+                            title="## Your Game Screen\nWhen isTextBoxVisible is true, you can read the text information via the next table."))
+    if text_box:
+        sections.append(Section.text("text_rules", PROMPT_TEXT_RULES.replace("{position}", str(game_state['overworld_state']['position'])), 2))
+    if rollouts:
+        sections.append(Section.text("rollout", PROMPT_ROLLOUT, 3))
+    sections.append(Section.text("controls", PROMPT_CONTROLS.replace("{passable_tiles}", " ".join(game_state['passable_tiles']))))
+    if budget is None:
+        return "".join(section.render() for section in sections)
+    return budget.fit(sections)
+
+
+def preload_model(num_ctx=None, host=None, keep_alive=KEEP_ALIVE):
+    """
+    빈 프롬프트로 요청을 보내 Ollama가 모델을 미리 메모리에 올리게 합니다 (응답 생성 없음).
+    num_ctx가 다르면 Ollama가 모델을 다시 로드하므로 실제 요청과 같은 값을 넘겨야 합니다.
+    블로킹 호출이므로 asyncio.to_thread()로 다른 시작 작업과 동시에 실행합니다.
+    """
+    from ollama import Client  # ollama/httpx import는 처음 필요할 때만
+
+    Client(host=host).generate(model=MODEL_NAME, prompt="", keep_alive=keep_alive,
+                               options={"num_ctx": num_ctx} if num_ctx else None)
+
+async def send_to_llm(prompt, image_data, num_ctx=None, host=None, keep_alive=KEEP_ALIVE):
+    """
+    이미지 전송을 지원하는 모델일 경우 화면 이미지를 추가하여 프롬프트를 LLM에 전송하고, 스트리밍으로 응답을 받는 함수.
+    프롬프트는 llm.prompt 로거(DEBUG)에, 완성된 응답은 llm 로거에 남깁니다.
+
+    Args:
+        prompt (str): build_prompt()로 만든 프롬프트
+        image_data (str): Base64 인코딩된 게임 화면 PNG. None이면 텍스트만 보냄
+        num_ctx (int): 모델 컨텍스트 길이. Ollama 기본값은 넘치는 프롬프트 앞부분을 조용히 잘라내므로 명시합니다.
+        host (str): Ollama 서버 주소 (None이면 OLLAMA_HOST 환경 변수 또는 기본값)
+        keep_alive (str): 요청 후 모델을 메모리에 유지하는 시간
+    Returns:
+        str: 최종적으로 수신된 response text
+    """
+    from ollama import AsyncClient
+
+    client = AsyncClient(host=host)
     response_data = ""
-    print(prompt)
+    prompt_log.debug("%s", prompt)
+    LLM_REQUESTS.inc()
+    LLM_PROMPT_CHARS.inc(len(prompt))
+    started = time.perf_counter()
+    first_token = True
     async for chunk in await client.chat(
         model=MODEL_NAME,
-        messages=[{"role": "user", "content": prompt, 'images': [image_data]}],
+        messages=[{"role": "user", "content": prompt, **({"images": [image_data]} if image_data else {})}],
         stream=True,
+        options={"num_ctx": num_ctx} if num_ctx else None,
+        keep_alive=keep_alive,
     ):
-        response_text = chunk.get("message", {}).get("content", "")
-        print(response_text, end="", flush=True)  # 실시간 출력
-        response_data += response_text
+        if first_token:
+            LLM_FIRST_TOKEN.observe(time.perf_counter() - started)
+            first_token = False
+        if chunk.get("prompt_eval_count"):
+            LLM_PROMPT_TOKENS.observe(chunk.get("prompt_eval_count"))
+        response_data += chunk.get("message", {}).get("content", "")
 
+    elapsed = time.perf_counter() - started
+    LLM_LATENCY.observe(elapsed)
+    log.info("Response in %.1fs:\n%s", elapsed, response_data)  # 토큰마다 출력하지 않고 완성된 응답을 한 번에
+    LLM_RESPONSE_CHARS.inc(len(response_data))
     return response_data
 
-def capture_screen(pyboy):
+def encode_screen(screen):
     """
-    PyBoy의 현재 화면을 PNG로 캡처하고, Base64로 인코딩하여 반환.
+    PIL 이미지를 PNG로 저장하고 Base64로 인코딩하여 반환.
+    CPU 비용이 크므로 asyncio.to_thread()로 이벤트 루프 밖에서 호출할 수 있습니다.
 
     Args:
-        pyboy (PyBoy): PyBoy 인스턴스.
+        screen (PIL.Image.Image): 화면 이미지.
 
     Returns:
         str: Base64로 인코딩된 PNG 이미지.
     """
-    screen = pyboy.screen.image  # PIL 이미지 객체로 캡처
     buffer = BytesIO()
     screen.save(buffer, format="PNG")  # PNG로 저장
     return base64.b64encode(buffer.getvalue()).decode()  # Base64로 인코딩
 
+def capture_screen(pyboy):
+    """
+    PyBoy의 현재 화면을 PNG로 캡처하고, Base64로 인코딩하여 반환.
+
+    Args:
+        pyboy (PyBoy): PyBoy 인스턴스.
+
+    Returns:
+        str: Base64로 인코딩된 PNG 이미지.
+    """
+    return encode_screen(pyboy.screen.image)  # PIL 이미지 객체로 캡처
@@ -0,0 +1,208 @@
+"""
+비동기 로깅
+
+표준 logging 로거를 그대로 쓰되, 핸들러는 유한 큐에 레코드를 넣기만 하고(QueueHandler)
+메시지 포맷과 출력은 백그라운드 스레드(LogWriter)가 묶어서 처리합니다.
+에뮬레이터 루프나 이벤트 루프는 stdout이나 디스크를 기다리지 않고, 큐가 가득 차면 레코드를 버리고 개수만 셉니다.
+
+- 컴포넌트별 레벨: get_logger("llm") -> "agent.llm" 로거, --log-levels llm=debug,hooks=warning
+- 파일: JSON 한 줄씩, 크기가 max_bytes를 넘으면 <path>.1.gz, <path>.2.gz ... 로 압축 회전
+- 샘플링: 자주 나오는 컴포넌트는 N개 중 1개만 남김 (--log-sample buttons=60)
+
+메시지 포맷은 출력 스레드에서 하므로 인자로는 이후에 바뀌지 않는 값을 넘겨야 합니다.
+"""
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+from logging.handlers import QueueHandler
+
+from metrics import REGISTRY
+
+ROOT = "agent"
+QUEUE_SIZE = 10000
+BATCH_SIZE = 512
+FLUSH_SECONDS = 0.5
+MAX_BYTES = 64 * 1024 * 1024
+BACKUP_COUNT = 5
+CONSOLE_FORMAT = "%(asctime)s %(levelname).1s [%(component)s] %(message)s"
+
+LOG_RECORDS = REGISTRY.counter("log_records_total", "Log records written by the background writer")
+LOG_DROPPED = REGISTRY.counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+LOG_SAMPLED_OUT = REGISTRY.counter("log_records_sampled_out_total", "Log records skipped by per-component sampling")
+
+
+def get_logger(component):
+    """ 컴포넌트 로거 (예: get_logger("llm") -> agent.llm) """
+    return logging.getLogger(f"{ROOT}.{component}")
+
+
+def component_of(record):
+    name = record.name
+    return name[len(ROOT) + 1:] if name.startswith(ROOT + ".") else name
+
+
+class SamplingFilter(logging.Filter):
+    """ 컴포넌트별로 N개 중 1개만 통과 (WARNING 이상은 항상 통과) """
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates  # 컴포넌트 -> N
+        self.counts = {}
+
+    def filter(self, record):
+        rate = self.rates.get(component_of(record))
+        if not rate or rate <= 1 or record.levelno >= logging.WARNING:
+            return True
+        count = self.counts.get(record.name, 0)
+        self.counts[record.name] = count + 1
+        if count % rate:
+            LOG_SAMPLED_OUT.inc()
+            return False
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    """ 큐가 가득 차면 기다리지 않고 버림. 포맷은 출력 스레드에서 하므로 레코드를 그대로 넣음 """
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc()
+
+    def prepare(self, record):
+        return record
+
+
+class RotatingGzipFile:
+    """ 크기 기준으로 회전하고 지난 파일은 gzip으로 압축하는 로그 파일 """
+    def __init__(self, path, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+
+    def write(self, text):
+        self.file.write(text)
+        self.size += len(text)
+        if self.size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        self.file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}.gz"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}.gz")
+        if self.backup_count > 0:
+            with open(self.path, "rb") as source, gzip.open(f"{self.path}.1.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.size = 0
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class LogWriter(threading.Thread):
+    """ 큐에서 레코드를 묶음으로 꺼내 콘솔과 파일에 한 번씩 씀 """
+    def __init__(self, records, console=sys.stdout, file=None, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS):
+        super().__init__(name="log-writer", daemon=True)
+        self.records = records
+        self.console = console
+        self.file = file
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.formatter = logging.Formatter(CONSOLE_FORMAT, "%H:%M:%S")
+        self._stopping = threading.Event()
+
+    def run(self):
+        while not (self._stopping.is_set() and self.records.empty()):
+            try:
+                batch = [self.records.get(timeout=self.flush_seconds)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            self.write(batch)
+
+    def write(self, batch):
+        console_lines = []
+        file_lines = []
+        for record in batch:
+            record.component = component_of(record)
+            try:
+                message = record.getMessage()
+                if self.console is not None:
+                    console_lines.append(self.formatter.format(record))
+                if self.file is not None:
+                    entry = {"ts": round(record.created, 3), "level": record.levelname, "component": record.component,
+                             "msg": message}
+                    if record.exc_info:
+                        entry["exc"] = self.formatter.formatException(record.exc_info)
+                    file_lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+            except Exception as e:
+                console_lines.append(f"[log-writer] could not format a record from {record.name}: {e!r}")
+        if console_lines:
+            self.console.write("\n".join(console_lines) + "\n")
+            self.console.flush()
+        if file_lines:
+            self.file.write("\n".join(file_lines) + "\n")
+            self.file.flush()
+        LOG_RECORDS.inc(len(batch))
+
+    def stop(self, timeout=5.0):
+        """ 남은 레코드를 모두 쓰고 종료 """
+        self._stopping.set()
+        self.join(timeout)
+        if self.file is not None:
+            self.file.close()
+
+
+def parse_component_values(text, cast=str):
+    """ "llm=debug,hooks=warning" -> {"llm": "debug", "hooks": "warning"} """
+    values = {}
+    for item in filter(None, (text or "").split(",")):
+        component, _, value = item.partition("=")
+        values[component.strip()] = cast(value.strip())
+    return values
+
+
+def setup_logging(level="info", component_levels=None, path=None, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+                  sample_rates=None, console=True, queue_size=QUEUE_SIZE):
+    """
+    agent.* 로거에 비동기 핸들러를 붙이고 출력 스레드를 시작합니다. 반환한 LogWriter의 stop()으로 마무리합니다.
+
+    component_levels: {컴포넌트: 레벨} (예: {"llm": "debug"})
+    sample_rates: {컴포넌트: N} N개 중 1개만 기록
+    """
+    records = queue.Queue(queue_size)
+    file = RotatingGzipFile(path, max_bytes, backup_count) if path else None
+    writer = LogWriter(records, sys.stdout if console else None, file)
+
+    handler = BoundedQueueHandler(records)
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    root = logging.getLogger(ROOT)
+    root.handlers[:] = [handler]
+    root.propagate = False
+    root.setLevel(level.upper())
+    for component, component_level in (component_levels or {}).items():
+        get_logger(component).setLevel(component_level.upper())
+
+    REGISTRY.gauge("log_queue_depth", "Log records waiting for the writer thread").set_function(records.qsize)
+    writer.start()
+    return writer
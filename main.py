@@ -1,117 +1,519 @@
+import argparse
 import asyncio
-from pyboy import PyBoy
-from consts import MAP_ID_TO_NAME
-from gb_hooker import GBHooker
+import functools
+import os
+import time
+IMPORTS_STARTED = time.perf_counter()  # 시작 보고서의 기준 시각 (모듈 import 시간 포함)
+from gb_hooker import GBHooker, EVENT_TEXT_PRINTED, EVENT_MAP_LOADED, EVENT_BATTLE_START, EVENT_WILD_ENCOUNTER
+from channels import CommandChannel, DropOldestChannel
 from memory_reader import MemoryReader
-from llm_client import send_to_llm, capture_screen  # LLM과 이미지 캡처 함수 가져오기
-from PIL import Image
+from pathfinder import PathFinder, walk_to
+from battle import BattleEngine, run_battle
+from dialogue import DIALOGUE_CONTINUE, DIALOGUE_RUNS, advance_dialogue, dialogue_state
+from llm_client import KEEP_ALIVE, build_prompt, preload_model, send_to_llm  # 프롬프트 생성, 모델 미리 로드, LLM 요청
+from pipeline import StepPipeline
+from trace_recorder import TraceRecorder, replay
+from metrics import REGISTRY, start_metrics_server, write_snapshots
+from exploration_store import ExplorationStore
+from inference_scheduler import InferenceScheduler, step_priority
+from world_model import WorldModel
+from stuck_detector import (ACTIONS, ACTION_EXPLORE, ACTION_HINT, ACTION_REWIND, DEFAULT_ACTIONS, KIND_CYCLE, MAX_PRESSURE,
+                            Checkpoints, StuckDetector, fingerprint)
+from state_codec import ENCODINGS, DEFAULT_ENCODING, StateEncoder
+from prompt_budget import DEFAULT_BUDGET, PromptBudget
+from startup import StartupTimer
+from logs import BACKUP_COUNT, MAX_BYTES, get_logger, parse_component_values, setup_logging
+from profiler import DEFAULT_INTERVAL, SUBSYSTEM_EMULATOR, SamplingProfiler, install_signal_toggle, section
+from symbol_parser import load_symbol_map
+from tile_classifier import TileClassifier, load_signature_db
+from rollout import ALLOWED_BUTTONS, DEFAULT_WORKERS, RolloutPool, parse_candidates
 memory_reader: MemoryReader
+log = get_logger("agent")
+button_log = get_logger("buttons")  # 프레임 경로의 버튼 입력 (--log-sample buttons=N으로 줄일 수 있음)
+
+# 버튼 입력과 무관하게 화면 상황을 바꾸는 이벤트
+STALE_EVENTS = (EVENT_MAP_LOADED, EVENT_BATTLE_START, EVENT_WILD_ENCOUNTER)
+
+FACING_OFFSETS = {"Up": (0, -1), "Down": (0, 1), "Left": (-1, 0), "Right": (1, 0)}
+
+FRAMES = REGISTRY.counter("emulator_frames_total", "Emulated frames")
+BUTTONS = REGISTRY.counter("buttons_pressed_total", "Buttons pressed")
+STEPS = REGISTRY.counter("agent_steps_total", "Completed agent steps")
+STEP_SECONDS = REGISTRY.histogram("agent_step_seconds", "Wall time of one agent step (snapshot to commands handled)")
+GO_TO_SECONDS = REGISTRY.histogram("go_to_seconds", "Wall time of local /go_to execution")
+SESSION_RESTARTS = REGISTRY.counter("session_restarts_total", "Sessions restarted after a crash")
 def extract_commands(command_response: str):
     # 행 단위로 나누고, /로 시작하는 행만 필터링
     commands = [line.strip() for line in command_response.split('\n') if line.strip().startswith('/')]
     return commands
 
-async def llm_worker(game_state_queue, command_queue, is_working, pyboy, dialogues_queue):
+async def llm_worker(pipeline, command_queue, dialogues_queue, memory_reader, events_queue, store, recorder=None, state_encoder=None,
+                     budget=None, num_ctx=None, battle_engine=True, auto_dialogue=True, scheduler=None, session=0,
+                     stuck_actions=DEFAULT_ACTIONS, rollouts=None):
     """
-    게임 상태를 큐에서 받아 LLM에 요청을 보내고, 응답된 명령을 처리합니다.
-    슬래시 명령 (/take_note, /joypad)을 지원하도록 확장되었습니다.
+    파이프라인에서 준비된 게임 상태를 받아 LLM에 요청을 보내고, 응답된 명령을 처리합니다.
+    슬래시 명령 (/take_note, /joypad, /go_to, /go_to_warp)을 지원하도록 확장되었습니다.
+    /go_to 계열 명령은 LLM 호출 없이 로컬에서 경로를 계산하고 실행합니다.
+    메모와 탐험 기록은 ExplorationStore에 저장되어 재시작 후에도 이어집니다.
+    관측한 화면은 WorldModel에 맵별로 누적되어 화면 밖 경로 계산과 프런티어 안내에 쓰입니다.
+    전투는 BattleEngine이 로컬에서 진행하고, 교체/도망/포획 같은 판단이 필요할 때만 LLM을 호출합니다.
+    ▼로 끝나는 대화는 LLM 호출 없이 A로 넘기고, 읽은 대화를 다음 프롬프트에 한 번에 넘깁니다.
+    StuckDetector가 같은 상태의 반복이나 정체를 감지하면 stuck_actions(hint, explore, rewind)로 대응합니다.
+    rollouts(RolloutPool)가 있으면 /try로 제안된 후보 시퀀스를 헤드리스 에뮬레이터에서 돌려 보고 가장 나은 것을 실행합니다.
     """
-    step_count = 0
-    notes = []
+    world = WorldModel()
+    pathfinder = PathFinder(memory_reader, world)
+    engine = BattleEngine(memory_reader) if battle_engine else None
+    handed_over = False  # 전투 엔진이 직전에 LLM에게 판단을 넘겼으면 이번 스텝은 LLM이 처리
+    detector = StuckDetector()
+    checkpoints = Checkpoints() if ACTION_REWIND in stuck_actions else None
+    local_notes = []
+    step_count = store.last_step + 1
     dialogues = ""
-    region_notes = {}
-    for i in MAP_ID_TO_NAME:
-        region_notes[MAP_ID_TO_NAME[i]] = []
     while True:
-        game_state, screen_ascii_data = await game_state_queue.get()
-        if not dialogues_queue.empty():
-            dialogues += await dialogues_queue.get() + "\n"
-        image_data = capture_screen(pyboy)
-        is_working.set()
-        command_response = await send_to_llm(screen_ascii_data, game_state, image_data, notes, step_count, region_notes, dialogues)
-        is_working.clear()
+        # 이전 스텝의 버튼 입력이 모두 실행되면, 그 사이 준비된 다음 스냅샷을 바로 받음
+        await command_queue.join()
+        step = await pipeline.next_step()
+        epoch = command_queue.epoch  # 이 스냅샷을 보고 결정한 명령의 세대
+        step_started = time.perf_counter()
+        game_state = step.game_state
+        if engine is not None and game_state["current_mode"]["battle"] and not handed_over:
+            with pipeline.hold():
+                handed_over, summary = await run_battle(engine, command_queue)
+            log.info("[BATTLE] %s", summary)
+            local_notes.append(f"battle_engine: {summary}")
+            continue  # 엔진이 버튼을 눌렀으므로 새 스냅샷으로 다음 스텝 진행
+        handed_over = False
+        if (auto_dialogue and not game_state["current_mode"]["battle"] and game_state["current_mode"]["isTextBoxVisible"]
+                and dialogue_state(memory_reader) == DIALOGUE_CONTINUE):
+            with pipeline.hold():
+                transcript, reason = await advance_dialogue(memory_reader, command_queue)
+            DIALOGUE_RUNS.inc()
+            # 같은 대화가 훅으로도 들어오므로 화면에서 읽은 대화에 없는 것만 더함
+            for hooked in dialogues_queue.drain():
+                hooked = hooked.strip()
+                if hooked and not any(hooked in line or line in hooked for line in transcript):
+                    transcript.append(hooked)
+            text = " ".join(transcript)
+            dialogues += text + "\n"
+            position = game_state["overworld_state"]["position"]
+            dx, dy = FACING_OFFSETS.get(game_state["overworld_state"]["facing_direction"], (0, 0))
+            store.talk_to_npc(game_state["overworld_state"]["current_map"], position["x"] + dx, position["y"] + dy, step_count, text)
+            local_notes.append(f"dialogue (auto-advanced, stopped: {reason}): {text}")
+            log.info("[DIALOGUE] %s: %s", reason, text)
+            continue
+        overworld_state = game_state["overworld_state"]
+        current_map = overworld_state["current_map"]
+        new_dialogue = "\n".join(dialogues_queue.drain())
+        if new_dialogue:
+            dialogues += new_dialogue + "\n"
+
+        # 반복/정체 감지 (LLM을 호출하는 스텝만 셈)
+        report = detector.observe(fingerprint(game_state, step.screen_hash, step.window_text_hash))
+        if report is None:
+            if checkpoints is not None and detector.progressed:
+                checkpoints.maybe_save(pipeline.pyboy, step_count)
+        else:
+            log.warning("[STUCK] %s (pressure %d): %s", report.kind, detector.pressure, report.describe())
+            if checkpoints is not None and report.kind == KIND_CYCLE and detector.pressure >= MAX_PRESSURE:
+                rewound = checkpoints.rewind(pipeline.pyboy)
+                if rewound is not None:
+                    if recorder is not None:
+                        recorder.record_load_state(pipeline.pyboy)  # 재생 때도 같은 프레임에서 되감도록
+                    pipeline.invalidate()
+                    command_queue.cancel_stale()
+                    detector.reset_window()
+                    local_notes.append(f"stuck_detector: {report.describe()}. The game was rewound to step {rewound}; "
+                                       "do not repeat those actions.")
+                    log.warning("[STUCK] Rewound to the checkpoint of step %d", rewound)
+                    continue
+            if ACTION_HINT in stuck_actions:
+                local_notes.append(f"stuck_detector: {report.describe()}. These actions are not making progress; "
+                                   "try something different (another direction, close menus with b, talk to someone, or leave the area).")
+        if game_state["current_mode"]["overworld"]:
+            position = overworld_state["position"]
+            store.visit(current_map, position["x"], position["y"], step_count)
+            store.add_warps(current_map, overworld_state["warps"], step_count)
+            pathfinder.observe()
+            _, _, map_id = pathfinder.get_player_position()
+            frontier = world.nearest_frontier(map_id, position["x"], position["y"])
+            if report is not None and ACTION_EXPLORE in stuck_actions:
+                # 탐험 압력: 루프에서 머문 칸 근처를 빼고, 압력이 클수록 더 먼 프런티어를 안내
+                looped = {(x, y) for m, x, y in report.positions if m == current_map}
+                candidates = [cell for cell in world.nearest_frontier(map_id, position["x"], position["y"], 5 * (detector.pressure + 1))
+                              if not any(abs(cell[0] - x) + abs(cell[1] - y) <= 1 for x, y in looped)]
+                frontier = candidates[5 * detector.pressure:] or candidates[-5:] or frontier
+                if frontier:
+                    local_notes.append(f"stuck_detector: explore instead, e.g. /go_to {frontier[0][0]} {frontier[0][1]}")
+            overworld_state["frontier"] = [{"x": fx, "y": fy} for fx, fy in frontier[:5]]
+            if new_dialogue:
+                # 바라보는 칸의 NPC(또는 표지판)와 대화한 것으로 기록
+                dx, dy = FACING_OFFSETS.get(overworld_state["facing_direction"], (0, 0))
+                store.talk_to_npc(current_map, position["x"] + dx, position["y"] + dy, step_count, new_dialogue)
+        # 훅 이벤트 스트림 (맵 이동, 전투 시작/종료, 아이템 획득 등)
+        events = local_notes
+        local_notes = []
+        for event in events_queue.drain():
+            if event.type != EVENT_TEXT_PRINTED:
+                events.append(f"{event.type}: {event.data}")
+        prompt = build_prompt(step.screen_ascii_data, game_state, store.notes, step_count, store.map_notes, dialogues, events,
+                              state_encoder, budget, step.semantic_screen, rollouts is not None)
+        if scheduler is not None:
+            command_response = await scheduler.submit(prompt, step.image_data, step_priority(game_state), session, num_ctx)
+        else:
+            command_response = await send_to_llm(prompt, step.image_data, num_ctx)
+        if recorder is not None:
+            recorder.record_prompt(step_count, prompt)
+            recorder.record_response(step_count, command_response)
         if not command_response:
-            print("[ERROR] No response from LLM.")
+            log.error("No response from LLM.")
             continue
 
         command_texts = extract_commands(command_response)
+        detector.record_actions([command for command in command_texts if not command.startswith("/take_")])
         for command_text in command_texts:
+            if command_queue.epoch != epoch and not command_text.startswith("/take_"):
+                # 생성 중에 맵 이동/전투 시작 등으로 상태가 바뀌었으면 이전 화면 기준의 입력은 버림
+                log.info("[STALE] Skipped command decided on an outdated state: %s", command_text)
+                continue
 
             # 슬래시 명령 처리
             if command_text.startswith("/take_note"):
                 note = command_text[len("/take_note"):].strip()
-                notes.append(f"Step {step_count}: {note}")
-                print(f"[NOTE ADDED] {step_count}: {note}")
+                store.add_note(note, step_count)
+                log.info("[NOTE ADDED] %d: %s", step_count, note)
             elif command_text.startswith("/take_map_note"):
-                current_map =  game_state["overworld_state"]["current_map"]
                 note = command_text[len("/take_map_note"):].strip()
-                if region_notes in note:
-                    region_notes[current_map].append(f"Step {step_count}: {note}")
-                    print(f"[NOTE ADDED] {step_count}: {note}")
+                if note:
+                    store.add_note(note, step_count, current_map)
+                    log.info("[NOTE ADDED] %d: %s", step_count, note)
             elif command_text.startswith("/joypad"):
                 buttons = command_text[len("/joypad"):].strip()
                 button_list = [btn.strip() for btn in buttons.strip("[]").split(",") if btn.strip()]
 
                 for btn in button_list:
                     btn = btn.lower()
-                    if btn not in ["a", "b", "up", "down", "left", "right", "start"]:
-                        print(f"[ERROR] Invalid button: {btn}")
+                    if btn not in ALLOWED_BUTTONS:
+                        log.error("Invalid button: %s", btn)
                         continue
-                    await command_queue.put(btn)
-                print(f"[INFO] Joypad commands queued: {button_list}")
-            
+                    if not await command_queue.put(btn, epoch):
+                        break
+                log.info("Joypad commands queued: %s", button_list)
+            elif command_text.startswith("/try") and rollouts is not None:
+                try:
+                    candidates = parse_candidates(command_text[len("/try"):])
+                except ValueError as e:
+                    log.error("Invalid /try candidates: %s", e)
+                    continue
+                if not candidates:
+                    continue
+                # 롤아웃이 도는 동안 게임을 멈춰, 점수를 매긴 상태에서 그대로 승자를 실행
+                with pipeline.hold():
+                    snapshot_frame = pipeline.pyboy.frame_count
+                    with pipeline.pause():
+                        results = await rollouts.rank(pipeline.pyboy, memory_reader, candidates)
+                    best = results[0]
+                    if pipeline.pyboy.frame_count != snapshot_frame:
+                        log.warning("[TRY] Game advanced %d frames while ranking; not playing the result",
+                                    pipeline.pyboy.frame_count - snapshot_frame)
+                    else:
+                        await rollouts.play(pipeline.pyboy, command_queue, best.sequence, epoch)
+                ranking = "; ".join(result.describe() for result in results)
+                store.add_note(f"/try -> {ranking}", step_count)
+                log.info("[TRY] %s", ranking)
+            elif command_text.startswith("/go_to_warp"):
+                args = command_text[len("/go_to_warp"):].strip()
+                warps = memory_reader.get_warps()
+                if not args.isdigit() or int(args) >= len(warps):
+                    log.error("Invalid warp index: %s", args)
+                    continue
+                warp = warps[int(args)]
+                with pipeline.hold(), GO_TO_SECONDS.time():
+                    result = await walk_to(pathfinder, command_queue, warp["x"], warp["y"], allow_blocked_goal=True)
+                store.add_note(f"/go_to_warp {args} -> {result}", step_count)
+                log.info("[GO_TO] warp %s: %s", args, result)
+            elif command_text.startswith("/go_to"):
+                args = command_text[len("/go_to"):].strip().split()
+                if len(args) != 2 or not all(a.isdigit() for a in args):
+                    log.error("Invalid go_to coordinates: %s", args)
+                    continue
+                target_x, target_y = int(args[0]), int(args[1])
+                with pipeline.hold(), GO_TO_SECONDS.time():
+                    result = await walk_to(pathfinder, command_queue, target_x, target_y)
+                store.add_note(f"/go_to {target_x} {target_y} -> {result}", step_count)
+                log.info("[GO_TO] (%d, %d): %s", target_x, target_y, result)
+
             else:
-                print(f"[ERROR] Unknown command format: {command_response}")
+                log.error("Unknown command format: %s", command_response)
 
+        store.set_step(step_count)
         step_count += 1
-async def game_loop(pyboy, memory_reader, game_state_queue, command_queue, is_working):
+        STEPS.inc()
+        STEP_SECONDS.observe(time.perf_counter() - step_started)
+async def game_loop(pyboy, pipeline, command_queue, recorder=None, frame_interval=1/60):
     """
     게임 실행 루프: LLM이 응답할 때까지는 계속 게임을 진행하면서 입력을 대기.
+    LLM이 생성 중인 동안에도 다음 스텝의 스냅샷을 미리 준비합니다.
+    프레임마다 하는 일은 명령 채널에서 기다림 없이 하나를 꺼내 보는 것뿐입니다.
+    frame_interval: 프레임 사이 대기 시간 (0이면 다른 작업에 양보만 하고 최대 속도로 진행)
     """
-    tick = 0
-    while pyboy.tick():
-        # LLM이 실행 중이지 않을 때만 새로운 게임 상태를 전송
-        if command_queue.empty() and game_state_queue.empty() and not is_working.is_set():
-            #print(f"LLM Working: {is_working.is_set()}")  # LLM이 실행 중인지 확인
-            tick += 1
-            if tick > 60 * 5:  # 5초마다 LLM에 새로운 상태 전송
-                tick = 0
-                game_state = memory_reader.get_game_state()
-                game_screen_ascii = memory_reader.generate_overworld_markdown_from_memory()
-                await game_state_queue.put((game_state, game_screen_ascii))
-
+    while True:
+        if pipeline.pauses:
+            # /try 롤아웃 중에는 점수를 매긴 세이브스테이트에서 게임이 벗어나지 않도록 멈춤
+            await asyncio.sleep(frame_interval)
+            continue
+        with section(SUBSYSTEM_EMULATOR):  # tick은 C 코드라 프로파일러가 파이썬 프레임으로 구분할 수 없음
+            running = pyboy.tick()
+        if not running:
+            break
+        FRAMES.inc()
+        if recorder is not None:
+            recorder.on_tick(pyboy)
         # LLM이 보낸 명령을 적용
-        if not command_queue.empty():
-            button = await command_queue.get()
-            print(f"Pressing button: {button}")
+        button = command_queue.get_nowait()
+        if button is not None:
+            button_log.debug("Pressing button: %s", button)
+            if recorder is not None:
+                recorder.record_input(button)
+            pipeline.on_button()
+            BUTTONS.inc()
             pyboy.button(button, 10)
+            command_queue.task_done()
+        else:
+            # 로컬 실행(/go_to, 전투, 대화) 중이면 pipeline.hold()로 멈춰 있음
+            pipeline.tick()
 
-        await asyncio.sleep(1/60)  # 게임 루프가 너무 빠르게 실행되지 않도록 조절
+        await asyncio.sleep(frame_interval)  # 게임 루프가 너무 빠르게 실행되지 않도록 조절
 
-async def main():
-    rom_path = "data/pokered.gb"
-    pyboy = PyBoy(rom_path, window="SDL2")
+def session_path(path, session, restart=0):
+    """
+    세션 0은 path 그대로, 나머지 세션은 확장자 앞에 .s<번호>를 붙임.
+    restart가 있으면 .r<번호>도 붙여 재시작이 직전 실행의 파일(충돌 재현용 기록)을 덮어쓰지 않게 함
+    """
+    root, ext = os.path.splitext(path)
+    if session:
+        root += f".s{session}"
+    if restart:
+        root += f".r{restart}"
+    return root + ext
+
+
+def session_phase(name, session):
+    """ 시작 보고서 타임라인의 구간 이름 (메트릭 이름이 아님. 메트릭은 session 레이블로 구분) """
+    return name if session == 0 else f"{name}_s{session}"
+
+
+def boot_emulator(rom_path, window, state_path=None):
+    """ PyBoy를 만들고 세이브스테이트가 있으면 불러옵니다 (pyboy import도 이 안에서) """
+    from pyboy import PyBoy
+
+    pyboy = PyBoy(rom_path, window=window)
     pyboy.set_emulation_speed(0)  # 실시간 실행
+    if state_path:
+        with open(state_path, "rb") as f:
+            pyboy.load_state(f)
+    return pyboy
+
 
-    
-    memory_reader = MemoryReader(pyboy)
+async def run_session(args, scheduler, symbols, session=0, timer=None, ready=None, rollouts=None, restart=0):
+    """
+    에뮬레이터 하나와 그 에이전트를 실행합니다. 첫 세션만 화면 창을 띄웁니다.
+    symbols: 심볼 맵을 로드하는 Task (부팅과 동시에 진행)
+    ready: 에이전트가 준비되면 set할 asyncio.Event
+    rollouts: 모든 세션이 공유하는 RolloutPool (없으면 /try를 쓰지 않음)
+    restart: 충돌 후 재시작 횟수 (실행 기록은 재시작마다 별도 파일)
+    """
+    rom_path = args.rom
+    window = "SDL2" if session == 0 else "null"
+    started = time.perf_counter()
+    if window == "null":
+        pyboy = await asyncio.to_thread(boot_emulator, rom_path, window, args.load_state)
+    else:
+        # SDL 창은 만든 스레드에서 이벤트를 처리해야 하므로 이벤트 루프 스레드에서 부팅
+        pyboy = boot_emulator(rom_path, window, args.load_state)
+    if timer is not None:
+        timer.add(session_phase("boot", session), started, time.perf_counter())
+
+    recorder = None
+    if args.record:
+        recorder = TraceRecorder(session_path(args.record, session, restart), record_llm=not args.no_record_llm)
+        recorder.start(rom_path, pyboy)
+
+    memory_reader = MemoryReader(pyboy, symbol_map=await symbols)
     hooker = GBHooker(pyboy, memory_reader.symbol_map)
-    
-    # LLM과 PyBoy 간 데이터 교환을 위한 큐 생성
-    dialogues_queue = asyncio.Queue()
-    game_state_queue = asyncio.Queue()  # LLM에 보낼 게임 상태 저장
-    command_queue = asyncio.Queue()  # LLM의 응답을 저장
-    hooker.initHooks(dialogues_queue)
-    # LLM 작업 상태를 관리하는 Event 객체 생성
-    is_working = asyncio.Event()
+    classifier = None
+    if args.semantic_screen or args.text_only:
+        # 타일 시그니처 DB는 ROM에서 한 번 만들어 <rom>.tiles.cache에 캐시
+        started = time.perf_counter()
+        db = await asyncio.to_thread(load_signature_db, rom_path, memory_reader.symbol_map)
+        if timer is not None:
+            timer.add(session_phase("tile_db", session), started, time.perf_counter())
+        classifier = TileClassifier(memory_reader, db)
+
+    # LLM과 PyBoy 간 데이터 교환을 위한 유한 채널 생성
+    dialogues_queue = DropOldestChannel()
+    pipeline = StepPipeline(pyboy, memory_reader, classifier=classifier,
+                            encode_images=not args.text_only)  # LLM에 보낼 다음 스텝을 미리 준비 (최신 스냅샷 하나만 유지)
+    command_queue = CommandChannel()  # LLM과 로컬 실행기가 보낸 버튼 명령 (가득 차면 생산자가 대기)
+    events_queue = DropOldestChannel()  # 훅에서 들어오는 모든 GameEvent
+    hooker.initHooks(dialogues_queue, events_queue)
 
-    # LLM 작업을 백그라운드에서 실행 (종료될 필요 없음)
-    asyncio.create_task(llm_worker(game_state_queue, command_queue, is_working, pyboy, dialogues_queue))
+    def on_event(event):
+        # 버튼 없이 게임 상태가 바뀌면 준비된 스냅샷과 대기 중인 명령은 더 이상 유효하지 않음
+        if event.type in STALE_EVENTS:
+            pipeline.invalidate()
+            command_queue.cancel_stale()
+    hooker.add_listener(on_event)
+    dispatcher = asyncio.create_task(hooker.dispatch_loop())  # 훅이 캡처한 문자열을 에뮬레이터 경로 밖에서 디코딩
 
-    # 게임 루프 실행
-    await game_loop(pyboy, memory_reader, game_state_queue, command_queue, is_working)
+    # 큐 길이는 수집 시점에만 읽으므로 tick 경로에 비용이 없음
+    labels = {"session": session}
+    REGISTRY.gauge("command_queue_depth", "Buttons waiting in command_queue", labels).set_function(command_queue.qsize)
+    REGISTRY.gauge("dialogues_queue_depth", "Texts waiting in dialogues_queue", labels).set_function(dialogues_queue.qsize)
+    REGISTRY.gauge("events_queue_depth", "Hook events waiting in events_queue", labels).set_function(events_queue.qsize)
+    REGISTRY.gauge("pipeline_snapshot_ready", "1 if the next step snapshot is prepared", labels).set_function(
+        lambda: int(pipeline.ready.is_set()))
 
-    pyboy.stop()
+    store = ExplorationStore(session_path(args.store, session))
+    state_encoder = StateEncoder(args.state_encoding)
+    budget = PromptBudget(args.prompt_budget)
+    worker = asyncio.create_task(llm_worker(pipeline, command_queue, dialogues_queue, memory_reader, events_queue, store, recorder,
+                                            state_encoder, budget, args.num_ctx, not args.no_battle_engine, not args.no_auto_dialogue,
+                                            scheduler, session, args.stuck_actions, rollouts))
+    if timer is not None:
+        timer.add(session_phase("session_ready", session), started, time.perf_counter())
+    if ready is not None:
+        ready.set()
+
+    # 게임 루프 실행. 에이전트 작업이 예외로 끝나도 세션을 끝내고 예외를 올려 재시작할 수 있게 함
+    loop = asyncio.create_task(game_loop(pyboy, pipeline, command_queue, recorder))
+    try:
+        done, _ = await asyncio.wait({worker, loop}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in (worker, loop, dispatcher):
+            task.cancel()
+        if recorder is not None:
+            recorder.close()
+        store.close()
+        pyboy.stop()
+
+
+async def supervise_session(args, scheduler, symbols, session, timer, ready, rollouts=None):
+    """ 세션이 예외로 끝나면 max_restarts번까지 다시 시작 (심볼 맵과 로드된 모델은 그대로 재사용) """
+    restarts = 0
+    while True:
+        try:
+            return await run_session(args, scheduler, symbols, session, timer if restarts == 0 else None, ready, rollouts,
+                                     restarts)
+        except Exception as e:
+            if restarts >= args.max_restarts:
+                raise
+            restarts += 1
+            SESSION_RESTARTS.inc()
+            log.exception("Session %d crashed (%r), restarting (%d/%d)", session, e, restarts, args.max_restarts)
+
+
+async def report_startup(timer, tasks, ready_events):
+    """ 모델 로드와 모든 세션 준비가 끝나면 시작 단계 보고서를 출력 """
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for ready in ready_events:
+        await ready.wait()
+    for result in results:
+        if isinstance(result, Exception):
+            log.warning("Startup task failed: %r", result)
+    timer.report()
+
+
+async def main(args):
+    log_writer = setup_logging(args.log_level, parse_component_values(args.log_levels), args.log_file, args.log_max_bytes,
+                               args.log_backups, parse_component_values(args.log_sample, int))
+    timer = StartupTimer(IMPORTS_STARTED)
+    timer.add("imports", IMPORTS_STARTED, time.perf_counter())
+
+    # 모델 로드(서버), 심볼 로드, 에뮬레이터 부팅을 동시에 진행
+    preloads = []
+    if not args.no_preload:
+        preloads = [asyncio.create_task(timer.run(f"model_preload{'' if i == 0 else i}",
+                                                  asyncio.to_thread(preload_model, args.num_ctx, host, args.keep_alive)))
+                    for i, host in enumerate(args.ollama_host or [None])]
+    symbols = asyncio.create_task(timer.run("symbols", asyncio.to_thread(load_symbol_map, args.sym)))
+    # 롤아웃 작업 프로세스의 부팅도 시작 단계에서 함께 진행
+    rollouts = None
+    if args.rollout_workers > 0:
+        rollouts = RolloutPool(args.rom, args.sym, args.rollout_workers)
+        preloads.append(asyncio.create_task(timer.run("rollout_workers", rollouts.warm_up())))
+
+    # 모든 세션이 하나의 스케줄러를 통해 추론 서버를 공유
+    call = functools.partial(send_to_llm, keep_alive=args.keep_alive)
+    scheduler = InferenceScheduler(args.ollama_host or [None], args.inference_concurrency, call)
+    scheduler.start()
+    profiler = SamplingProfiler(args.profile_interval, args.profile_output)
+    install_signal_toggle(profiler, asyncio.get_running_loop())  # kill -USR2 <pid> 로 켜고 끔
+    if args.profile:
+        profiler.start()
+    if args.metrics_port:
+        await start_metrics_server(port=args.metrics_port, profiler=profiler)
+    if args.metrics_json:
+        asyncio.create_task(write_snapshots(args.metrics_json, args.metrics_interval))
+
+    ready_events = [asyncio.Event() for _ in range(args.sessions)]
+    sessions = [asyncio.create_task(supervise_session(args, scheduler, symbols, session, timer, ready_events[session], rollouts))
+                for session in range(args.sessions)]
+    report = asyncio.create_task(report_startup(timer, preloads + [symbols], ready_events))
+    try:
+        await asyncio.gather(*sessions)
+    finally:
+        report.cancel()
+        profiler.stop()
+        if rollouts is not None:
+            rollouts.shutdown()
+        log_writer.stop()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rom", default="data/pokered.gb")
+    parser.add_argument("--sym", default="data/pokered.sym", help="심볼 파일 (파싱 결과는 <sym>.cache에 캐시)")
+    parser.add_argument("--load-state", metavar="PATH", help="부팅 대신 불러올 세이브스테이트 (재시작 시에도 사용)")
+    parser.add_argument("--store", default="data/exploration.db", help="탐험 기록 SQLite 파일")
+    parser.add_argument("--state-encoding", choices=ENCODINGS, default=DEFAULT_ENCODING, help="프롬프트의 게임 상태 직렬화 방식")
+    parser.add_argument("--semantic-screen", action="store_true", help="화면 타일을 분류한 지도 격자를 프롬프트에 추가")
+    parser.add_argument("--text-only", action="store_true", help="스크린샷 없이 지도 격자만 보냄 (--semantic-screen 포함)")
+    parser.add_argument("--prompt-budget", type=int, default=DEFAULT_BUDGET, help="프롬프트 토큰 예산 (넘으면 낮은 우선순위 구간부터 줄임)")
+    parser.add_argument("--num-ctx", type=int, default=8192, help="Ollama 모델 컨텍스트 길이")
+    parser.add_argument("--no-battle-engine", action="store_true", help="전투도 모든 입력을 LLM이 결정")
+    parser.add_argument("--no-auto-dialogue", action="store_true", help="▼ 대화도 LLM이 직접 넘김")
+    parser.add_argument("--sessions", type=int, default=1, help="한 프로세스에서 실행할 에이전트 수 (추론 스케줄러 공유)")
+    parser.add_argument("--ollama-host", action="append", help="Ollama 서버 주소 (여러 번 지정하면 백엔드 여러 개)")
+    parser.add_argument("--keep-alive", default=KEEP_ALIVE, help="요청이 없을 때 Ollama가 모델을 메모리에 유지하는 시간")
+    parser.add_argument("--no-preload", action="store_true", help="시작할 때 모델을 미리 로드하지 않음")
+    parser.add_argument("--max-restarts", type=int, default=3, help="세션이 예외로 끝났을 때 다시 시작하는 최대 횟수")
+    parser.add_argument("--inference-concurrency", type=int, default=1, help="백엔드당 동시 요청 수 (OLLAMA_NUM_PARALLEL과 맞춤)")
+    parser.add_argument("--stuck-actions", type=lambda value: tuple(a for a in value.split(",") if a), default=DEFAULT_ACTIONS,
+                        help=f"반복/정체 감지 시 동작 (쉼표로 구분: {', '.join(ACTIONS)}, 빈 문자열이면 감지만)")
+    parser.add_argument("--rollout-workers", type=int, default=0,
+                        help=f"/try 후보를 시뮬레이션할 헤드리스 에뮬레이터 프로세스 수 (0이면 끔, 권장 {DEFAULT_WORKERS})")
+    parser.add_argument("--record", metavar="TRACE", help="실행 기록을 저장할 파일 (충돌 후 재시작한 실행은 확장자 앞에 .r<N>)")
+    parser.add_argument("--no-record-llm", action="store_true", help="프롬프트/응답은 기록하지 않음")
+    parser.add_argument("--replay", metavar="TRACE", help="LLM 없이 기록을 헤드리스로 재생")
+    parser.add_argument("--metrics-port", type=int, help="Prometheus 메트릭 HTTP 포트 (예: 9100)")
+    parser.add_argument("--metrics-json", metavar="PATH", help="주기적인 JSON 메트릭 스냅샷 파일")
+    parser.add_argument("--metrics-interval", type=float, default=60.0, help="JSON 스냅샷 주기(초)")
+    parser.add_argument("--log-level", default="info", help="agent.* 로거 기본 레벨")
+    parser.add_argument("--log-levels", default="", help="컴포넌트별 레벨 (예: llm.prompt=debug,hooks=warning)")
+    parser.add_argument("--log-sample", default="", help="컴포넌트별 샘플링, N개 중 1개만 기록 (예: buttons=60,hooks=10)")
+    parser.add_argument("--log-file", help="JSON 줄 로그 파일 (크기 기준 회전, gzip 압축)")
+    parser.add_argument("--log-max-bytes", type=int, default=MAX_BYTES, help="로그 파일 회전 크기")
+    parser.add_argument("--log-backups", type=int, default=BACKUP_COUNT, help="보관할 압축 로그 수")
+    parser.add_argument("--profile", action="store_true", help="샘플링 프로파일러를 켠 채로 시작 (SIGUSR2로 켜고 끌 수 있음)")
+    parser.add_argument("--profile-interval", type=float, default=DEFAULT_INTERVAL, help="프로파일러 샘플링 주기(초)")
+    parser.add_argument("--profile-output", default="profile.collapsed", help="프로파일러를 끌 때 쓸 collapsed stack 파일")
+    args = parser.parse_args()
+    if set(args.stuck_actions) - set(ACTIONS):
+        parser.error(f"--stuck-actions: unknown action in {args.stuck_actions} (choose from {', '.join(ACTIONS)})")
+
+    if args.replay:
+        print(replay(args.replay, args.rom))
+    else:
+        asyncio.run(main(args))
@@ -1,42 +1,18 @@
 from pyboy import PyBoyRegisterFile
 from symbol_parser import parse_sym_file
 
-from consts import *
+from consts import MAPS, ITEMS, POKEMON, MOVES, TYPES
+from text_codec import TILE_CHARS, TILE_DISPLAY_TABLE, decode_tile_rows
 
 class MemoryReader:
-    def __init__(self, pyboy, sym_path="data/pokered.sym"):
+    def __init__(self, pyboy, sym_path="data/pokered.sym", symbol_map=None):
         self.pyboy = pyboy
-        self.symbol_map = parse_sym_file(sym_path)
+        # symbol_map이 주어지면 .sym 파일을 다시 파싱하지 않음 (메모리 덤프 기반 벤치마크 등)
+        self.symbol_map = symbol_map if symbol_map is not None else parse_sym_file(sym_path)
 
-        # charmap 기반 문자 매핑
-        self.tile_to_char = {
-            0x77: "-", 0x76: "_", 
-            # 0x79: "┌", 0x7A: "─",0x7B: "┐", 0x7C: "│",    0x7D: "└",   0x7E: "┘",  0x7F: " ",
-             0x79: "", 0x7A: "",0x7B: "", 0x7C: "",    0x7D: "",   0x7E: "",  0x7F: " ",
-            0x80: "A", 0x81: "B", 0x82: "C", 0x83: "D", 0x84: "E", 0x85: "F", 0x86: "G",
-            0x87: "H", 0x88: "I", 0x89: "J", 0x8A: "K", 0x8B: "L", 0x8C: "M", 0x8D: "N",
-            0x8E: "O", 0x8F: "P", 0x90: "Q", 0x91: "R", 0x92: "S", 0x93: "T", 0x94: "U",
-            0x95: "V", 0x96: "W", 0x97: "X", 0x98: "Y", 0x99: "Z",
-
-            0x9A: "(", 0x9B: ")", 0x9C: ":", 0x9D: ";", 0x9E: "[", 0x9F: "]",
-
-            0xA0: "a", 0xA1: "b", 0xA2: "c", 0xA3: "d", 0xA4: "e", 0xA5: "f", 0xA6: "g",
-            0xA7: "h", 0xA8: "i", 0xA9: "j", 0xAA: "k", 0xAB: "l", 0xAC: "m", 0xAD: "n",
-            0xAE: "o", 0xAF: "p", 0xB0: "q", 0xB1: "r", 0xB2: "s", 0xB3: "t", 0xB4: "u",
-            0xB5: "v", 0xB6: "w", 0xB7: "x", 0xB8: "y", 0xB9: "z",
-
-            0xBA: "é", 0xBB: "'d", 0xBC: "'l", 0xBD: "'s", 0xBE: "'t", 0xBF: "'v",
-
-            0xE0: "'", 0xE1: "<PK>", 0xE2: "<MN>", 0xE3: "-",
-            0xE4: "'r", 0xE5: "'m", 0xE6: "?", 0xE7: "!", 0xE8: ".",
-
-            0xE9: "ァ", 0xEA: "ゥ", 0xEB: "ェ",
-            0xEC: "▷", 0xED: "▶", 0xEE: "▼", 0xEF: "♂", 0xF0: "ED", 0xF1: "×",
-            0xF2: "<DOT>", 0xF3: "/", 0xF4: ",", 0xF5: "♀",
-
-            0xF6: "0", 0xF7: "1", 0xF8: "2", 0xF9: "3", 0xFA: "4",
-            0xFB: "5", 0xFC: "6", 0xFD: "7", 0xFE: "8", 0xFF: "9"
-        }
+        # charmap 기반 문자 매핑 (text_codec의 단일 원본 테이블에서 생성)
+        self.tile_to_char = TILE_CHARS
+        self._move_cache = {}  # 기술 ID -> ROM 기술 데이터 (ROM은 바뀌지 않으므로 한 번만 읽음)
 
 
     def read_memory_word(self, symbol):
@@ -105,16 +81,9 @@ class MemoryReader:
     def read_window_text(self, width=18, height=20):
         """VRAM에서 윈도우 타일을 읽어 텍스트로 변환"""
         start_addr = 0x9C00
-        text_lines = []
-
-        for row in range(height):
-            text_line = ""
-            for col in range(width):
-                tile_id = self.pyboy.memory[start_addr + row * 32 + col]
-                text_line += self.tile_to_char.get(tile_id, "")
-            text_lines.append(text_line.strip())
-
-        return "\n".join(text_lines).strip()
+        # 윈도우 맵은 한 행이 32타일이므로 필요한 행 전체를 한 번에 읽음
+        tiles = self.pyboy.memory[start_addr:start_addr + height * 32]
+        return "\n".join(decode_tile_rows(tiles, width, height)).strip()
 
     def parse_sprite_entries(self, sprite_bytes):
         """
@@ -215,13 +184,13 @@ class MemoryReader:
         """
         # BGMAP 데이터: 'wTileMap' 심볼로부터 width*height 바이트 읽기
         bgmap = self.read_memory_bytes("wTileMap", width * height)
-        tile_to_char = self.tile_to_char
+        tile_display = TILE_DISPLAY_TABLE
 
         # bgmap의 단일 타일을 문자로 변환하는 헬퍼 함수
         def get_tile_char(x, y):
             index = y * width + x
             tile_id = bgmap[index] if index < len(bgmap) else 0
-            return tile_to_char.get(tile_id, f'{tile_id:#x}')
+            return tile_display[tile_id]
 
         # OAM 데이터를 가져옴 (플레이어와 NPC 스프라이트)
         oam_positions = self.get_oam_positions(num_entries=40, screen_width=width, screen_height=height)
@@ -258,7 +227,6 @@ class MemoryReader:
                     tr = get_tile_char(x + 1, y) if x + 1 < width else ""
                     bl = get_tile_char(x, y + 1) if y + 1 < height else ""
                     br = get_tile_char(x + 1, y + 1) if (x + 1 < width and y + 1 < height) else ""
-                    print(tl)
                     if tl.startswith("0x"):
                         cell = tl
                     elif tr.startswith("0x"):
@@ -301,6 +269,90 @@ class MemoryReader:
             passable_tiles.append(tile)
             offset += 1
         return passable_tiles
+
+    def get_warps(self):
+        """
+        wWarpEntries에서 현재 맵의 워프 목록을 읽습니다.
+        각 엔트리는 4바이트 [y, x, 도착 워프 ID, 도착 맵 ID]로 구성됩니다.
+        """
+        warp_count = self.read_memory("wNumberOfWarps")
+        warp_bytes = self.read_memory_bytes("wWarpEntries", warp_count * 4)
+        warps = []
+        for i in range(warp_count):
+            y, x, dest_warp, dest_map = warp_bytes[i * 4:(i + 1) * 4]
+            warps.append({
+                "index": i,
+                "x": x,
+                "y": y,
+                "dest_map": MAPS.names[dest_map],
+                "dest_warp": dest_warp
+            })
+        return warps
+
+    def read_memory_word_be(self, symbol):
+        """ 빅 엔디언 2바이트 값 (전투/파티 구조체의 HP 등) """
+        high, low = self.read_memory_bytes(symbol, 2)
+        return (high << 8) | low
+
+    def get_move_data(self, move_id):
+        """
+        ROM의 Moves 테이블에서 기술 정보를 읽습니다.
+        각 엔트리는 6바이트 [애니메이션(기술 ID), 효과, 위력, 타입, 명중률(0~255), PP]이며 ID 1부터 시작합니다.
+        """
+        if move_id not in self._move_cache:
+            bank, address = self.symbol_map["Moves"]
+            start = address + (move_id - 1) * 6
+            _, effect, power, move_type, accuracy, pp = self.pyboy.memory[bank, start:start + 6]
+            self._move_cache[move_id] = {
+                "id": move_id,
+                "name": MOVES.names[move_id],
+                "effect": effect,
+                "power": power,
+                "type": TYPES.names[move_type],
+                "accuracy": accuracy,
+                "max_pp": pp,
+            }
+        return self._move_cache[move_id]
+
+    def _read_battle_mon(self, prefix):
+        """ wBattleMon*/wEnemyMon* 구조체를 읽음 (타입은 Type1/Type2 라벨이 없으면 Type 라벨의 2바이트) """
+        if f"{prefix}Type1" in self.symbol_map:
+            types = [self.read_memory(f"{prefix}Type1"), self.read_memory(f"{prefix}Type2")]
+        else:
+            types = self.read_memory_bytes(f"{prefix}Type", 2)
+        return {
+            "species": POKEMON.names[self.read_memory(f"{prefix}Species")],
+            "level": self.read_memory(f"{prefix}Level"),
+            "hp": self.read_memory_word_be(f"{prefix}HP"),
+            "max_hp": self.read_memory_word_be(f"{prefix}MaxHP"),
+            "status": self.read_memory(f"{prefix}Status"),
+            "types": [TYPES.names[t] for t in types],
+        }
+
+    def get_battle_state(self):
+        """
+        전투 중인 내 포켓몬(기술, 남은 PP 포함), 상대 포켓몬, 파티의 HP를 읽습니다.
+        wBattleMonPP의 하위 6비트가 남은 PP, 상위 2비트는 PP UP 사용 횟수입니다.
+        """
+        player = self._read_battle_mon("wBattleMon")
+        move_ids = self.read_memory_bytes("wBattleMonMoves", 4)
+        pps = self.read_memory_bytes("wBattleMonPP", 4)
+        player["moves"] = [dict(self.get_move_data(move_id), slot=slot, pp=pp & 0x3F)
+                           for slot, (move_id, pp) in enumerate(zip(move_ids, pps)) if move_id != 0]
+        party = []
+        for i in range(1, self.read_memory("wPartyCount") + 1):
+            party.append({
+                "species": POKEMON.names[self.read_memory(f"wPartyMon{i}")],
+                "hp": self.read_memory_word_be(f"wPartyMon{i}HP"),
+                "max_hp": self.read_memory_word_be(f"wPartyMon{i}MaxHP"),
+            })
+        return {
+            "trainer_battle": self.read_memory("wIsInBattle") == 2,
+            "player": player,
+            "enemy": self._read_battle_mon("wEnemyMon"),
+            "party": party,
+        }
+
     def read_memory_bytes(self, symbol_or_addr, length):
         """
         특정 심볼 또는 직접적인 메모리 주소에서 지정한 길이만큼 바이트를 읽어옴.
@@ -359,7 +411,7 @@ class MemoryReader:
         parsed_items = []
         for i in range(0, len(inventory_items), 2):  # 아이템 ID + 개수
             item_id = inventory_items[i]
-            item_name = ITEM_ID_TO_NAME.get(item_id, f"UNKNOWN_ITEM_{item_id}")
+            item_name = ITEMS.names[item_id]
             item_count = inventory_items[i + 1]
             parsed_items.append({"name": item_name, "count": item_count})
 
@@ -369,7 +421,7 @@ class MemoryReader:
         for i in range(1, party_count + 1):
             species_id = self.read_memory(f"wPartyMon{i}")
             party_pokemon.append({
-                "species": POKEMON_ID_TO_NAME.get(species_id, f"UNKNOWN_POKEMON_{species_id}"),
+                "species": POKEMON.names[species_id],
                 "level": self.read_memory(f"wPartyMon{i}Level"),
                 "hp": self.read_memory_word(f"wPartyMon{i}HP"),
                 "max_hp": self.read_memory_word(f"wPartyMon{i}MaxHP"),
@@ -381,7 +433,7 @@ class MemoryReader:
         if self.read_memory("wIsInBattle") > 0:
             enemy_species_id = self.read_memory("wEnemyMonSpecies")
             enemy_pokemon = {
-                "species": POKEMON_ID_TO_NAME.get(enemy_species_id, f"UNKNOWN_POKEMON_{enemy_species_id}"),
+                "species": POKEMON.names[enemy_species_id],
                 "level": self.read_memory("wEnemyMonLevel"),
                 "hp": self.read_memory_word("wEnemyMonHP"),
                 "max_hp": self.read_memory_word("wEnemyMonMaxHP"),
@@ -400,7 +452,8 @@ class MemoryReader:
                     "y": self.read_memory("wYCoord")
                 },
                 "facing_direction": facing_direction_map.get(self.read_memory("wTrainerFacingDirection"), "Unknown"),
-                "current_map": MAP_ID_TO_NAME.get(self.read_memory("wCurMap"), f"UNKNOWN_MAP_{self.read_memory('wCurMap')}")
+                "current_map": MAPS.names[self.read_memory("wCurMap")],
+                "warps": [{"index": w["index"], "x": w["x"], "y": w["y"], "dest_map": w["dest_map"]} for w in self.get_warps()]
             },
             "trainer_state": {
                 "money": self.read_bcd_money(),
@@ -0,0 +1,249 @@
+import asyncio
+import bisect
+import json
+import os
+import time
+
+# 기본 히스토그램 버킷 (초 단위 지연 시간용)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Counter:
+    """
+    단조 증가 카운터. inc()는 속성 덧셈 한 번이므로 tick 경로에서도 부담이 없습니다.
+    초당 증가율(에뮬레이터 FPS 등)은 읽는 쪽에서 계산합니다: Prometheus는 rate(), JSON 스냅샷은 rates_per_minute.
+    수집할 때 상태를 바꾸는 게이지로 만들면 스크레이프와 스냅샷이 같은 구간을 나눠 가져 둘 다 틀린 값이 됩니다.
+    """
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def collect(self):
+        return self.value
+
+
+class Gauge:
+    """ 현재 값. set_function()으로 콜백을 등록하면 수집 시점에만 값을 계산합니다. """
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def set_function(self, function):
+        self.function = function
+
+    def collect(self):
+        return self.function() if self.function is not None else self.value
+
+
+class Histogram:
+    """ 고정 버킷 히스토그램. 백분위수는 버킷 내 선형 보간으로 추정합니다. """
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        """ with metric.time(): ... 형태로 구간 시간을 기록 """
+        return _Timer(self)
+
+    def percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for i, count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else lower
+            if cumulative + count >= target and count > 0:
+                return lower + (upper - lower) * (target - cumulative) / count
+            cumulative += count
+            lower = upper
+        return lower
+
+    def collect(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+def _label_text(labels):
+    """ (("session", "1"),) -> '{session="1"}' (레이블이 없으면 빈 문자열) """
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Registry:
+    """
+    이름과 레이블로 메트릭을 등록/조회하고 Prometheus 텍스트 형식이나 JSON 스냅샷으로 내보냅니다.
+    레이블이 다른 시리즈는 같은 메트릭으로 묶여 나가므로 PromQL에서 sum by (session) 등으로 집계할 수 있습니다.
+    JSON 스냅샷의 키는 'name{key="value"}' 형식의 시리즈 이름입니다.
+    """
+    def __init__(self):
+        self.metrics = {}  # 시리즈 이름 -> 메트릭
+
+    def _get_or_create(self, cls, name, help_text, labels=None, **kwargs):
+        labels = tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+        series = name + _label_text(labels)
+        metric = self.metrics.get(series)
+        if metric is None:
+            metric = cls(name, help_text, labels, **kwargs)
+            self.metrics[series] = metric
+        return metric
+
+    def counter(self, name, help_text="", labels=None):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text="", labels=None):
+        return self._get_or_create(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS, labels=None):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render_prometheus(self):
+        # 텍스트 형식은 같은 이름의 시리즈가 HELP/TYPE 한 번 아래에 모여 있어야 함
+        families = {}
+        for metric in self.metrics.values():
+            families.setdefault(metric.name, []).append(metric)
+        lines = []
+        for name, metrics in families.items():
+            lines.append(f"# HELP {name} {metrics[0].help}")
+            lines.append(f"# TYPE {name} {metrics[0].kind}")
+            for metric in metrics:
+                labels = _label_text(metric.labels)
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, metric.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_label_text(metric.labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_label_text(metric.labels + (('le', '+Inf'),))} {metric.count}")
+                    lines.append(f"{name}_sum{labels} {metric.sum}")
+                    lines.append(f"{name}_count{labels} {metric.count}")
+                else:
+                    lines.append(f"{name}{labels} {metric.collect()}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        return {series: metric.collect() for series, metric in self.metrics.items()}
+
+
+REGISTRY = Registry()
+
+
+def get_rss_bytes():
+    """ 현재 프로세스의 RSS (Linux는 /proc, 그 외는 최대 RSS) """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+REGISTRY.gauge("process_resident_memory_bytes", "Resident memory size in bytes").set_function(get_rss_bytes)
+
+
+async def start_metrics_server(registry=REGISTRY, host="127.0.0.1", port=9100, profiler=None):
+    """
+    /metrics (Prometheus 텍스트 형식)와 /metrics.json을 제공하는 로컬 HTTP 서버를 시작합니다.
+    같은 이벤트 루프에서 동작하므로 수집은 스크레이프 시점에만 일어납니다.
+    profiler(SamplingProfiler)를 넘기면 /profile/start, /profile/stop (POST)과
+    /profile (지금까지의 collapsed stack)도 제공합니다.
+    """
+    from aiohttp import web
+
+    async def metrics_handler(request):
+        return web.Response(text=registry.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    async def json_handler(request):
+        return web.json_response(registry.snapshot())
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    app.router.add_get("/metrics.json", json_handler)
+    if profiler is not None:
+        async def profile_start_handler(request):
+            profiler.start()
+            return web.json_response({"running": profiler.running})
+
+        async def profile_stop_handler(request):
+            profiler.stop()
+            return web.json_response({"running": profiler.running, "samples": dict(profiler.subsystems)})
+
+        async def profile_handler(request):
+            return web.Response(text=profiler.collapsed(), content_type="text/plain", charset="utf-8")
+
+        app.router.add_post("/profile/start", profile_start_handler)
+        app.router.add_post("/profile/stop", profile_stop_handler)
+        app.router.add_get("/profile", profile_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    from logs import get_logger
+    get_logger("metrics").info("Metrics available at http://%s:%d/metrics", host, port)
+    return runner
+
+
+async def write_snapshots(path, interval=60.0, registry=REGISTRY):
+    """
+    interval초마다 JSON 스냅샷을 한 줄씩 path에 추가합니다.
+    카운터는 직전 스냅샷 대비 분당 증가율(rates_per_minute)도 함께 기록합니다.
+    """
+    previous = None
+    previous_time = None
+    while True:
+        await asyncio.sleep(interval)
+        now = time.time()
+        snapshot = registry.snapshot()
+        rates = {}
+        if previous is not None:
+            elapsed = now - previous_time
+            for name, metric in registry.metrics.items():
+                if isinstance(metric, Counter) and name in previous and elapsed > 0:
+                    rates[name] = (snapshot[name] - previous[name]) * 60.0 / elapsed
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": now, "metrics": snapshot, "rates_per_minute": rates}) + "\n")
+        previous = snapshot
+        previous_time = now
@@ -0,0 +1,199 @@
+import asyncio
+from collections import deque
+
+# 화면(wTileMap)은 20x18 타일이고, 플레이어는 2x2 타일(16x16 픽셀) 블록 단위로 움직이므로
+# 한 화면은 10x9 블록의 이동 격자가 됩니다.
+SCREEN_BLOCK_WIDTH = 10
+SCREEN_BLOCK_HEIGHT = 9
+# 플레이어는 항상 화면 블록 (4, 4)에 그려집니다.
+PLAYER_BLOCK_X = 4
+PLAYER_BLOCK_Y = 4
+
+# (버튼, dx, dy)
+DIRECTIONS = (("up", 0, -1), ("down", 0, 1), ("left", -1, 0), ("right", 1, 0))
+
+STEP_SETTLE_SECONDS = 0.35  # 한 칸 이동(16프레임) + 입력 처리 여유
+MAX_BLOCKED_RETRIES = 2     # 같은 칸으로 이동이 이 횟수만큼 실패하면 막힌 칸으로 간주
+
+
+def bfs_path(start, goal, walkable):
+    """
+    start에서 goal까지 BFS로 경로를 계산합니다 (화면 격자와 월드 모델의 누적 지도가 함께 사용).
+    walkable(x, y)가 통과 가능 여부를 판정합니다.
+    목적지에 도달할 수 있으면 그 경로를, 아니면 목적지에 가장 가까운(맨해튼 거리)
+    도달 가능한 칸까지의 경로를 버튼 리스트로 반환합니다. 움직일 수 없으면 빈 리스트.
+    """
+    def distance(pos):
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+    came_from = {start: None}
+    queue = deque([start])
+    best = start
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            best = current
+            break
+        if distance(current) < distance(best):
+            best = current
+        for button, dx, dy in DIRECTIONS:
+            nxt = (current[0] + dx, current[1] + dy)
+            if nxt in came_from or not walkable(*nxt):
+                continue
+            came_from[nxt] = (current, button)
+            queue.append(nxt)
+
+    path = []
+    node = best
+    while came_from[node] is not None:
+        node, button = came_from[node]
+        path.append(button)
+    path.reverse()
+    return path
+
+
+class PathFinder:
+    """
+    현재 화면의 충돌 정보(wTileMap + 통과 가능한 타일 리스트), OAM 스프라이트 위치,
+    워프 데이터를 이용해 맵 좌표 기준의 경로를 BFS로 계산합니다.
+    월드 모델이 주어지면 화면 밖 목적지도 지금까지 관측한 지도 위에서 계산합니다.
+    """
+    def __init__(self, memory_reader, world=None):
+        self.memory_reader = memory_reader
+        self.world = world  # WorldModel: 있으면 관측을 누적하고 화면 밖 목적지는 누적 지도로 계산
+
+    def get_player_position(self):
+        """ 현재 플레이어의 맵 좌표 (x, y)와 맵 ID를 반환 """
+        return (self.memory_reader.read_memory("wXCoord"),
+                self.memory_reader.read_memory("wYCoord"),
+                self.memory_reader.read_memory("wCurMap"))
+
+    def read_screen_collision(self):
+        """
+        10x9 블록 격자의 지형 통과 가능 여부와 판정에 쓴 타일 번호를 2차원 리스트(행: Y, 열: X)로 반환합니다.
+        각 블록의 충돌 판정은 게임과 동일하게 블록의 왼쪽 아래 타일 (x*2, y*2+1)로 합니다.
+        스프라이트는 반영하지 않습니다 (NPC는 움직이므로 월드 모델에 누적하지 않음).
+        """
+        width = SCREEN_BLOCK_WIDTH * 2
+        bgmap = self.memory_reader.read_memory_bytes("wTileMap", width * SCREEN_BLOCK_HEIGHT * 2)
+        passable = set(self.memory_reader.get_passable_tiles())
+
+        grid = []
+        tiles = []
+        for by in range(SCREEN_BLOCK_HEIGHT):
+            tile_row = [bgmap[(by * 2 + 1) * width + bx * 2] for bx in range(SCREEN_BLOCK_WIDTH)]
+            tiles.append(tile_row)
+            grid.append([tile in passable for tile in tile_row])
+        return grid, tiles
+
+    def get_sprite_blocks(self):
+        """ NPC 스프라이트가 있는 화면 블록 좌표 집합 (플레이어 제외) """
+        blocks = set()
+        for oam in self.memory_reader.get_oam_positions():
+            if oam["icon"] == '◉':
+                continue
+            bx = oam["x"] // 2
+            by = (oam["y"] + 1) // 2
+            if 0 <= bx < SCREEN_BLOCK_WIDTH and 0 <= by < SCREEN_BLOCK_HEIGHT:
+                blocks.add((bx, by))
+        return blocks
+
+    def get_walkable_grid(self):
+        """
+        10x9 블록 격자의 통과 가능 여부를 2차원 리스트(행: Y, 열: X)로 반환합니다.
+        NPC 스프라이트가 있는 블록은 막힌 것으로 처리합니다.
+        """
+        grid, _ = self.read_screen_collision()
+        for bx, by in self.get_sprite_blocks():
+            grid[by][bx] = False
+        return grid
+
+    def observe(self):
+        """ 현재 화면을 월드 모델에 기록 (월드 모델이 없으면 아무것도 하지 않음) """
+        if self.world is None:
+            return
+        x, y, map_id = self.get_player_position()
+        grid, tiles = self.read_screen_collision()
+        self.world.observe(map_id, x, y, grid, tiles, (PLAYER_BLOCK_X, PLAYER_BLOCK_Y))
+
+    def find_path(self, grid, start, goal, blocked=(), allow_blocked_goal=False):
+        """
+        grid: get_walkable_grid()의 결과
+        start, goal: 화면 블록 좌표 (x, y). goal은 화면 밖이어도 됩니다.
+        blocked: 추가로 막힌 것으로 간주할 블록 좌표 집합
+        allow_blocked_goal: 목적지 자체가 통과 불가 타일이어도 도착을 허용 (문, 계단 등 워프)
+
+        목적지에 도달할 수 있으면 그 경로를, 아니면 목적지에 가장 가까운(맨해튼 거리)
+        도달 가능한 블록까지의 경로를 버튼 리스트로 반환합니다. 움직일 수 없으면 빈 리스트.
+        """
+        def walkable(x, y):
+            if not (0 <= x < SCREEN_BLOCK_WIDTH and 0 <= y < SCREEN_BLOCK_HEIGHT):
+                return False
+            if (x, y) in blocked:
+                return False
+            if allow_blocked_goal and (x, y) == goal:
+                return True
+            return grid[y][x]
+
+        return bfs_path(start, goal, walkable)
+
+    def plan(self, target_x, target_y, blocked=(), allow_blocked_goal=False):
+        """
+        맵 좌표 (target_x, target_y)까지의 경로를 계산합니다.
+        blocked는 맵 좌표 기준 막힌 칸의 집합입니다.
+        """
+        x, y, map_id = self.get_player_position()
+        offset_x = x - PLAYER_BLOCK_X
+        offset_y = y - PLAYER_BLOCK_Y
+        goal = (target_x - offset_x, target_y - offset_y)
+        on_screen = 0 <= goal[0] < SCREEN_BLOCK_WIDTH and 0 <= goal[1] < SCREEN_BLOCK_HEIGHT
+        if self.world is not None:
+            self.observe()
+            if not on_screen:
+                # 화면 밖 목적지: 누적 지도에서 계산 (현재 화면의 NPC 위치는 막힌 칸으로)
+                sprites = {(bx + offset_x, by + offset_y) for bx, by in self.get_sprite_blocks()}
+                return self.world.find_path(map_id, (x, y), (target_x, target_y),
+                                            set(blocked) | sprites, allow_blocked_goal)
+        screen_blocked = {(bx - offset_x, by - offset_y) for bx, by in blocked}
+        return self.find_path(self.get_walkable_grid(), (PLAYER_BLOCK_X, PLAYER_BLOCK_Y), goal,
+                              screen_blocked, allow_blocked_goal)
+
+
+async def walk_to(pathfinder, command_queue, target_x, target_y, allow_blocked_goal=False, max_steps=200):
+    """
+    경로를 로컬에서 실행합니다. 한 칸씩 버튼을 보내고 실제 좌표를 확인해
+    막히면(NPC 이동 등) 해당 칸을 막힌 칸으로 기록하고 경로를 다시 계산합니다.
+
+    Returns:
+        str: 실행 결과 요약 (LLM 메모용)
+    """
+    blocked = set()
+    failures = {}
+    steps = 0
+    _, _, start_map = pathfinder.get_player_position()
+    while steps < max_steps:
+        x, y, current_map = pathfinder.get_player_position()
+        if current_map != start_map:
+            return f"entered a new map after {steps} steps"
+        if (x, y) == (target_x, target_y):
+            return f"arrived at ({target_x}, {target_y}) in {steps} steps"
+
+        path = pathfinder.plan(target_x, target_y, blocked, allow_blocked_goal)
+        if not path:
+            return f"no path from ({x}, {y}) to ({target_x}, {target_y})"
+
+        button = path[0]
+        _, dx, dy = next(d for d in DIRECTIONS if d[0] == button)
+        await command_queue.put(button)
+        await command_queue.join()
+        await asyncio.sleep(STEP_SETTLE_SECONDS)
+        steps += 1
+
+        new_x, new_y, new_map = pathfinder.get_player_position()
+        if (new_x, new_y) == (x, y) and new_map == current_map:
+            # 방향 전환만 되었거나 막힌 경우
+            cell = (x + dx, y + dy)
+            failures[cell] = failures.get(cell, 0) + 1
+            if failures[cell] >= MAX_BLOCKED_RETRIES:
+                blocked.add(cell)
+    return f"gave up after {max_steps} steps"
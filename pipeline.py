@@ -0,0 +1,116 @@
+import asyncio
+from contextlib import contextmanager
+
+from llm_client import encode_screen
+from stuck_detector import perceptual_hash, text_hash
+
+SETTLE_TICKS = 20  # 마지막 버튼 입력 후 화면이 안정될 때까지 기다리는 프레임 수 (한 칸 이동 = 16프레임)
+
+
+class PreparedStep:
+    """ LLM에 바로 제출할 수 있도록 준비된 한 스텝의 입력 """
+    def __init__(self, game_state, screen_ascii_data, image_data, generation, screen_hash=0, window_text_hash=0, semantic_screen=None):
+        self.game_state = game_state
+        self.screen_ascii_data = screen_ascii_data
+        self.image_data = image_data
+        self.generation = generation
+        self.screen_hash = screen_hash              # 반복 감지용 화면 perceptual hash
+        self.window_text_hash = window_text_hash
+        self.semantic_screen = semantic_screen      # TileClassifier의 의미 격자 (필드에서만)
+
+
+class StepPipeline:
+    """
+    다음 스텝의 상태 스냅샷, 화면 인코딩을 현재 LLM 생성 및 버튼 실행과 겹쳐서 준비합니다.
+
+    - game_loop는 매 프레임 tick()을 호출하고, 버튼을 누를 때마다 on_button()을 호출합니다.
+    - 버튼 입력 후 SETTLE_TICKS 프레임이 지나면 스냅샷을 찍고, PNG 인코딩은 스레드에서 수행합니다.
+    - LLM이 생성 중인 동안에도 스냅샷을 미리 준비해 두므로, 응답에 버튼 입력이 없으면
+      다음 스텝을 즉시 제출할 수 있습니다. 버튼 입력이 있으면 준비된 스냅샷은 버려집니다.
+    - 준비 슬롯은 하나뿐이라 항상 최신 상태만 남습니다. 로컬 실행(/go_to, 전투, 대화) 중에는
+      hold()로 스냅샷을 멈추고, 버튼 없이 상태가 바뀌면(전투 시작 등) invalidate()로 버립니다.
+    - 찍어 둔 세이브스테이트와 실제 게임이 어긋나면 안 될 때(/try 롤아웃)는 pause()로 에뮬레이터를 멈춥니다.
+    - classifier가 있으면 필드 화면의 의미 격자를 함께 만들고, encode_images가 False면 PNG 인코딩을 건너뜁니다.
+    """
+    def __init__(self, pyboy, memory_reader, settle_ticks=SETTLE_TICKS, classifier=None, encode_images=True):
+        self.pyboy = pyboy
+        self.memory_reader = memory_reader
+        self.classifier = classifier
+        self.encode_images = encode_images
+        self.settle_ticks = settle_ticks
+        self.generation = 0  # 버튼 입력마다 증가
+        self.settled_ticks = 0
+        self.prepared = None  # asyncio.Task[PreparedStep]
+        self.ready = asyncio.Event()
+        self.holds = 0  # 0보다 크면 스냅샷을 찍지 않음
+        self.pauses = 0  # 0보다 크면 game_loop이 tick하지 않음
+
+    def on_button(self):
+        """ 버튼 입력으로 게임 상태가 바뀌므로 준비된 스냅샷을 무효화 """
+        self.generation += 1
+        self.settled_ticks = 0
+        self.prepared = None
+        self.ready.clear()
+
+    invalidate = on_button
+
+    @contextmanager
+    def hold(self):
+        """ 로컬 실행 중에는 다음 스텝 스냅샷을 준비하지 않음 """
+        self.holds += 1
+        try:
+            yield
+        finally:
+            self.holds -= 1
+
+    @contextmanager
+    def pause(self):
+        """ 이 구간 동안 game_loop이 프레임을 진행하지 않음 (게임 상태가 그대로 유지됨) """
+        self.pauses += 1
+        try:
+            yield
+        finally:
+            self.pauses -= 1
+
+    def tick(self):
+        """ 화면이 안정되었고 준비된 스냅샷이 없으면 새 스냅샷을 찍음 (game_loop에서 매 프레임 호출) """
+        if self.prepared is not None or self.holds:
+            return
+        self.settled_ticks += 1
+        if self.settled_ticks < self.settle_ticks:
+            return
+        game_state = self.memory_reader.get_game_state()
+        screen_ascii_data = self.memory_reader.generate_overworld_markdown_from_memory()
+        window_text = self.memory_reader.read_window_text() if game_state["current_mode"]["isTextBoxVisible"] else ""
+        semantic_screen = None
+        if self.classifier is not None and game_state["current_mode"]["overworld"]:
+            semantic_screen = self.classifier.semantic_screen()
+        frame = self.pyboy.screen.image.copy()  # 인코딩 중 다음 프레임이 그려지지 않도록 복사
+        self.prepared = asyncio.create_task(self._encode(game_state, screen_ascii_data, frame, self.generation,
+                                                         text_hash(window_text), semantic_screen))
+        self.ready.set()
+
+    async def _encode(self, game_state, screen_ascii_data, frame, generation, window_text_hash, semantic_screen):
+        encode = encode_screen if self.encode_images else lambda frame: None
+        image_data, screen_hash = await asyncio.to_thread(lambda: (encode(frame), perceptual_hash(frame)))
+        return PreparedStep(game_state, screen_ascii_data, image_data, generation, screen_hash, window_text_hash,
+                            semantic_screen)
+
+    async def next_step(self):
+        """
+        다음 스텝 입력을 반환합니다. 반환된 스냅샷은 소비된 것으로 처리되어,
+        생성이 진행되는 동안 다음 스냅샷이 다시 준비됩니다.
+        """
+        while True:
+            await self.ready.wait()
+            task = self.prepared
+            if task is None:
+                # set() 뒤 깨어나기 전에 on_button()/invalidate()가 스냅샷을 버림
+                continue
+            step = await task
+            if task is self.prepared and step.generation == self.generation:
+                self.prepared = None
+                self.settled_ticks = 0
+                self.ready.clear()
+                return step
+            # 인코딩 중 버튼이 눌렸으면 다음 스냅샷을 기다림
@@ -0,0 +1,212 @@
+"""
+샘플링 프로파일러
+
+별도 스레드가 interval초마다 sys._current_frames()로 모든 스레드의 스택을 읽어,
+collapsed stack("a;b;c 개수", flamegraph.pl / speedscope 입력 형식)과 서브시스템별 샘플 수를 모읍니다.
+대상 코드에는 계측이 없고 샘플마다 스택을 한 번 훑을 뿐이라, 낮은 샘플링 주기로는 상시 켜 둘 수 있습니다.
+
+서브시스템은 스택의 가장 안쪽 프레임부터 SUBSYSTEM_FILES 규칙으로 정합니다.
+PyBoy의 tick처럼 파이썬 프레임이 보이지 않는 C 코드는 section()으로 표시한 구간으로 구분합니다.
+
+켜고 끄기: --profile, SIGUSR2 (toggle), 메트릭 서버의 /profile/start, /profile/stop
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+from logs import get_logger
+from metrics import REGISTRY
+
+log = get_logger("profiler")
+
+SUBSYSTEM_EMULATOR = "emulator"
+SUBSYSTEM_STATE = "state_extraction"
+SUBSYSTEM_HOOKS = "hooks"
+SUBSYSTEM_ENCODING = "encoding"
+SUBSYSTEM_LLM = "llm_client"
+SUBSYSTEM_ASYNCIO = "asyncio"
+SUBSYSTEM_IDLE = "idle"
+SUBSYSTEM_OTHER = "other"
+SUBSYSTEMS = (SUBSYSTEM_EMULATOR, SUBSYSTEM_STATE, SUBSYSTEM_HOOKS, SUBSYSTEM_ENCODING, SUBSYSTEM_LLM,
+              SUBSYSTEM_ASYNCIO, SUBSYSTEM_IDLE, SUBSYSTEM_OTHER)
+
+# "파일 경로:함수 이름"의 일부 -> 서브시스템. 가장 안쪽 프레임부터 처음 맞는 규칙을 씀
+SUBSYSTEM_FILES = (
+    ("llm_client.py:encode_screen", SUBSYSTEM_ENCODING),
+    ("llm_client.py:capture_screen", SUBSYSTEM_ENCODING),
+    ("gb_hooker.py", SUBSYSTEM_HOOKS),
+    ("memory_reader.py", SUBSYSTEM_STATE),
+    ("pathfinder.py", SUBSYSTEM_STATE),
+    ("world_model.py", SUBSYSTEM_STATE),
+    ("text_codec.py", SUBSYSTEM_STATE),
+    ("tile_classifier.py", SUBSYSTEM_STATE),
+    ("PIL", SUBSYSTEM_ENCODING),
+    ("llm_client.py", SUBSYSTEM_LLM),
+    ("inference_scheduler.py", SUBSYSTEM_LLM),
+    ("ollama", SUBSYSTEM_LLM),
+    ("httpx", SUBSYSTEM_LLM),
+    ("httpcore", SUBSYSTEM_LLM),
+    ("pyboy", SUBSYSTEM_EMULATOR),
+)
+# 가장 안쪽 프레임이 이 함수면 기다리는 중 (이벤트 루프의 select, 스레드 풀의 대기)
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_worker", "sleep", "accept", "_wait_for_tstate_lock"}
+
+DEFAULT_INTERVAL = 0.01  # 100Hz. 상시 사용은 0.05~0.1 권장
+MAX_DEPTH = 64
+
+PROFILE_SAMPLES = REGISTRY.counter("profiler_samples_total", "Thread stacks sampled by the profiler")
+PROFILE_OVERHEAD = REGISTRY.counter("profiler_overhead_seconds_total", "Time the profiler thread spent walking stacks")
+SUBSYSTEM_SAMPLES = {name: REGISTRY.counter(f"profiler_samples_{name}_total", f"Profiler samples attributed to {name}")
+                     for name in SUBSYSTEMS}
+
+_sections = {}  # 스레드 ID -> 현재 section 이름
+
+
+class section:
+    """
+    with section(SUBSYSTEM_EMULATOR): pyboy.tick()
+    처럼 파이썬 프레임이 보이지 않는 구간의 서브시스템을 표시합니다. await를 감싸면 안 됩니다.
+    """
+    __slots__ = ("name", "previous", "thread")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        self.previous = _sections.get(self.thread)
+        _sections[self.thread] = self.name
+
+    def __exit__(self, *exc):
+        _sections[self.thread] = self.previous
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def classify(frames, marked):
+    """ 안쪽부터 정렬된 프레임 목록과 section 표시로 서브시스템을 정함 """
+    for frame in frames:
+        location = f"{frame.f_code.co_filename}:{frame.f_code.co_name}"
+        for pattern, subsystem in SUBSYSTEM_FILES:
+            if pattern in location:
+                return subsystem
+    if marked is not None:
+        return marked
+    if frames and frames[0].f_code.co_name in IDLE_FUNCTIONS:
+        return SUBSYSTEM_IDLE
+    if any("asyncio" in frame.f_code.co_filename for frame in frames):
+        return SUBSYSTEM_ASYNCIO
+    return SUBSYSTEM_OTHER
+
+
+class SamplingProfiler:
+    def __init__(self, interval=DEFAULT_INTERVAL, output=None, include_idle=False):
+        self.interval = interval
+        self.output = output            # stop() 시 collapsed stack을 쓸 파일 (None이면 쓰지 않음)
+        self.include_idle = include_idle
+        self.stacks = Counter()         # "thread;a;b;c" -> 샘플 수
+        self.subsystems = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+        log.info("Sampling every %.0fms", self.interval * 1000)
+
+    def stop(self):
+        """ 샘플링을 멈추고 보고서를 출력, output이 있으면 collapsed stack을 씀 """
+        if not self.running:
+            return
+        self._stop.set()
+        self.thread.join()
+        self.thread = None
+        self.report()
+        if self.output:
+            self.write(self.output)
+
+    def toggle(self):
+        self.stop() if self.running else self.start()
+
+    def reset(self):
+        self.stacks.clear()
+        self.subsystems.clear()
+        self.samples = 0
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < MAX_DEPTH:
+                    frames.append(frame)
+                    frame = frame.f_back
+                marked = _sections.get(thread_id)
+                subsystem = classify(frames, marked)
+                if subsystem == SUBSYSTEM_IDLE and not self.include_idle:
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                labels = [names.get(thread_id, str(thread_id))] + [_frame_label(f) for f in reversed(frames)]
+                if marked is not None:
+                    labels.append(f"[{marked}]")
+                self.stacks[";".join(labels)] += 1
+                self.subsystems[subsystem] += 1
+                self.samples += 1
+                PROFILE_SAMPLES.inc()
+                SUBSYSTEM_SAMPLES[subsystem].inc()
+            PROFILE_OVERHEAD.inc(time.perf_counter() - started)
+
+    def collapsed(self):
+        """ flamegraph.pl / speedscope가 읽는 collapsed stack 텍스트 """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        log.info("Wrote %d stacks to %s", len(self.stacks), path)
+
+    def report(self):
+        total = sum(self.subsystems.values())
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        log.info("%d samples over %.1fs", total, elapsed)
+        if not total:
+            return
+        for subsystem, count in self.subsystems.most_common():
+            log.info("%-18s %7d %5.1f%%", subsystem, count, 100 * count / total)
+
+
+def install_signal_toggle(profiler, loop, signum=None):
+    """
+    SIGUSR2(기본)를 받으면 프로파일러를 켜고 끔. 시그널이 없는 플랫폼에서는 False
+    핸들러는 loop.add_signal_handler로 이벤트 루프에서 실행되므로, 시그널이 락을 잡은 코드 중간에 끼어들지 않습니다.
+    이를 지원하지 않는 루프(Windows 등)에서만 signal.signal로 등록합니다.
+    """
+    signum = signum or getattr(signal, "SIGUSR2", None)
+    if signum is None:
+        return False
+    try:
+        loop.add_signal_handler(signum, profiler.toggle)
+    except NotImplementedError:
+        signal.signal(signum, lambda *_: profiler.toggle())
+    return True
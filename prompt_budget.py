@@ -0,0 +1,128 @@
+"""
+프롬프트 토큰 예산
+
+프롬프트를 우선순위가 있는 구간(Section)으로 나누고, 추정 토큰 수의 합이 예산 안에 들어오도록
+우선순위가 낮은 구간부터 줄이거나(오래된 줄부터 생략) 뺍니다.
+무엇을 얼마나 줄였는지는 보고서로 남기고, 필수 구간만으로도 예산을 넘으면 경고를 출력합니다.
+"""
+from logs import get_logger
+from metrics import REGISTRY
+from state_codec import estimate_tokens
+
+REQUIRED = 0  # 절대 줄이지 않는 구간. 숫자가 클수록 먼저 줄이거나 뺍니다.
+
+# 줄이는 방식
+KEEP_TAIL = "tail"   # 최근 줄을 남기고 오래된 줄부터 생략 (메모, 대화 기록)
+KEEP_HEAD = "head"   # 앞쪽 줄을 남기고 뒤쪽부터 생략
+DROP = "drop"        # 통째로만 뺄 수 있음
+
+DEFAULT_BUDGET = 6144  # 프롬프트 토큰 예산 (모델 컨텍스트에서 이미지와 응답 몫을 뺀 값)
+
+log = get_logger("budget")
+
+PROMPT_ESTIMATED_TOKENS = REGISTRY.histogram("prompt_estimated_tokens", "Estimated prompt tokens after budgeting",
+                                             buckets=(512, 1024, 2048, 3072, 4096, 6144, 8192, 16384))
+PROMPT_SECTIONS_CUT = REGISTRY.counter("prompt_sections_cut_total", "Prompt sections truncated or dropped by the budgeter")
+PROMPT_OVER_BUDGET = REGISTRY.counter("prompt_over_budget_total", "Prompts whose required sections alone exceeded the budget")
+
+
+class Section:
+    """
+    프롬프트의 한 구간.
+
+    title: 구간 제목 줄 (줄여도 항상 남음, 없으면 None)
+    lines: 본문 줄 리스트
+    priority: REQUIRED(0)이면 유지, 클수록 먼저 줄임
+    shrink: KEEP_TAIL, KEEP_HEAD, DROP 중 하나
+    """
+    def __init__(self, name, lines, priority=REQUIRED, shrink=DROP, title=None, trailer="\n"):
+        self.name = name
+        self.title = title
+        self.lines = list(lines)
+        self.priority = priority
+        self.shrink = shrink
+        self.trailer = trailer
+        self.kept = len(self.lines)  # 남길 본문 줄 수
+        self.dropped = False
+
+    @classmethod
+    def text(cls, name, text, priority=REQUIRED, shrink=DROP):
+        """ 제목 없이 고정 문자열 하나로 된 구간 """
+        return cls(name, [text], priority, shrink, trailer="")
+
+    def render(self):
+        if self.dropped:
+            return ""
+        omitted = len(self.lines) - self.kept
+        if self.shrink == KEEP_HEAD:
+            body = self.lines[:self.kept]
+            if omitted:
+                body = body + [f"({omitted} more lines omitted)"]
+        else:
+            body = self.lines[omitted:]
+            if omitted:
+                body = [f"({omitted} earlier lines omitted)"] + body
+        parts = ([self.title] if self.title is not None else []) + body
+        return "\n".join(parts) + self.trailer
+
+    def tokens(self):
+        return estimate_tokens(self.render())
+
+
+class PromptBudget:
+    """
+    fit()으로 구간들을 예산에 맞춰 하나의 프롬프트로 합칩니다.
+    last_report에는 줄이거나 뺀 구간마다 (이름, 동작, 줄이기 전 토큰, 줄인 뒤 토큰)이 남습니다.
+    """
+    def __init__(self, budget_tokens=DEFAULT_BUDGET):
+        self.budget_tokens = budget_tokens
+        self.last_report = []
+        self.last_tokens = 0
+
+    def fit(self, sections):
+        report = []
+        costs = [section.tokens() for section in sections]
+        total = sum(costs)
+
+        # 우선순위 숫자가 큰 구간부터, 같은 우선순위면 뒤쪽 구간부터 줄임
+        order = sorted((i for i, s in enumerate(sections) if s.priority != REQUIRED),
+                       key=lambda i: (-sections[i].priority, -i))
+        for i in order:
+            if total <= self.budget_tokens:
+                break
+            section = sections[i]
+            before = costs[i]
+            if section.shrink != DROP:
+                self._truncate(section, before - (total - self.budget_tokens))
+                action = "truncated"
+            if section.shrink == DROP or section.kept == 0:
+                section.dropped = True
+                action = "dropped"
+            costs[i] = section.tokens()
+            total += costs[i] - before
+            report.append((section.name, action, before, costs[i]))
+
+        self.last_report = report
+        self.last_tokens = total
+        PROMPT_ESTIMATED_TOKENS.observe(total)
+        if report:
+            PROMPT_SECTIONS_CUT.inc(len(report))
+            cuts = ", ".join(f"{name} {action} {before}->{after}" for name, action, before, after in report)
+            log.info("%d/%d tokens: %s", total, self.budget_tokens, cuts)
+        if total > self.budget_tokens:
+            PROMPT_OVER_BUDGET.inc()
+            log.warning("Prompt exceeds budget even after cuts: %d/%d tokens", total, self.budget_tokens)
+        return "".join(section.render() for section in sections)
+
+    @staticmethod
+    def _truncate(section, target_tokens):
+        """ 구간이 target_tokens 이하가 되는 가장 많은 줄 수를 이분 탐색으로 찾음 (안 되면 0줄) """
+        low, high = 0, section.kept
+        while low < high:
+            middle = (low + high + 1) // 2
+            section.kept = middle
+            if section.tokens() <= target_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        section.kept = low
@@ -0,0 +1,238 @@
+"""
+병렬 세이브스테이트 롤아웃
+
+현재 게임의 세이브스테이트를 헤드리스 에뮬레이터 작업 프로세스들에 나눠 주고,
+후보 버튼 시퀀스 K개를 최대 속도로 동시에 실행한 뒤 결과 상태(맵, 좌표, HP, 출력된 텍스트, 전투)를 비교해 순위를 매깁니다.
+LLM에게 묻고 결과를 기다리는 대신, 짧은 범위의 후보를 실제로 돌려 보고 가장 나은 것을 고를 수 있습니다.
+
+- 작업 프로세스는 시작할 때 PyBoy와 GBHooker를 한 번 만들고, 롤아웃마다 세이브스테이트만 불러옵니다.
+- 작업 프로세스는 결과 상태(Outcome)만 돌려주고 점수는 부모 프로세스에서 매기므로,
+  점수 함수는 pickle할 수 없는 람다나 클로저여도 됩니다.
+- 메인 프로세스의 이벤트 루프는 기다리지 않고, 작업 프로세스는 모델이 생성하는 동안 남는 코어를 씁니다.
+  /try는 순위를 매기는 동안 게임 루프를 pipeline.pause()로 멈춰, 승자를 점수를 매긴 상태에서 그대로 실행합니다.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from consts import MAPS
+from gb_hooker import EVENT_ITEM_RECEIVED, EVENT_TEXT_PRINTED, GBHooker
+from logs import get_logger
+from metrics import REGISTRY
+
+log = get_logger("rollout")
+
+ALLOWED_BUTTONS = ("a", "b", "start", "up", "down", "left", "right")  # /joypad와 /try가 받는 버튼 (select는 프롬프트에서 금지)
+BUTTON_HOLD_FRAMES = 10     # main.game_loop과 같은 버튼 유지 프레임
+FRAMES_PER_BUTTON = 24      # 한 칸 이동(16프레임)이 끝나고 다음 입력을 받을 때까지 (play()도 같은 간격으로 누름)
+SETTLE_FRAMES = 60          # 마지막 입력 뒤 문이나 대화가 반영될 때까지
+FRAME_POLL_SECONDS = 1 / 120
+MAX_SEQUENCE_LENGTH = 32
+MAX_CANDIDATES = 8
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 2)  # 게임 루프와 Ollama 몫을 남김
+
+# default_score 가중치
+MAP_CHANGE_SCORE = 100.0
+TEXT_SCORE = 20.0
+ITEM_SCORE = 50.0
+BATTLE_SCORE = -10.0
+HP_LOSS_SCORE = -50.0       # 파티 최대 HP 대비 잃은 비율에 곱함
+
+ROLLOUTS = REGISTRY.counter("rollouts_total", "Candidate input sequences evaluated in rollout workers")
+ROLLOUT_FRAMES = REGISTRY.counter("rollout_frames_total", "Frames emulated by rollout workers")
+ROLLOUT_SECONDS = REGISTRY.histogram("rollout_batch_seconds", "Wall time to evaluate and rank one batch of candidates")
+
+_worker = None  # 작업 프로세스마다 하나
+
+
+class Outcome:
+    """ 롤아웃이 끝난 시점의 게임 상태 요약 (작업 프로세스에서 부모로 pickle되어 전달) """
+    __slots__ = ("map_id", "map_name", "x", "y", "hp", "max_hp", "battle", "text_box", "events", "frames")
+
+    def __init__(self, map_id, map_name, x, y, hp, max_hp, battle, text_box, events=(), frames=0):
+        self.map_id = map_id
+        self.map_name = map_name
+        self.x = x
+        self.y = y
+        self.hp = hp                # 파티 HP 합
+        self.max_hp = max_hp
+        self.battle = battle
+        self.text_box = text_box
+        self.events = events        # 롤아웃 동안의 훅 이벤트 [(타입, 데이터)]
+        self.frames = frames
+
+    def event_types(self):
+        return {event_type for event_type, _ in self.events}
+
+    def texts(self):
+        return [data["text"] for event_type, data in self.events if event_type == EVENT_TEXT_PRINTED]
+
+    def describe(self):
+        text = f"{self.map_name} ({self.x}, {self.y}), HP {self.hp}/{self.max_hp}"
+        if self.battle:
+            text += ", in battle"
+        texts = self.texts()
+        if texts:
+            text += f', text: "{" ".join(texts)[:80]}"'
+        return text
+
+
+def decode_outcome(memory_reader, events=(), frames=0):
+    """ MemoryReader로 점수 계산에 필요한 값만 읽음 (get_game_state 전체보다 훨씬 가벼움) """
+    read = memory_reader.read_memory
+    hp = max_hp = 0
+    for i in range(1, read("wPartyCount") + 1):
+        hp += memory_reader.read_memory_word_be(f"wPartyMon{i}HP")
+        max_hp += memory_reader.read_memory_word_be(f"wPartyMon{i}MaxHP")
+    map_id = read("wCurMap")
+    return Outcome(map_id, MAPS.names[map_id], read("wXCoord"), read("wYCoord"), hp, max_hp,
+                   read("wIsInBattle") > 0, read("hWY") != 0x90, events, frames)
+
+
+def default_score(before, after):
+    """
+    새 맵 도착, 이동 거리, 새로 출력된 텍스트, 아이템 획득에 가점을 주고 전투와 HP 손실에 감점을 줍니다.
+    다른 기준이 필요하면 (before, after) -> float 함수를 RolloutPool.rank에 넘기면 됩니다.
+    """
+    score = 0.0
+    if after.map_id != before.map_id:
+        score += MAP_CHANGE_SCORE
+    else:
+        score += abs(after.x - before.x) + abs(after.y - before.y)
+    types = after.event_types()
+    if EVENT_TEXT_PRINTED in types or (after.text_box and not before.text_box):
+        score += TEXT_SCORE
+    if EVENT_ITEM_RECEIVED in types:
+        score += ITEM_SCORE
+    if after.battle and not before.battle:
+        score += BATTLE_SCORE
+    if before.max_hp:
+        score += HP_LOSS_SCORE * max(0, before.hp - after.hp) / before.max_hp
+    return score
+
+
+class RolloutResult:
+    __slots__ = ("sequence", "score", "outcome")
+
+    def __init__(self, sequence, score, outcome):
+        self.sequence = sequence
+        self.score = score
+        self.outcome = outcome
+
+    def describe(self):
+        return f"[{','.join(self.sequence)}] score {self.score:.1f} -> {self.outcome.describe()}"
+
+
+def parse_candidates(text):
+    """
+    "/try" 인자를 후보 시퀀스 목록으로 변환합니다. 후보는 |로 나누고 버튼은 쉼표로 나눕니다.
+    예: "up,up,a | [left,left]" -> [("up", "up", "a"), ("left", "left")]
+    잘못된 버튼이 있으면 ValueError
+    """
+    candidates = []
+    for part in text.split("|"):
+        buttons = tuple(b.strip().lower() for b in part.strip().strip("[]").split(",") if b.strip())
+        if not buttons:
+            continue
+        invalid = [b for b in buttons if b not in ALLOWED_BUTTONS]
+        if invalid:
+            raise ValueError(f"invalid buttons {invalid}")
+        candidates.append(buttons[:MAX_SEQUENCE_LENGTH])
+    return list(dict.fromkeys(candidates))[:MAX_CANDIDATES]
+
+
+def _init_worker(rom_path, sym_path):
+    """ 작업 프로세스 초기화: 헤드리스 PyBoy, MemoryReader, 이벤트 캡처용 GBHooker를 한 번만 만듦 """
+    global _worker
+    from pyboy import PyBoy
+
+    from memory_reader import MemoryReader
+    from symbol_parser import load_symbol_map
+
+    symbol_map = load_symbol_map(sym_path)
+    pyboy = PyBoy(rom_path, window="null")
+    pyboy.set_emulation_speed(0)
+    hooker = GBHooker(pyboy, symbol_map)
+    hooker.initHooks(None)  # 이벤트는 큐 대신 hooker.drain()으로 직접 꺼냄
+    _worker = (pyboy, MemoryReader(pyboy, symbol_map=symbol_map), hooker)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _run_rollout(state, sequence, frames_per_button, settle_frames):
+    pyboy, memory_reader, hooker = _worker
+    pyboy.load_state(BytesIO(state))
+    hooker.ring.pop_all()  # 이전 롤아웃의 이벤트를 버림
+    hooker.last_frames[:] = [-(1 << 30)] * len(hooker.last_frames)
+    for button in sequence:
+        pyboy.button(button, BUTTON_HOLD_FRAMES)
+        pyboy.tick(frames_per_button, False)
+    pyboy.tick(settle_frames, False)
+    events = [(event.type, event.data) for event in hooker.drain()]
+    return decode_outcome(memory_reader, events, len(sequence) * frames_per_button + settle_frames)
+
+
+class RolloutPool:
+    """
+    헤드리스 에뮬레이터 작업 프로세스 풀. 모든 세션이 하나를 공유합니다.
+    SDL 창과 스레드가 있는 부모를 fork하지 않도록 spawn으로 시작합니다.
+    """
+    def __init__(self, rom_path, sym_path, workers=DEFAULT_WORKERS, frames_per_button=FRAMES_PER_BUTTON,
+                 settle_frames=SETTLE_FRAMES):
+        self.workers = workers
+        self.frames_per_button = frames_per_button
+        self.settle_frames = settle_frames
+        self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker, initargs=(rom_path, sym_path))
+
+    async def warm_up(self):
+        """ 작업 프로세스를 모두 띄우고 PyBoy 부팅이 끝날 때까지 기다림 (시작 단계에서 모델 로드와 겹쳐 실행) """
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.executor, _ping) for _ in range(self.workers)))
+        log.info("%d rollout workers ready", len(set(pids)))
+
+    async def rank(self, pyboy, memory_reader, candidates, score=default_score):
+        """
+        현재 상태에서 candidates를 병렬로 실행하고 점수가 높은 순서의 RolloutResult 목록을 반환합니다.
+        세이브스테이트는 이벤트 루프 스레드에서 찍으므로 게임 루프의 tick과 겹치지 않습니다.
+        """
+        started = time.perf_counter()
+        buffer = BytesIO()
+        pyboy.save_state(buffer)
+        state = buffer.getvalue()
+        before = decode_outcome(memory_reader)
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _run_rollout, state, sequence, self.frames_per_button, self.settle_frames)
+            for sequence in candidates))
+        results = [RolloutResult(sequence, score(before, outcome), outcome)
+                   for sequence, outcome in zip(candidates, outcomes)]
+        results.sort(key=lambda result: result.score, reverse=True)
+        ROLLOUTS.inc(len(results))
+        ROLLOUT_FRAMES.inc(sum(outcome.frames for outcome in outcomes))
+        ROLLOUT_SECONDS.observe(time.perf_counter() - started)
+        return results
+
+    async def play(self, pyboy, command_queue, sequence, epoch=None):
+        """
+        롤아웃과 같은 간격으로 sequence를 실제 게임에서 실행합니다.
+        game_loop은 프레임마다 버튼을 하나씩 꺼내므로 한꺼번에 넣으면 입력이 겹쳐 점수를 매긴 결과가 재현되지 않습니다.
+        버튼마다 눌릴 때까지 기다린 뒤 frames_per_button 프레임이 지나야 다음 버튼을 넣습니다.
+        세대가 바뀌어(맵 이동, 전투 시작) 버튼이 버려지면 False
+        """
+        for button in sequence:
+            if not await command_queue.put(button, epoch):
+                return False
+            await command_queue.join()
+            target = pyboy.frame_count + self.frames_per_button
+            while pyboy.frame_count < target:
+                await asyncio.sleep(FRAME_POLL_SECONDS)
+        return True
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,49 @@
+"""
+시작 단계 시간 측정
+
+모델 로드, 심볼 로드, 에뮬레이터 부팅처럼 동시에 진행되는 시작 작업의 구간을 기록하고,
+모두 끝나면 구간별 시작/종료 시각과 전체 시간을 한 번에 출력합니다.
+"""
+import time
+from contextlib import contextmanager
+
+from logs import get_logger
+from metrics import REGISTRY
+
+log = get_logger("startup")
+
+STARTUP_SECONDS = REGISTRY.gauge("startup_seconds", "Wall time from process start until the agent was ready")
+BAR_WIDTH = 40
+
+
+class StartupTimer:
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []  # (이름, 시작, 종료) - started 기준 초
+
+    def add(self, name, start, end):
+        self.phases.append((name, start - self.started, end - self.started))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    async def run(self, name, awaitable):
+        """ awaitable이 끝날 때까지의 시간을 name 구간으로 기록하고 결과를 반환 """
+        with self.phase(name):
+            return await awaitable
+
+    def report(self):
+        """ 구간별 타임라인을 출력하고 전체 시간(초)을 반환 """
+        total = max((end for _, _, end in self.phases), default=0.0)
+        STARTUP_SECONDS.set(total)
+        log.info("ready in %.2fs", total)
+        scale = BAR_WIDTH / total if total else 0
+        for name, start, end in sorted(self.phases, key=lambda phase: phase[1]):
+            bar = " " * int(start * scale) + "#" * max(1, int((end - start) * scale))
+            log.info("%-16s %6.2fs -> %6.2fs (%5.2fs) |%-*s|", name, start, end, end - start, BAR_WIDTH, bar)
+        return total
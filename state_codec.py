@@ -0,0 +1,176 @@
+"""
+프롬프트용 게임 상태 직렬화
+
+json.dumps(indent=2)는 공백과 반복되는 긴 키가 대부분이라 토큰을 많이 차지합니다.
+같은 정보를 더 적은 토큰으로 싣기 위해 여러 인코딩을 제공하고, 인코딩별 토큰 수를 비교할 수 있게 합니다.
+
+    json      기존 형식 (indent=2)
+    minified  공백 없는 JSON
+    abbrev    키 약어 + 불리언 1/0 + 공백 없는 JSON (프롬프트에 약어 범례 포함)
+    lines     YAML 비슷한 한 줄 한 항목 형식 (기본값)
+
+프롬프트는 대화 기록 없이 한 번에 보내므로, 직전 스텝과의 차이만 보내는 인코딩은 두지 않습니다.
+"""
+import json
+import re
+
+ENCODINGS = ("json", "minified", "abbrev", "lines")
+DEFAULT_ENCODING = "lines"
+
+# 프롬프트의 Controls 구간에 이미 들어가므로 상태 구간에서는 뺌
+OMIT_KEYS = ("passable_tiles",)
+
+KEY_ABBREVIATIONS = {
+    "current_mode": "mode",
+    "overworld": "ow",
+    "battle": "bt",
+    "isTextBoxVisible": "txt",
+    "overworld_state": "ows",
+    "position": "pos",
+    "facing_direction": "face",
+    "current_map": "map",
+    "warps": "wp",
+    "index": "i",
+    "dest_map": "to",
+    "frontier": "fr",
+    "trainer_state": "tr",
+    "money": "$",
+    "play_time": "time",
+    "hours": "h",
+    "minutes": "m",
+    "seconds": "s",
+    "badges": "bdg",
+}
+
+# 토큰 수 추정: 영문 단어는 약 4글자당 1토큰, 숫자는 한 자리당 1토큰, 기호는 1개당 1토큰으로 계산
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text):
+    """
+    BPE 토크나이저의 토큰 수를 근사합니다 (토크나이저 의존성 없이 인코딩 간 비교용).
+    실제 프롬프트 토큰 수는 Ollama 응답의 prompt_eval_count로 측정합니다.
+    """
+    count = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        count += (len(piece) + 3) // 4 if piece[0].isalpha() else 1
+    return count
+
+
+def _prune(game_state):
+    return {key: value for key, value in game_state.items() if key not in OMIT_KEYS}
+
+
+def _abbreviate(value):
+    if isinstance(value, dict):
+        return {KEY_ABBREVIATIONS.get(k, k): _abbreviate(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_abbreviate(v) for v in value]
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _used_keys(value, keys):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            keys.setdefault(k)
+            _used_keys(v, keys)
+    elif isinstance(value, list):
+        for v in value:
+            _used_keys(v, keys)
+    return keys
+
+
+def abbreviation_legend(state):
+    """ 상태에 실제로 쓰인 키만 담은 약어 범례 """
+    return "Keys: " + ", ".join(f"{KEY_ABBREVIATIONS[k]}={k}" for k in _used_keys(state, {}) if k in KEY_ABBREVIATIONS)
+
+
+def _scalar(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "-"
+    return str(value)
+
+
+def _inline(value):
+    """ 스칼라만 담긴 dict는 'k=v k=v', 리스트는 '; '로 이어 한 줄로 표현 """
+    if isinstance(value, dict):
+        return " ".join(f"{k}={_inline(v)}" for k, v in value.items())
+    if isinstance(value, list):
+        return "; ".join(_inline(v) for v in value)
+    return _scalar(value)
+
+
+def flatten_lines(game_state, prefix=""):
+    """
+    상태를 (경로, 값 문자열) 목록으로 평탄화합니다.
+    하위에 dict가 없는 dict와 리스트는 한 줄로 합칩니다.
+        current_mode: overworld=true battle=false isTextBoxVisible=false
+        overworld_state.position: x=3 y=6
+    """
+    lines = []
+    for key, value in game_state.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and any(isinstance(v, dict) for v in value.values()):
+            lines.extend(flatten_lines(value, path + "."))
+        else:
+            lines.append((path, _inline(value)))
+    return lines
+
+
+def encode_state(game_state, encoding=DEFAULT_ENCODING):
+    """ 게임 상태를 encoding 형식의 텍스트로 """
+    if encoding == "json":
+        return json.dumps(game_state, indent=2)
+    state = _prune(game_state)
+    if encoding == "minified":
+        return json.dumps(state, separators=(",", ":"), ensure_ascii=False)
+    if encoding == "abbrev":
+        return abbreviation_legend(state) + "\n" + json.dumps(_abbreviate(state), separators=(",", ":"), ensure_ascii=False)
+    if encoding == "lines":
+        return "\n".join(f"{path}: {value}" for path, value in flatten_lines(state))
+    raise ValueError(f"Unknown state encoding: {encoding}")
+
+
+class StateEncoder:
+    """ 스텝마다 상태를 선택한 인코딩으로 직렬화하고, 마지막 결과의 추정 토큰 수를 남깁니다. """
+    def __init__(self, encoding=DEFAULT_ENCODING):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown state encoding: {encoding}")
+        self.encoding = encoding
+        self.last_tokens = 0
+
+    def encode(self, game_state):
+        text = encode_state(game_state, self.encoding)
+        self.last_tokens = estimate_tokens(text)
+        return text
+
+
+def compact_screen(md_table):
+    """
+    generate_overworld_markdown_from_memory()의 마크다운 표에서 구분선 행과 셀 주변 공백을 제거합니다.
+    빈 셀도 '|' 사이에 그대로 남으므로 열 위치는 유지됩니다.
+    """
+    rows = []
+    for line in md_table.split("\n"):
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if cells and all(cell == "---" for cell in cells):
+            continue
+        rows.append("|".join(cells))
+    return "\n".join(rows)
+
+
+def compare_encodings(game_state, screen_ascii_data=None):
+    """ 인코딩별 (글자 수, 추정 토큰 수) 비교표 """
+    results = {}
+    for encoding in ENCODINGS:
+        text = encode_state(game_state, encoding)
+        results[encoding] = (len(text), estimate_tokens(text))
+    if screen_ascii_data is not None:
+        results["screen/markdown"] = (len(screen_ascii_data), estimate_tokens(screen_ascii_data))
+        compact = compact_screen(screen_ascii_data)
+        results["screen/compact"] = (len(compact), estimate_tokens(compact))
+    return results
@@ -0,0 +1,176 @@
+"""
+반복/정체 감지
+
+스텝마다 값싼 지문(화면 perceptual hash, 맵, 좌표, 윈도우 텍스트 해시)을 남기고,
+최근 window개 스텝 안에서 같은 지문이 반복되면 루프로, 오랫동안 처음 보는 지문이 없으면 정체로 판단합니다.
+지문별 개수와 마지막 등장 스텝을 dict로 유지하므로 스텝마다 O(1)입니다.
+마지막 등장 스텝은 최근 window 안의 지문만, 본 적 있는 지문은 최근 SEEN_CAPACITY개만 남기므로 메모리도 일정합니다.
+
+감지되면 설정된 동작을 수행합니다.
+- hint: 프롬프트에 루프 상황과 반복 중인 명령을 알림
+- explore: 루프에서 머문 칸을 뺀 프런티어를 안내하고, 반복될수록 더 먼 곳으로 유도 (탐험 압력)
+- rewind: 마지막으로 진행이 있었던 시점의 세이브스테이트로 되돌림
+"""
+import zlib
+from collections import OrderedDict, deque
+from io import BytesIO
+
+from metrics import REGISTRY
+
+ACTION_HINT = "hint"
+ACTION_EXPLORE = "explore"
+ACTION_REWIND = "rewind"
+ACTIONS = (ACTION_HINT, ACTION_EXPLORE, ACTION_REWIND)
+DEFAULT_ACTIONS = (ACTION_HINT, ACTION_EXPLORE)
+
+KIND_CYCLE = "cycle"
+KIND_NO_PROGRESS = "no_progress"
+
+HASH_SIZE = 8                 # 8x8 평균 해시 (64비트)
+WINDOW = 32                   # 반복을 세는 최근 스텝 수
+REPEAT_THRESHOLD = 3          # 최근 WINDOW 스텝에서 같은 지문이 이만큼 나오면 루프
+NO_PROGRESS_STEPS = 24        # 이 스텝 동안 처음 보는 지문이 없으면 정체
+CHECKPOINT_INTERVAL = 10      # 진행이 있는 스텝에서 세이브스테이트를 남기는 최소 간격
+MAX_PRESSURE = 3
+SEEN_CAPACITY = 4096          # 처음 보는 지문인지 판단할 때 기억하는 지문 수 (LRU)
+
+STUCK_CYCLES = REGISTRY.counter("stuck_cycles_total", "Steps where a repeating state cycle was detected")
+STUCK_NO_PROGRESS = REGISTRY.counter("stuck_no_progress_total", "Steps where no new state was seen for too long")
+STUCK_REWINDS = REGISTRY.counter("stuck_rewinds_total", "Savestate rewinds triggered by the stuck detector")
+
+
+def perceptual_hash(image, size=HASH_SIZE):
+    """
+    화면을 size x size 흑백으로 줄이고 평균보다 밝은 칸을 1로 하는 평균 해시(aHash).
+    깜빡이는 커서나 물결 타일 같은 작은 변화에는 값이 거의 바뀌지 않습니다.
+    """
+    pixels = list(image.convert("L").resize((size, size)).getdata())
+    mean = sum(pixels) / len(pixels)
+    bits = 0
+    for pixel in pixels:
+        bits = (bits << 1) | (pixel > mean)
+    return bits
+
+
+def text_hash(text):
+    return zlib.crc32(text.encode("utf-8")) if text else 0
+
+
+def fingerprint(game_state, screen_hash, window_text_hash):
+    overworld = game_state["overworld_state"]
+    position = overworld["position"]
+    return (overworld["current_map"], position["x"], position["y"], screen_hash, window_text_hash)
+
+
+class StuckReport:
+    def __init__(self, kind, repeats, period, idle_steps, positions, actions):
+        self.kind = kind
+        self.repeats = repeats          # 최근 window 안에서 현재 지문이 나온 횟수
+        self.period = period            # 같은 지문이 다시 나오기까지의 스텝 수 (없으면 None)
+        self.idle_steps = idle_steps    # 마지막으로 새 지문을 본 뒤 지난 스텝 수
+        self.positions = positions      # 루프 동안 머문 (맵, x, y)
+        self.actions = actions          # 루프 동안 반복한 명령
+
+    def describe(self):
+        if self.kind == KIND_CYCLE:
+            text = f"the same screen and position came back {self.repeats} times (every {self.period} steps)"
+        else:
+            text = f"nothing new has happened for {self.idle_steps} steps"
+        if self.actions:
+            text += f" while repeating: {', '.join(self.actions)}"
+        return text
+
+
+class StuckDetector:
+    def __init__(self, window=WINDOW, repeat_threshold=REPEAT_THRESHOLD, no_progress_steps=NO_PROGRESS_STEPS,
+                 seen_capacity=SEEN_CAPACITY):
+        self.window = window
+        self.repeat_threshold = repeat_threshold
+        self.no_progress_steps = no_progress_steps
+        self.seen_capacity = seen_capacity
+        self.recent = deque()     # (지문, 그 스텝의 명령)
+        self.counts = {}          # 지문 -> 최근 window 안 등장 횟수
+        self.last_seen = {}       # 지문 -> 마지막 등장 스텝 (최근 window 안에 있는 지문만)
+        self.seen = OrderedDict()  # 최근에 본 지문 (오래 안 나온 것부터 밀려남)
+        self.step = 0
+        self.last_new_step = 0
+        self.pressure = 0         # 연속으로 감지될수록 커지는 탐험 압력
+
+    def observe(self, fp):
+        """ 이번 스텝의 지문을 더하고 루프/정체면 StuckReport, 아니면 None """
+        self.step += 1
+        self.recent.append([fp, ()])
+        self.counts[fp] = self.counts.get(fp, 0) + 1
+        if len(self.recent) > self.window:
+            old, _ = self.recent.popleft()
+            self.counts[old] -= 1
+            if not self.counts[old]:
+                # window 밖으로 나간 지문은 주기 계산에도 쓰이지 않으므로 함께 지움
+                del self.counts[old]
+                del self.last_seen[old]
+        period = self.step - self.last_seen[fp] if fp in self.last_seen else None
+        self.last_seen[fp] = self.step
+        if fp in self.seen:
+            self.seen.move_to_end(fp)
+        else:
+            self.seen[fp] = None
+            if len(self.seen) > self.seen_capacity:
+                self.seen.popitem(last=False)
+            self.last_new_step = self.step
+
+        idle_steps = self.step - self.last_new_step
+        kind = None
+        if self.counts[fp] >= self.repeat_threshold:
+            kind = KIND_CYCLE
+            STUCK_CYCLES.inc()
+        elif idle_steps >= self.no_progress_steps:
+            kind = KIND_NO_PROGRESS
+            STUCK_NO_PROGRESS.inc()
+        if kind is None:
+            self.pressure = max(0, self.pressure - 1)
+            return None
+        self.pressure = min(MAX_PRESSURE, self.pressure + 1)
+        span = list(self.recent)[-(period or self.window) - 1:-1]  # 현재 스텝 직전까지의 한 주기
+        positions = list(dict.fromkeys(entry[0][:3] for entry in span))
+        actions = list(dict.fromkeys(action for entry in span for action in entry[1]))
+        return StuckReport(kind, self.counts[fp], period, idle_steps, positions, actions)
+
+    def record_actions(self, commands):
+        """ 이번 스텝에 실행한 명령을 마지막 지문에 붙임 (힌트에서 반복 명령을 보여주기 위해) """
+        if self.recent:
+            self.recent[-1][1] = tuple(commands)
+
+    @property
+    def progressed(self):
+        """ 이번 스텝에서 처음 보는 지문이 나왔는지 """
+        return self.last_new_step == self.step
+
+    def reset_window(self):
+        """ 되감기 후에는 최근 기록을 비워 같은 루프를 바로 다시 감지하지 않게 함 """
+        self.recent.clear()
+        self.counts.clear()
+        self.last_seen.clear()
+        self.last_new_step = self.step
+
+
+class Checkpoints:
+    """ 진행이 있었던 스텝의 세이브스테이트를 몇 개만 메모리에 보관 """
+    def __init__(self, keep=3, interval=CHECKPOINT_INTERVAL):
+        self.states = deque(maxlen=keep)  # (스텝, 세이브스테이트 bytes)
+        self.interval = interval
+
+    def maybe_save(self, pyboy, step):
+        if self.states and step - self.states[-1][0] < self.interval:
+            return
+        buffer = BytesIO()
+        pyboy.save_state(buffer)
+        self.states.append((step, buffer.getvalue()))
+
+    def rewind(self, pyboy):
+        """ 가장 최근 체크포인트로 되돌리고 그 스텝 번호를 반환 (없으면 None). 같은 곳에 다시 갇히면 더 이전으로 """
+        if not self.states:
+            return None
+        step, state = self.states.pop() if len(self.states) > 1 else self.states[-1]
+        pyboy.load_state(BytesIO(state))
+        STUCK_REWINDS.inc()
+        return step
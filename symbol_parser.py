@@ -1,3 +1,7 @@
+import os
+import pickle
+
+
 def parse_sym_file(sym_path: str) -> dict:
     """
     pokered.sym 파일을 파싱하여 {심볼 이름: (뱅크, 주소)} 형태의 딕셔너리를 반환합니다.
@@ -30,3 +34,28 @@ def parse_sym_file(sym_path: str) -> dict:
             symbol_map[symbol_name] = (bank, address)
 
     return symbol_map
+
+
+def load_symbol_map(sym_path: str, cache_path: str = None) -> dict:
+    """
+    parse_sym_file()의 결과를 pickle 캐시에 저장해 두고, .sym 파일의 크기와 수정 시각이 같으면 캐시를 읽습니다.
+    캐시를 읽거나 쓸 수 없으면 그냥 파싱합니다.
+    """
+    cache_path = cache_path or sym_path + ".cache"
+    stat = os.stat(sym_path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, symbol_map = pickle.load(f)
+        if cached_key == key:
+            return symbol_map
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    symbol_map = parse_sym_file(sym_path)
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((key, symbol_map), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return symbol_map
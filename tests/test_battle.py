@@ -0,0 +1,12 @@
+from battle import move_menu_button
+
+
+def test_first_move_is_menu_item_one():
+    assert move_menu_button(0, 1) == "a"
+
+
+def test_moves_cursor_toward_one_based_item():
+    assert move_menu_button(2, 1) == "down"
+    assert move_menu_button(2, 2) == "down"
+    assert move_menu_button(2, 3) == "a"
+    assert move_menu_button(0, 3) == "up"
@@ -0,0 +1,19 @@
+from metrics import Registry
+
+
+def test_labelled_series_share_one_metric_family():
+    registry = Registry()
+    registry.gauge("queue_depth", "Queued", {"session": 0}).set(3)
+    registry.gauge("queue_depth", "Queued", {"session": 1}).set(4)
+    text = registry.render_prometheus()
+    assert text.count("# TYPE queue_depth gauge") == 1
+    assert 'queue_depth{session="0"} 3' in text
+    assert 'queue_depth{session="1"} 4' in text
+
+
+def test_same_labels_return_the_same_series():
+    registry = Registry()
+    counter = registry.counter("requests_total", labels={"session": 2})
+    assert registry.counter("requests_total", labels={"session": 2}) is counter
+    counter.inc()
+    assert registry.snapshot() == {'requests_total{session="2"}': 1}
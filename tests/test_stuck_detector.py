@@ -0,0 +1,16 @@
+from stuck_detector import KIND_CYCLE, StuckDetector
+
+
+def test_state_stays_bounded_on_long_runs():
+    detector = StuckDetector(window=8, seen_capacity=16)
+    for step in range(1000):
+        detector.observe(("MAP", step, 0, 0, 0))
+    assert len(detector.last_seen) <= 8
+    assert len(detector.seen) == 16
+
+
+def test_cycle_still_detected():
+    detector = StuckDetector(window=8, repeat_threshold=3)
+    reports = [detector.observe(("MAP", step % 2, 0, 0, 0)) for step in range(6)]
+    assert reports[-1].kind == KIND_CYCLE
+    assert reports[-1].period == 2
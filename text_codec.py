@@ -0,0 +1,157 @@
+"""
+포켓몬 레드 문자 코덱
+
+하나의 원본 테이블(CHAR_TABLE)에서 훅 디코딩용 CHARMAP, VRAM 타일용 TILE_CHARS,
+그리고 256칸짜리 변환 테이블을 모두 생성합니다.
+디코딩은 bytes.decode("latin-1")로 바이트를 같은 코드 포인트의 문자로 바꾼 뒤
+str.translate()로 한 번에 변환하므로 바이트마다 dict를 조회하지 않습니다.
+"""
+
+STRING_TERMINATOR = 0x50   # "@" 문자열 끝
+DONE = 0x57                # <DONE> 텍스트 종료
+NULL = 0x00
+TERMINATORS = (NULL, STRING_TERMINATOR, DONE)
+FIRST_TILE_CHAR = 0x60     # 이 값 이상은 VRAM 타일에도 그대로 쓰이는 문자
+
+# 원본 테이블: 바이트 -> 표시 문자열
+CHAR_TABLE = {
+    # 제어 코드 (텍스트 스트림에서만 의미가 있음)
+    0x00: "<NULL>",
+    0x49: "<PAGE>",
+    0x4A: "PKMN",
+    0x4B: "<_CONT>",
+    0x4C: "<SCROLL>",
+    0x4E: "<NEXT>",
+    0x4F: "\n",
+    0x51: "<PARA>",
+    0x52: "<PLAYER>",
+    0x53: "<RIVAL>",
+    0x54: "POKé",
+    0x55: " ",  # CONT
+    0x56: "……",
+    0x57: "<DONE>",
+    0x58: "<PROMPT>",
+    0x59: "<TARGET>",
+    0x5A: "<USER>",
+    0x5B: "PC",
+    0x5C: "TM",
+    0x5D: "TRAINER",
+    0x5E: "ROCKET",
+    0x5F: ".",
+
+    # 타일 문자
+    0x77: "-", 0x76: "_",
+    # 0x79: "┌", 0x7A: "─",0x7B: "┐", 0x7C: "│",    0x7D: "└",   0x7E: "┘",  0x7F: " ",
+    0x79: "", 0x7A: "", 0x7B: "", 0x7C: "", 0x7D: "", 0x7E: "", 0x7F: " ",
+    0x80: "A", 0x81: "B", 0x82: "C", 0x83: "D", 0x84: "E", 0x85: "F", 0x86: "G",
+    0x87: "H", 0x88: "I", 0x89: "J", 0x8A: "K", 0x8B: "L", 0x8C: "M", 0x8D: "N",
+    0x8E: "O", 0x8F: "P", 0x90: "Q", 0x91: "R", 0x92: "S", 0x93: "T", 0x94: "U",
+    0x95: "V", 0x96: "W", 0x97: "X", 0x98: "Y", 0x99: "Z",
+
+    0x9A: "(", 0x9B: ")", 0x9C: ":", 0x9D: ";", 0x9E: "[", 0x9F: "]",
+
+    0xA0: "a", 0xA1: "b", 0xA2: "c", 0xA3: "d", 0xA4: "e", 0xA5: "f", 0xA6: "g",
+    0xA7: "h", 0xA8: "i", 0xA9: "j", 0xAA: "k", 0xAB: "l", 0xAC: "m", 0xAD: "n",
+    0xAE: "o", 0xAF: "p", 0xB0: "q", 0xB1: "r", 0xB2: "s", 0xB3: "t", 0xB4: "u",
+    0xB5: "v", 0xB6: "w", 0xB7: "x", 0xB8: "y", 0xB9: "z",
+
+    0xBA: "é", 0xBB: "'d", 0xBC: "'l", 0xBD: "'s", 0xBE: "'t", 0xBF: "'v",
+
+    0xE0: "'", 0xE1: "<PK>", 0xE2: "<MN>", 0xE3: "-",
+    0xE4: "'r", 0xE5: "'m", 0xE6: "?", 0xE7: "!", 0xE8: ".",
+
+    0xE9: "ァ", 0xEA: "ゥ", 0xEB: "ェ",
+    0xEC: "▷", 0xED: "▶", 0xEE: "▼", 0xEF: "♂", 0xF0: "ED", 0xF1: "×",
+    0xF2: "<DOT>", 0xF3: "/", 0xF4: ",", 0xF5: "♀",
+
+    0xF6: "0", 0xF7: "1", 0xF8: "2", 0xF9: "3", 0xFA: "4",
+    0xFB: "5", 0xFC: "6", 0xFD: "7", 0xFE: "8", 0xFF: "9",
+}
+
+# 기존 dict 형태의 테이블 (하위 호환)
+CHARMAP = dict(CHAR_TABLE)
+TILE_CHARS = {code: char for code, char in CHAR_TABLE.items() if code >= FIRST_TILE_CHAR}
+
+# 256칸 테이블: 인덱스 = 바이트 값
+TEXT_TABLE = tuple(CHAR_TABLE.get(code, "") for code in range(256))
+TILE_TABLE = tuple(TILE_CHARS.get(code, "") for code in range(256))
+# 알 수 없는 타일은 0x## 형태로 표시 (화면 표 생성용)
+TILE_DISPLAY_TABLE = tuple(TILE_CHARS.get(code, f"{code:#x}") for code in range(256))
+
+# str.translate()용 테이블: 빈 문자열은 None(삭제)으로
+_TEXT_TRANSLATE = {code: (TEXT_TABLE[code] or None) for code in range(256)}
+_TILE_TRANSLATE = {code: (TILE_TABLE[code] or None) for code in range(256)}
+
+# 인코딩용 역테이블 (여러 바이트 값이 같은 문자를 가지면 타일 문자 우선)
+_ENCODE = {}
+for _code, _char in sorted(CHAR_TABLE.items(), reverse=True):
+    if _char and _char not in _ENCODE:
+        _ENCODE[_char] = _code
+_ENCODE_MAX_LENGTH = max(len(char) for char in _ENCODE)
+
+
+def find_terminator(data, terminators=TERMINATORS):
+    """ data에서 첫 종료 문자의 위치를 반환 (없으면 len(data)) """
+    end = len(data)
+    for terminator in terminators:
+        index = data.find(terminator, 0, end)
+        if index != -1:
+            end = index
+    return end
+
+
+def decode(data, stop_at_terminator=True, names=None):
+    """
+    텍스트 스트림 바이트(ROM/WRAM 문자열)를 문자열로 디코딩합니다.
+
+    stop_at_terminator: 0x00/0x50/0x57에서 디코딩을 멈춤
+    names: {"<PLAYER>": "RED", "<RIVAL>": "BLUE"}처럼 자리표시자를 치환할 값
+    """
+    data = bytes(data)
+    if stop_at_terminator:
+        data = data[:find_terminator(data)]
+    text = data.decode("latin-1").translate(_TEXT_TRANSLATE)
+    if names:
+        for placeholder, value in names.items():
+            text = text.replace(placeholder, value)
+    return text
+
+
+def decode_tiles(data):
+    """ VRAM 타일 번호를 문자로 변환 (제어 코드와 알 수 없는 타일은 제거) """
+    return bytes(data).decode("latin-1").translate(_TILE_TRANSLATE)
+
+
+def decode_tile_rows(data, width, height, stride=32):
+    """
+    타일 맵(예: 0x9C00 윈도우 맵, 한 행 32타일)을 행 단위로 디코딩하여
+    각 행을 strip()한 리스트를 반환합니다.
+    """
+    data = bytes(data)
+    return [decode_tiles(data[row * stride:row * stride + width]).strip() for row in range(height)]
+
+
+def read_string(memory, address, max_length=256, names=None):
+    """ pyboy.memory에서 종료 문자까지의 문자열을 한 번의 슬라이스로 읽어 디코딩 """
+    return decode(memory[address:address + max_length], names=names)
+
+
+def encode(text, terminate=True):
+    """
+    문자열을 포켓몬 문자 코드로 인코딩합니다 (가장 긴 일치 우선).
+    terminate가 True이면 끝에 0x50을 붙입니다. 알 수 없는 문자는 ValueError.
+    """
+    out = bytearray()
+    i = 0
+    while i < len(text):
+        for length in range(min(_ENCODE_MAX_LENGTH, len(text) - i), 0, -1):
+            code = _ENCODE.get(text[i:i + length])
+            if code is not None:
+                out.append(code)
+                i += length
+                break
+        else:
+            raise ValueError(f"Cannot encode character: {text[i]!r}")
+    if terminate:
+        out.append(STRING_TERMINATOR)
+    return bytes(out)
@@ -0,0 +1,268 @@
+"""
+VRAM 타일 분류기
+
+화면 표의 0x## 타일이 무엇인지 알려 주기 위해, 화면에 보이는 각 타일의 16바이트 패턴(2bpp)을 VRAM에서 읽어
+ROM 타일셋에서 만든 시그니처 DB로 의미 클래스(나무, 물, 문, 풀숲, 턱, 표지판 ...)를 찾고,
+2x2 블록(맵 좌표 한 칸) 단위의 의미 격자를 만듭니다. 스크린샷 없이 텍스트만으로 프롬프트를 만들 때 씁니다.
+
+시그니처 DB는 ROM의 타일셋 헤더(그래픽, 충돌, 카운터, 풀숲 타일)와 문/워프/턱/물 타일 표에서 한 번 만들고
+ROM 해시를 키로 <rom>.tiles.cache에 저장합니다.
+- 패턴이 모든 타일셋에서 한 클래스로만 쓰이면 패턴만으로 분류 (타일셋과 무관)
+- 그렇지 않거나 애니메이션으로 패턴이 바뀐 타일(물, 꽃)은 (타일셋, 타일 ID) 표로 분류
+NPC는 배경 타일이 아니므로 wSpriteStateData1의 그림 ID로 종류를 구분합니다.
+"""
+import hashlib
+import os
+import pickle
+
+from consts import SPRITES, TILESETS
+from metrics import REGISTRY
+
+DB_VERSION = 1
+NUM_TILESETS = 24
+TILESET_TILES = 0x60          # 타일셋 그래픽은 vTileset($9000)에 최대 $60개 타일
+TILESET_HEADER_SIZE = 12      # bank, blocks, gfx, collision, counter x3, grass, animation
+TILE_BYTES = 16
+UI_TILE_START = 0x60          # 이 ID 이상은 글꼴/테두리 등 UI 타일
+WATER_TILE = 0x14
+CUT_TREE_TILES = {TILESETS.id("OVERWORLD"): 0x3D, TILESETS.id("GYM"): 0x50}
+SCREEN_WIDTH = 20
+SCREEN_HEIGHT = 18
+PLAYER_BLOCK = (4, 4)         # 화면 블록 좌표에서 플레이어 위치
+SPRITE_SLOTS = 16
+SPRITE_HIDDEN = 0xFF          # wSpriteStateData1 +2 (그림 인덱스)가 이 값이면 화면 밖/숨김
+
+# 의미 클래스와 격자 문자
+CLASS_FLOOR = "floor"
+CLASS_WALL = "wall"
+CLASS_GRASS = "grass"
+CLASS_COUNTER = "counter"
+CLASS_WARP = "warp"
+CLASS_DOOR = "door"
+CLASS_LEDGE = "ledge"
+CLASS_WATER = "water"
+CLASS_TREE = "cut_tree"
+CLASS_SIGN = "sign"
+CLASS_TEXT = "text"
+CLASS_CHARS = {
+    CLASS_FLOOR: ".", CLASS_WALL: "#", CLASS_GRASS: '"', CLASS_COUNTER: "C", CLASS_WARP: "W", CLASS_DOOR: "D",
+    CLASS_LEDGE: "v", CLASS_WATER: "~", CLASS_TREE: "T", CLASS_SIGN: "S", CLASS_TEXT: "t",
+}
+# 한 블록에 여러 클래스가 있으면 앞쪽이 우선 (충돌 여부는 블록 왼쪽 아래 타일로 정함)
+BLOCK_PRIORITY = (CLASS_TEXT, CLASS_DOOR, CLASS_WARP, CLASS_WATER, CLASS_LEDGE, CLASS_TREE, CLASS_COUNTER, CLASS_GRASS)
+PLAYER_CHAR = "@"
+NPC_CHAR = "N"
+ITEM_CHAR = "o"
+ITEM_SPRITES = {"POKE_BALL", "FOSSIL", "PAPER", "POKEDEX", "CLIPBOARD", "OLD_AMBER", "BOULDER"}
+LEGEND = ("@ you, N person, o object, . floor, # wall, \" tall grass, ~ water, D door, W warp/stairs, "
+          "v ledge (jump down only), T cut tree, C counter (talk across), S sign, t text/menu")
+
+TILE_LOOKUPS = REGISTRY.counter("tile_classifier_lookups_total", "Screen tiles classified")
+TILE_PATTERN_HITS = REGISTRY.counter("tile_classifier_pattern_hits_total", "Screen tiles classified by their VRAM pattern alone")
+
+
+def rom_offset(bank, address):
+    return address if address < 0x4000 else bank * 0x4000 + (address - 0x4000)
+
+
+def rom_read(rom, bank, address, length):
+    offset = rom_offset(bank, address)
+    return rom[offset:offset + length]
+
+
+def rom_list(rom, bank, address, terminator=0xFF, limit=256):
+    """ terminator가 나올 때까지의 바이트 리스트 """
+    offset = rom_offset(bank, address)
+    values = []
+    for value in rom[offset:offset + limit]:
+        if value == terminator:
+            break
+        values.append(value)
+    return values
+
+
+def rom_word(rom, bank, address):
+    low, high = rom_read(rom, bank, address, 2)
+    return low | (high << 8)
+
+
+class TileSignatureDB:
+    """
+    patterns: {16바이트 패턴: 클래스} (모든 타일셋에서 클래스가 하나인 패턴만)
+    tile_classes: {타일셋: {타일 ID: 클래스}}
+    """
+    def __init__(self, patterns, tile_classes):
+        self.patterns = patterns
+        self.tile_classes = tile_classes
+
+    def classify(self, pattern, tileset, tile_id):
+        if tile_id >= UI_TILE_START:
+            return CLASS_TEXT
+        TILE_LOOKUPS.inc()
+        cls = self.patterns.get(pattern)
+        if cls is not None:
+            TILE_PATTERN_HITS.inc()
+            return cls
+        return self.tile_classes.get(tileset, {}).get(tile_id, CLASS_WALL)
+
+
+def build_signature_db(rom, symbol_map):
+    """ ROM 바이트와 심볼 맵으로 시그니처 DB를 만듦. 표 심볼이 없으면 그 표는 건너뜀 """
+    tileset_bank, tileset_address = symbol_map["Tilesets"]
+    graphics = {}
+    tile_classes = {}
+    for tileset in range(NUM_TILESETS):
+        header = rom_read(rom, tileset_bank, tileset_address + tileset * TILESET_HEADER_SIZE, TILESET_HEADER_SIZE)
+        gfx_bank = header[0]
+        gfx_address = header[3] | (header[4] << 8)
+        collision_address = header[5] | (header[6] << 8)
+        graphics[tileset] = rom_read(rom, gfx_bank, gfx_address, TILESET_TILES * TILE_BYTES)
+        passable = set(rom_list(rom, tileset_bank, collision_address))
+        classes = {tile: CLASS_FLOOR if tile in passable else CLASS_WALL for tile in range(TILESET_TILES)}
+        for tile in header[7:10]:
+            if tile != 0xFF:
+                classes[tile] = CLASS_COUNTER
+        if header[10] != 0xFF:
+            classes[header[10]] = CLASS_GRASS
+        tile_classes[tileset] = classes
+
+    if "WarpTileIDPointers" in symbol_map:
+        bank, address = symbol_map["WarpTileIDPointers"]
+        for tileset in range(NUM_TILESETS):
+            for tile in rom_list(rom, bank, rom_word(rom, bank, address + tileset * 2)):
+                tile_classes[tileset][tile] = CLASS_WARP
+    if "DoorTileIDPointers" in symbol_map:
+        bank, address = symbol_map["DoorTileIDPointers"]
+        while rom_read(rom, bank, address, 1)[0] != 0xFF:
+            tileset = rom_read(rom, bank, address, 1)[0]
+            for tile in rom_list(rom, bank, rom_word(rom, bank, address + 1), terminator=0x00):
+                tile_classes[tileset][tile] = CLASS_DOOR
+            address += 3
+    if "LedgeTiles" in symbol_map:
+        bank, address = symbol_map["LedgeTiles"]
+        entries = rom_list(rom, bank, address)
+        for i in range(0, len(entries) - 3, 4):
+            tile_classes[TILESETS.id("OVERWORLD")][entries[i + 2]] = CLASS_LEDGE
+    if "WaterTilesets" in symbol_map:
+        for tileset in rom_list(rom, *symbol_map["WaterTilesets"]):
+            tile_classes[tileset][WATER_TILE] = CLASS_WATER
+    for tileset, tile in CUT_TREE_TILES.items():
+        tile_classes[tileset][tile] = CLASS_TREE
+
+    # 같은 패턴이 타일셋마다 다른 클래스로 쓰이면 패턴만으로는 알 수 없으므로 뺌
+    patterns = {}
+    ambiguous = set()
+    for tileset, gfx in graphics.items():
+        for tile in range(len(gfx) // TILE_BYTES):
+            pattern = bytes(gfx[tile * TILE_BYTES:(tile + 1) * TILE_BYTES])
+            cls = tile_classes[tileset][tile]
+            if patterns.setdefault(pattern, cls) != cls:
+                ambiguous.add(pattern)
+    for pattern in ambiguous:
+        del patterns[pattern]
+    return TileSignatureDB(patterns, tile_classes)
+
+
+def load_signature_db(rom_path, symbol_map, cache_path=None):
+    """ ROM 해시가 같으면 캐시를 읽고, 아니면 만들어서 캐시에 저장 """
+    cache_path = cache_path or rom_path + ".tiles.cache"
+    with open(rom_path, "rb") as f:
+        rom = f.read()
+    key = (DB_VERSION, hashlib.sha256(rom).digest())
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, patterns, tile_classes = pickle.load(f)
+        if cached_key == key:
+            return TileSignatureDB(patterns, tile_classes)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    db = build_signature_db(rom, symbol_map)
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((key, db.patterns, db.tile_classes), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return db
+
+
+class TileClassifier:
+    def __init__(self, memory_reader, db):
+        self.memory_reader = memory_reader
+        self.db = db
+
+    def read_patterns(self, tile_ids):
+        """ 화면 타일 ID마다 VRAM의 16바이트 패턴 (LCDC 비트 4로 $8000/$8800 주소 방식 선택) """
+        pyboy = self.memory_reader.pyboy
+        vram = bytes(pyboy.memory[0x8000:0x9800])
+        unsigned = pyboy.memory[0xFF40] & 0x10
+        patterns = {}
+        for tile in set(tile_ids):
+            start = tile * TILE_BYTES if unsigned or tile >= 0x80 else 0x1000 + tile * TILE_BYTES
+            patterns[tile] = vram[start:start + TILE_BYTES]
+        return patterns
+
+    def block_classes(self):
+        """ 10x9 화면 블록별 클래스 """
+        reader = self.memory_reader
+        tiles = bytes(reader.read_memory_bytes("wTileMap", SCREEN_WIDTH * SCREEN_HEIGHT))
+        patterns = self.read_patterns(tiles)
+        tileset = reader.read_memory("wCurMapTileset")
+        classes = [self.db.classify(patterns[tile], tileset, tile) for tile in tiles]
+
+        rows = []
+        for by in range(SCREEN_HEIGHT // 2):
+            row = []
+            for bx in range(SCREEN_WIDTH // 2):
+                top = 2 * by * SCREEN_WIDTH + 2 * bx
+                block = (classes[top], classes[top + 1], classes[top + SCREEN_WIDTH], classes[top + SCREEN_WIDTH + 1])
+                cls = next((c for c in BLOCK_PRIORITY if c in block), block[2])  # 왼쪽 아래 타일이 충돌 기준
+                row.append(cls)
+            rows.append(row)
+        return rows
+
+    def objects(self):
+        """ 화면에 보이는 NPC/물체: [{"x", "y" (화면 블록), "type"}] (0번 슬롯은 플레이어라 제외) """
+        data = self.memory_reader.read_memory_bytes("wSpriteStateData1", SPRITE_SLOTS * 16)
+        objects = []
+        for slot in range(1, SPRITE_SLOTS):
+            entry = data[slot * 16:(slot + 1) * 16]
+            if entry[0] == 0 or entry[2] == SPRITE_HIDDEN:
+                continue
+            bx, by = entry[6] // 16, (entry[4] + 4) // 16
+            if 0 <= bx < SCREEN_WIDTH // 2 and 0 <= by < SCREEN_HEIGHT // 2:
+                objects.append({"x": bx, "y": by, "type": SPRITES.names[entry[0]]})
+        return objects
+
+    def signs(self):
+        """ 표지판의 맵 좌표 [(x, y)] """
+        count = self.memory_reader.read_memory("wNumSigns")
+        coords = self.memory_reader.read_memory_bytes("wSignCoords", count * 2)
+        return [(coords[i + 1], coords[i]) for i in range(0, count * 2, 2)]
+
+    def semantic_screen(self):
+        """
+        플레이어 주변 의미 격자를 맵 좌표와 함께 문자열로 반환.
+        첫 줄에 왼쪽 위 칸의 맵 좌표를 적어 /go_to 좌표를 바로 셀 수 있게 합니다.
+        """
+        reader = self.memory_reader
+        px, py = reader.read_memory("wXCoord"), reader.read_memory("wYCoord")
+        x0, y0 = px - PLAYER_BLOCK[0], py - PLAYER_BLOCK[1]
+        grid = [[CLASS_CHARS[cls] for cls in row] for row in self.block_classes()]
+        for sx, sy in self.signs():
+            bx, by = sx - x0, sy - y0
+            if 0 <= by < len(grid) and 0 <= bx < len(grid[0]):
+                grid[by][bx] = CLASS_CHARS[CLASS_SIGN]
+        described = []
+        for obj in self.objects():
+            item = obj["type"] in ITEM_SPRITES
+            grid[obj["y"]][obj["x"]] = ITEM_CHAR if item else NPC_CHAR
+            described.append(f"{obj['type']} at ({x0 + obj['x']}, {y0 + obj['y']})")
+        grid[PLAYER_BLOCK[1]][PLAYER_BLOCK[0]] = PLAYER_CHAR
+
+        lines = [f"top-left = map ({x0}, {y0}), you = ({px}, {py})"]
+        lines += ["".join(row) for row in grid]
+        lines.append(f"legend: {LEGEND}")
+        if described:
+            lines.append("objects: " + ", ".join(described))
+        return "\n".join(lines)
@@ -0,0 +1,267 @@
+"""
+실행 기록(trace) 파일 형식
+
+    헤더: b"PKTR" + 버전(u8)
+    레코드: 타입(u8) + 페이로드 길이(varint) + 페이로드
+
+프레임 번호는 varint로 저장하며, 입력이 없는 프레임은 기록하지 않습니다.
+프롬프트/응답 텍스트는 하나의 zlib 스트림으로 압축(레코드마다 Z_SYNC_FLUSH)하여
+스텝 간에 반복되는 프롬프트 구간이 거의 공간을 차지하지 않도록 합니다.
+파일은 append-only이므로 중간에 프로세스가 죽어도 마지막 완전한 레코드까지 읽을 수 있습니다.
+"""
+
+import hashlib
+import time
+import zlib
+from io import BytesIO
+
+TRACE_MAGIC = b"PKTR"
+TRACE_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)  # 버전 2에서 REC_LOAD_STATE 추가
+
+REC_ROM_HASH = 0x01     # sha256(ROM) 32바이트
+REC_SAVESTATE = 0x02    # zlib 압축된 초기 세이브스테이트
+REC_INPUT = 0x03        # varint 프레임 + u8 버튼
+REC_STATE_HASH = 0x04   # varint 프레임 + 8바이트 WRAM 해시
+REC_PROMPT = 0x05       # varint 스텝 + 압축 텍스트
+REC_RESPONSE = 0x06     # varint 스텝 + 압축 텍스트
+REC_PROMPT_REF = 0x07   # varint 스텝 + varint 이전 프롬프트 번호 (중복 제거)
+REC_LOAD_STATE = 0x08   # varint 프레임 + zlib 압축된 세이브스테이트 (실행 중 되감기)
+
+BUTTONS = ("a", "b", "start", "select", "up", "down", "left", "right")
+BUTTON_TO_CODE = {name: i for i, name in enumerate(BUTTONS)}
+
+WRAM_START = 0xC000
+WRAM_END = 0xE000
+STATE_HASH_INTERVAL = 60  # 몇 프레임마다 상태 해시를 기록할지
+
+
+def encode_varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data, pos):
+    """ data[pos:]에서 varint를 읽어 (값, 다음 위치)를 반환 """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def hash_rom(rom_path):
+    with open(rom_path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def hash_wram(pyboy):
+    """ WRAM 전체의 8바이트 해시 (결정적 재현 검증용) """
+    return hashlib.blake2b(bytes(pyboy.memory[WRAM_START:WRAM_END]), digest_size=8).digest()
+
+
+class TraceRecorder:
+    """
+    실행 중 ROM 해시, 초기 세이브스테이트, 프레임별 입력, LLM 프롬프트/응답, 상태 해시를
+    append-only 바이너리 파일로 기록합니다.
+    """
+    def __init__(self, path, record_llm=True, dedupe_prompts=True):
+        self.path = path
+        self.record_llm = record_llm
+        self.dedupe_prompts = dedupe_prompts
+        self.file = open(path, "wb")
+        self.frame = 0
+        self.compressor = zlib.compressobj(9)
+        self.prompt_index = {}  # 프롬프트 해시 -> 프롬프트 번호
+        self.prompt_count = 0
+
+    def start(self, rom_path, pyboy):
+        """ 헤더, ROM 해시, 현재 세이브스테이트를 기록 (첫 tick 전에 호출) """
+        self.file.write(TRACE_MAGIC + bytes([TRACE_VERSION]))
+        self._write(REC_ROM_HASH, hash_rom(rom_path))
+        state = BytesIO()
+        pyboy.save_state(state)
+        self._write(REC_SAVESTATE, zlib.compress(state.getvalue(), 9))
+        self.file.flush()
+
+    def _write(self, rec_type, payload):
+        self.file.write(bytes([rec_type]) + encode_varint(len(payload)) + payload)
+
+    def _compress_text(self, text):
+        return self.compressor.compress(text.encode("utf-8")) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def on_tick(self, pyboy):
+        """ game_loop에서 pyboy.tick() 직후 매 프레임 호출 """
+        self.frame += 1
+        if self.frame % STATE_HASH_INTERVAL == 0:
+            self._write(REC_STATE_HASH, encode_varint(self.frame) + hash_wram(pyboy))
+
+    def record_input(self, button):
+        self._write(REC_INPUT, encode_varint(self.frame) + bytes([BUTTON_TO_CODE[button]]))
+
+    def record_load_state(self, pyboy):
+        """ 실행 중 세이브스테이트를 불러온 직후 호출 (되감기). 재생 시 같은 프레임에서 이 상태를 불러옴 """
+        state = BytesIO()
+        pyboy.save_state(state)
+        self._write(REC_LOAD_STATE, encode_varint(self.frame) + zlib.compress(state.getvalue(), 9))
+        self.file.flush()
+
+    def record_prompt(self, step, prompt):
+        if not self.record_llm:
+            return
+        if self.dedupe_prompts:
+            digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+            if digest in self.prompt_index:
+                self._write(REC_PROMPT_REF, encode_varint(step) + encode_varint(self.prompt_index[digest]))
+                self.file.flush()
+                return
+            self.prompt_index[digest] = self.prompt_count
+        self.prompt_count += 1
+        self._write(REC_PROMPT, encode_varint(step) + self._compress_text(prompt))
+        self.file.flush()
+
+    def record_response(self, step, response):
+        if not self.record_llm:
+            return
+        self._write(REC_RESPONSE, encode_varint(step) + self._compress_text(response))
+        self.file.flush()
+
+    def close(self):
+        self.file.flush()
+        self.file.close()
+
+
+def read_trace(path):
+    """
+    기록 파일을 읽어 (레코드 타입, 값) 튜플을 순서대로 생성합니다.
+    잘린 마지막 레코드는 무시합니다.
+
+    값의 형태:
+        REC_ROM_HASH: bytes
+        REC_SAVESTATE: bytes (압축 해제된 세이브스테이트)
+        REC_INPUT: (프레임, 버튼 이름)
+        REC_STATE_HASH: (프레임, bytes)
+        REC_PROMPT, REC_RESPONSE: (스텝, 텍스트)
+        REC_PROMPT_REF: (스텝, 텍스트)
+        REC_LOAD_STATE: (프레임, bytes (압축 해제된 세이브스테이트))
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != TRACE_MAGIC:
+        raise ValueError(f"Not a trace file: {path}")
+    if data[4] not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported trace version: {data[4]}")
+
+    decompressor = zlib.decompressobj()
+    prompts = []
+    pos = 5
+    while pos < len(data):
+        try:
+            rec_type = data[pos]
+            length, start = decode_varint(data, pos + 1)
+        except IndexError:
+            break
+        end = start + length
+        if end > len(data):
+            break
+        payload = data[start:end]
+        pos = end
+
+        if rec_type == REC_ROM_HASH:
+            yield rec_type, payload
+        elif rec_type == REC_SAVESTATE:
+            yield rec_type, zlib.decompress(payload)
+        elif rec_type == REC_INPUT:
+            frame, i = decode_varint(payload, 0)
+            yield rec_type, (frame, BUTTONS[payload[i]])
+        elif rec_type == REC_STATE_HASH:
+            frame, i = decode_varint(payload, 0)
+            yield rec_type, (frame, payload[i:])
+        elif rec_type in (REC_PROMPT, REC_RESPONSE):
+            step, i = decode_varint(payload, 0)
+            text = decompressor.decompress(payload[i:]).decode("utf-8")
+            if rec_type == REC_PROMPT:
+                prompts.append(text)
+            yield rec_type, (step, text)
+        elif rec_type == REC_PROMPT_REF:
+            step, i = decode_varint(payload, 0)
+            index, _ = decode_varint(payload, i)
+            yield rec_type, (step, prompts[index])
+        elif rec_type == REC_LOAD_STATE:
+            frame, i = decode_varint(payload, 0)
+            yield rec_type, (frame, zlib.decompress(payload[i:]))
+
+
+def replay(trace_path, rom_path):
+    """
+    기록된 입력을 헤드리스 에뮬레이터에서 최대 속도로 재생하고 상태 해시를 비교합니다.
+    실행 중 되감기(REC_LOAD_STATE)는 기록된 프레임에서 같은 세이브스테이트를 불러와 재현합니다.
+    LLM은 호출하지 않습니다.
+
+    Returns:
+        dict: 재생 결과 요약 (프레임 수, 입력 수, 해시 불일치 수, 초당 프레임)
+    """
+    from pyboy import PyBoy
+
+    actions = {}  # 프레임 -> [(REC_INPUT, 버튼) 또는 (REC_LOAD_STATE, 세이브스테이트)] (기록된 순서)
+    hashes = {}
+    rom_hash = None
+    savestate = None
+    for rec_type, value in read_trace(trace_path):
+        if rec_type == REC_ROM_HASH:
+            rom_hash = value
+        elif rec_type == REC_SAVESTATE:
+            savestate = value
+        elif rec_type in (REC_INPUT, REC_LOAD_STATE):
+            actions.setdefault(value[0], []).append((rec_type, value[1]))
+        elif rec_type == REC_STATE_HASH:
+            hashes[value[0]] = value[1]
+
+    if rom_hash is not None and rom_hash != hash_rom(rom_path):
+        raise ValueError("ROM hash does not match the trace")
+
+    pyboy = PyBoy(rom_path, window="null")
+    pyboy.set_emulation_speed(0)
+    if savestate is not None:
+        pyboy.load_state(BytesIO(savestate))
+
+    # 입력 또는 해시 검증이 필요한 프레임만 골라, 그 사이는 렌더링 없이 한 번에 진행
+    event_frames = sorted(set(actions) | set(hashes))
+    frame = 0
+    mismatches = []
+    started = time.perf_counter()
+    for event_frame in event_frames:
+        if event_frame - frame > 1:
+            pyboy.tick(event_frame - frame - 1, False)
+        pyboy.tick(1, False)
+        frame = event_frame
+        # 해시는 tick 직후, 입력과 되감기보다 먼저 기록됨
+        if frame in hashes and hash_wram(pyboy) != hashes[frame]:
+            mismatches.append(frame)
+        for rec_type, value in actions.get(frame, ()):
+            if rec_type == REC_INPUT:
+                pyboy.button(value, 10)
+            else:
+                pyboy.load_state(BytesIO(value))
+    elapsed = time.perf_counter() - started
+    pyboy.stop(save=False)
+
+    return {
+        "frames": frame,
+        "inputs": sum(rec_type == REC_INPUT for frame_actions in actions.values() for rec_type, _ in frame_actions),
+        "state_loads": sum(rec_type == REC_LOAD_STATE for frame_actions in actions.values() for rec_type, _ in frame_actions),
+        "state_hashes": len(hashes),
+        "mismatches": mismatches,
+        "fps": frame / elapsed if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,168 @@
+import numpy as np
+
+from pathfinder import bfs_path
+
+# 셀 상태
+UNKNOWN = 0
+WALKABLE = 1
+BLOCKED = 2
+
+INITIAL_SIZE = 32
+RENDER_CHARS = {UNKNOWN: "?", WALKABLE: ".", BLOCKED: "#"}
+
+
+class MapGrid:
+    """
+    한 맵의 관측 결과를 맵 좌표(블록 단위) 기준으로 누적하는 확장 가능한 격자.
+    맵 경계 밖 좌표(음수 포함)도 관측될 수 있으므로 원점 오프셋을 유지합니다.
+    """
+    def __init__(self):
+        self.offset_x = INITIAL_SIZE // 2  # 배열 인덱스 = 맵 좌표 + offset
+        self.offset_y = INITIAL_SIZE // 2
+        self.cells = np.zeros((INITIAL_SIZE, INITIAL_SIZE), dtype=np.uint8)
+        self.tiles = np.zeros((INITIAL_SIZE, INITIAL_SIZE), dtype=np.uint8)
+        self.frontier = set()  # 미탐색 셀과 맞닿은 통과 가능 셀 (맵 좌표)
+        self.explored = 0
+
+    def _ensure(self, x0, y0, x1, y1):
+        """ 맵 좌표 사각형 [x0, x1) x [y0, y1)이 배열 안에 들어오도록 확장 (두 배씩) """
+        height, width = self.cells.shape
+        left = max(0, -(x0 + self.offset_x))
+        top = max(0, -(y0 + self.offset_y))
+        right = max(0, x1 + self.offset_x - width)
+        bottom = max(0, y1 + self.offset_y - height)
+        if not (left or top or right or bottom):
+            return
+        pad = ((top and max(top, height), bottom and max(bottom, height)),
+               (left and max(left, width), right and max(right, width)))
+        self.cells = np.pad(self.cells, pad)
+        self.tiles = np.pad(self.tiles, pad)
+        self.offset_x += pad[1][0]
+        self.offset_y += pad[0][0]
+
+    def update(self, x0, y0, walkable, tiles=None):
+        """
+        맵 좌표 (x0, y0)을 왼쪽 위로 하는 관측 창을 기록하고 그 주변의 프런티어만 다시 계산합니다.
+        walkable: bool 2차원 배열 (행: Y, 열: X)
+        """
+        walkable = np.asarray(walkable, dtype=bool)
+        h, w = walkable.shape
+        # 프런티어 재계산 범위(±1)와 그 이웃(±2)까지 배열 안에 있도록 확장
+        self._ensure(x0 - 2, y0 - 2, x0 + w + 2, y0 + h + 2)
+        ix, iy = x0 + self.offset_x, y0 + self.offset_y
+        window = self.cells[iy:iy + h, ix:ix + w]
+        self.explored += int(np.count_nonzero(window == UNKNOWN))
+        window[...] = np.where(walkable, WALKABLE, BLOCKED)
+        if tiles is not None:
+            self.tiles[iy:iy + h, ix:ix + w] = tiles
+        self._update_frontier(x0 - 1, y0 - 1, x0 + w + 1, y0 + h + 1)
+
+    def _update_frontier(self, x0, y0, x1, y1):
+        ix0, iy0 = x0 + self.offset_x, y0 + self.offset_y
+        ix1, iy1 = x1 + self.offset_x, y1 + self.offset_y
+        # 이웃 검사를 위해 한 칸 넓게 자름 (update()에서 배열을 미리 확장해 둠)
+        padded = self.cells[iy0 - 1:iy1 + 1, ix0 - 1:ix1 + 1]
+        center = padded[1:-1, 1:-1]
+        unknown_neighbor = ((padded[:-2, 1:-1] == UNKNOWN) | (padded[2:, 1:-1] == UNKNOWN) |
+                            (padded[1:-1, :-2] == UNKNOWN) | (padded[1:-1, 2:] == UNKNOWN))
+        is_frontier = (center == WALKABLE) & unknown_neighbor
+
+        self.frontier = {(x, y) for x, y in self.frontier if not (x0 <= x < x1 and y0 <= y < y1)}
+        ys, xs = np.nonzero(is_frontier)
+        self.frontier.update(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def state(self, x, y):
+        ix, iy = x + self.offset_x, y + self.offset_y
+        height, width = self.cells.shape
+        if 0 <= ix < width and 0 <= iy < height:
+            return self.cells[iy, ix]
+        return UNKNOWN
+
+    def crop(self, x0, y0, x1, y1):
+        """ 맵 좌표 사각형 [x0, x1) x [y0, y1)의 셀 상태 배열 (범위 밖은 UNKNOWN) """
+        self._ensure(x0, y0, x1, y1)
+        ix, iy = x0 + self.offset_x, y0 + self.offset_y
+        return self.cells[iy:iy + (y1 - y0), ix:ix + (x1 - x0)].copy()
+
+    def bounds(self):
+        """ 관측된 셀을 모두 포함하는 맵 좌표 사각형 (x0, y0, x1, y1) """
+        ys, xs = np.nonzero(self.cells)
+        if len(xs) == 0:
+            return 0, 0, 0, 0
+        return (int(xs.min()) - self.offset_x, int(ys.min()) - self.offset_y,
+                int(xs.max()) + 1 - self.offset_x, int(ys.max()) + 1 - self.offset_y)
+
+    def downsample(self, factor):
+        """
+        관측 범위 전체를 factor x factor 블록으로 줄인 배열.
+        블록 안에서는 BLOCKED > WALKABLE > UNKNOWN 우선순위로 대표 값을 정합니다.
+        """
+        x0, y0, x1, y1 = self.bounds()
+        w = -(-(x1 - x0) // factor) * factor
+        h = -(-(y1 - y0) // factor) * factor
+        view = self.crop(x0, y0, x0 + w, y0 + h)
+        return view.reshape(h // factor, factor, w // factor, factor).max(axis=(1, 3))
+
+
+class WorldModel:
+    """ wCurMap별 MapGrid 모음. 화면 관측을 누적하고 화면 밖 목적지까지의 경로를 계산합니다. """
+    def __init__(self):
+        self.maps = {}
+
+    def grid(self, map_id):
+        if map_id not in self.maps:
+            self.maps[map_id] = MapGrid()
+        return self.maps[map_id]
+
+    def observe(self, map_id, player_x, player_y, walkable, tiles=None, player_block=(4, 4)):
+        """
+        화면 블록 격자(walkable)를 맵 좌표로 옮겨 기록합니다.
+        player_block: 화면 격자에서 플레이어가 위치한 블록 좌표
+        """
+        self.grid(map_id).update(player_x - player_block[0], player_y - player_block[1], walkable, tiles)
+
+    def nearest_frontier(self, map_id, x, y, count=5):
+        """ (x, y)에서 맨해튼 거리가 가까운 프런티어 셀 목록 """
+        frontier = self.grid(map_id).frontier
+        return sorted(frontier, key=lambda c: abs(c[0] - x) + abs(c[1] - y))[:count]
+
+    def render(self, map_id, x, y, radius=8):
+        """ 플레이어 주변을 문자로 그린 뷰 (@ 플레이어, + 프런티어, . 통과, # 막힘, ? 미탐색) """
+        grid = self.grid(map_id)
+        view = grid.crop(x - radius, y - radius, x + radius + 1, y + radius + 1)
+        lines = []
+        for row in range(view.shape[0]):
+            line = []
+            for col in range(view.shape[1]):
+                cx, cy = x - radius + col, y - radius + row
+                if (cx, cy) == (x, y):
+                    line.append("@")
+                elif (cx, cy) in grid.frontier:
+                    line.append("+")
+                else:
+                    line.append(RENDER_CHARS[int(view[row, col])])
+            lines.append("".join(line))
+        return "\n".join(lines)
+
+    def find_path(self, map_id, start, goal, blocked=(), allow_blocked_goal=False, margin=4):
+        """
+        누적된 지도 위에서 BFS로 경로를 계산합니다. 미탐색 셀은 통과 가능하다고 가정하므로
+        이동하면서 새로 관측될 때마다 다시 계산해야 합니다.
+        목적지에 도달할 수 없으면 가장 가까운 도달 가능 셀까지의 경로를 반환합니다.
+        """
+        grid = self.grid(map_id)
+        x0, y0, x1, y1 = grid.bounds()
+        x0 = min(x0, start[0], goal[0]) - margin
+        y0 = min(y0, start[1], goal[1]) - margin
+        x1 = max(x1, start[0] + 1, goal[0] + 1) + margin
+        y1 = max(y1, start[1] + 1, goal[1] + 1) + margin
+        cells = grid.crop(x0, y0, x1, y1)
+
+        def walkable(x, y):
+            if not (x0 <= x < x1 and y0 <= y < y1) or (x, y) in blocked:
+                return False
+            if allow_blocked_goal and (x, y) == goal:
+                return True
+            return cells[y - y0, x - x0] != BLOCKED
+
+        return bfs_path(start, goal, walkable)